@@ -0,0 +1,129 @@
+"""Micro-benchmark of the Markdown-to-PDF path for one résumé.
+
+Run with:
+
+    pdm run python benchmarks/pdf_rendering.py
+
+To compare with an earlier implementation, time the module as it was at a
+git revision too, e.g. before inline formatting was parsed in one pass:
+
+    pdm run python benchmarks/pdf_rendering.py --baseline 052e91a~1
+
+Both implementations are timed in the same process, one after the other.
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import timeit
+import types
+from pathlib import Path
+
+import fakedin.pdf_rendering
+
+MODULE_PATH = "src/fakedin/pdf_rendering.py"
+
+ROLE = """### Senior Data Engineer — **Northwind Analytics** (2019–2024)
+
+- Led a team of _six_ engineers building a **real-time** ingestion platform
+- Cut pipeline latency by **42%** through *incremental* processing …
+- Partnered with “product” and finance on __quarterly__ planning
+- Mentored junior engineers; ran the team’s hiring loop"""
+
+RESUME = "\n\n".join(
+    [
+        "# Jordan Avery",
+        "jordan.avery@example.com • 555-010-0199 • "
+        "Portland, OR",
+        "## Summary",
+        "Data engineer with **ten years** of experience designing "
+        "_reliable_ pipelines, analytics platforms and *self-serve* "
+        "tooling for teams of every size — from startups to "
+        "__Fortune 500__ companies.",
+        "## Experience",
+        *[ROLE] * 5,
+        "## Education",
+        "**B.S. Computer Science**, _Oregon State University_, 2014",
+        "## Skills",
+        "- **Languages:** Python, SQL, Scala\n- **Tools:** Spark, Kafka, "
+        "Airflow, dbt\n- _Cloud:_ AWS, GCP",
+    ]
+)
+
+
+def _load_baseline(revision: str) -> types.ModuleType:
+    """Load the PDF rendering module as it was at a git revision."""
+    source = subprocess.run(
+        ["git", "show", f"{revision}:{MODULE_PATH}"],
+        cwd=Path(__file__).resolve().parent.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    module = types.ModuleType(f"pdf_rendering_{revision}")
+    # Dataclasses look their module up while being created
+    sys.modules[module.__name__] = module
+    exec(compile(source, f"{revision}:{MODULE_PATH}", "exec"), module.__dict__)
+    return module
+
+
+def _inline_pass(module: types.ModuleType, text: str) -> None:
+    for line in module.sanitize_for_pdf(text).split("\n"):
+        module.parse_inline_formatting(line)
+
+
+def _benchmark(module: types.ModuleType, output_path: Path) -> None:
+    cases = {
+        "sanitize_for_pdf": lambda: module.sanitize_for_pdf(RESUME),
+        "sanitize + inline parse": lambda: _inline_pass(module, RESUME),
+        "write_pdf (full render)": lambda: module.write_pdf(
+            RESUME, output_path
+        ),
+    }
+    # Documents per combined PDF
+    combined = 20
+    # Earlier implementations could only write one document per PDF
+    if hasattr(module, "get_renderer"):
+        cases["render_many (combined)"] = (
+            lambda: module.get_renderer().render_many(
+                [RESUME] * combined, output_path
+            )
+        )
+    for name, case in cases.items():
+        timer = timeit.Timer(case)
+        number, _ = timer.autorange()
+        best = min(timer.repeat(repeat=5, number=number)) / number
+        if name == "render_many (combined)":
+            best /= combined
+        print(f"{name:<26} {best * 1e6:10.1f} us per resume")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--baseline",
+        metavar="REVISION",
+        help="Also time the implementation at this git revision",
+    )
+    args = parser.parse_args()
+
+    implementations = {"current": fakedin.pdf_rendering}
+    if args.baseline is not None:
+        try:
+            baseline = _load_baseline(args.baseline)
+        except subprocess.CalledProcessError as exc:
+            parser.error(exc.stderr.strip())
+        implementations = {
+            f"baseline ({args.baseline})": baseline,
+            **implementations,
+        }
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_path = Path(temp_dir) / "resume.pdf"
+        for label, module in implementations.items():
+            print(f"{label}:")
+            _benchmark(module, output_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""Generation through the OpenAI Batch API."""
+
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from fakedin.file_utils import OutputPaths, atomic_write_text
+from fakedin.llm_client import LLMClient
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+@dataclass
+class BatchRequest:
+    """A single chat completion request to include in a batch."""
+
+    custom_id: str
+    messages: list[dict[str, Any]]
+    # JSON-serializable details needed to save the item once it completes
+    metadata: dict[str, Any]
+
+
+@dataclass
+class BatchResult:
+    """The outcome of one request in a finished batch."""
+
+    custom_id: str
+    metadata: dict[str, Any]
+    content: Optional[str] = None
+    error: Optional[str] = None
+    # Where save_results saved the result when the batch was collected
+    # before, if it was
+    saved_path: Optional[str] = None
+
+
+class BatchRunner:
+    """Submit requests as an OpenAI batch and collect the results.
+
+    Each submitted batch gets a state file in the state directory recording
+    the metadata of its requests, so a run can be picked up again from the
+    batch id alone after the process exits. The state file also records
+    which results have been saved, so collecting a batch again doesn't
+    save them twice.
+    """
+
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        state_dir: Path,
+        poll_interval: float = 30.0,
+        completion_window: str = "24h",
+    ):
+        """Initialize the batch runner.
+
+        Args:
+            llm_client: Client whose OpenAI client and model are used.
+            state_dir: Directory for batch input and state files.
+            poll_interval: Seconds to wait between batch status checks.
+            completion_window: Completion window requested for the batch.
+        """
+        self.client = llm_client.client
+        self.model = llm_client.model
+        self.state_dir = state_dir
+        self.poll_interval = poll_interval
+        self.completion_window = completion_window
+
+    def submit(self, requests: list[BatchRequest]) -> str:
+        """Write requests to a JSONL batch file and submit it.
+
+        Args:
+            requests: Requests to include in the batch.
+
+        Returns:
+            The id of the created batch.
+        """
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        input_path = self.state_dir / "batch_input.jsonl"
+
+        with open(input_path, "w", encoding="utf-8") as f:
+            for request in requests:
+                line = {
+                    "custom_id": request.custom_id,
+                    "method": "POST",
+                    "url": BATCH_ENDPOINT,
+                    "body": {
+                        "model": self.model,
+                        "messages": request.messages,
+                    },
+                }
+                f.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+        with open(input_path, "rb") as f:
+            input_file = self.client.files.create(file=f, purpose="batch")
+
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=self.completion_window,  # type: ignore
+        )
+
+        state = {
+            "batch_id": batch.id,
+            "input_file_id": input_file.id,
+            "model": self.model,
+            "requests": [
+                {"custom_id": r.custom_id, "metadata": r.metadata}
+                for r in requests
+            ],
+        }
+        self._state_path(batch.id).write_text(
+            json.dumps(state, ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+        input_path.replace(self.state_dir / f"{batch.id}.input.jsonl")
+
+        return batch.id
+
+    def wait(self, batch_id: str) -> Any:
+        """Poll a batch until it reaches a terminal status.
+
+        Args:
+            batch_id: Id of the batch to wait for.
+
+        Returns:
+            The finished batch object.
+        """
+        while True:
+            batch = self.client.batches.retrieve(batch_id)
+            if batch.status in TERMINAL_STATUSES:
+                return batch
+
+            counts = batch.request_counts
+            if counts is not None:
+                print(
+                    f"Batch {batch_id} is {batch.status}: "
+                    f"{counts.completed}/{counts.total} completed"
+                )
+            else:
+                print(f"Batch {batch_id} is {batch.status}")
+            time.sleep(self.poll_interval)
+
+    def collect(self, batch_id: str) -> list[BatchResult]:
+        """Wait for a batch and pair its outputs with request metadata.
+
+        Args:
+            batch_id: Id of a batch submitted from this state directory.
+
+        Returns:
+            One result per request, in submission order.
+
+        Raises:
+            FileNotFoundError: If there is no state file for the batch.
+            RuntimeError: If the batch did not complete.
+        """
+        state_path = self._state_path(batch_id)
+        if not state_path.exists():
+            raise FileNotFoundError(
+                f"No state for batch {batch_id} in {self.state_dir}"
+            )
+        state = json.loads(state_path.read_text(encoding="utf-8"))
+
+        batch = self.wait(batch_id)
+        if batch.status != "completed":
+            raise RuntimeError(f"Batch {batch_id} ended as {batch.status}")
+
+        outputs: dict[str, tuple[Optional[str], Optional[str]]] = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                for line in self._read_file_lines(file_id):
+                    record = json.loads(line)
+                    outputs[record["custom_id"]] = self._parse_output(record)
+
+        saved = state.get("saved", {})
+        results = []
+        for request in state["requests"]:
+            content, error = outputs.get(
+                request["custom_id"], (None, "missing from batch output")
+            )
+            results.append(
+                BatchResult(
+                    custom_id=request["custom_id"],
+                    metadata=request["metadata"],
+                    content=content,
+                    error=error,
+                    saved_path=saved.get(request["custom_id"]),
+                )
+            )
+
+        return results
+
+    def save_results(
+        self,
+        batch_id: str,
+        results: list[BatchResult],
+        save: Callable[[BatchResult], Path],
+        label: str,
+        output_paths: Optional[OutputPaths] = None,
+    ) -> list[Path]:
+        """Save the successful results of a batch, skipping saved ones.
+
+        The paths results are saved to are recorded in the batch's state
+        file, so collecting the batch again returns them instead of saving
+        the results again. A result whose file is gone is saved again.
+
+        Args:
+            batch_id: Id of the batch the results were collected from.
+            results: Results from collect.
+            save: Function saving a successful result, returning the path
+                it was saved to.
+            label: Description of a result used in progress messages.
+            output_paths: Optional output paths claimed by save. The paths
+                of results saved before are reserved in it first, so results
+                saved again don't overwrite them.
+
+        Returns:
+            Paths of the saved results, in submission order.
+        """
+        already_saved = {
+            result.custom_id: Path(result.saved_path)
+            for result in results
+            if result.saved_path is not None
+            and Path(result.saved_path).exists()
+        }
+        if output_paths is not None:
+            for path in already_saved.values():
+                output_paths.reserve(path)
+
+        newly_saved: dict[str, str] = {}
+        paths: list[Path] = []
+        try:
+            for result in results:
+                if result.content is None:
+                    print(f"Skipping {result.custom_id}: {result.error}")
+                    continue
+                if result.custom_id in already_saved:
+                    path = already_saved[result.custom_id]
+                    action = "Already saved"
+                else:
+                    path = save(result)
+                    newly_saved[result.custom_id] = str(path)
+                    action = "Saved"
+                paths.append(path)
+                print(f"{action} {label} {len(paths)}/{len(results)}: {path}")
+        finally:
+            # Also recorded when interrupted, for the results saved so far
+            if newly_saved:
+                self._record_saved(batch_id, newly_saved)
+
+        return paths
+
+    def _state_path(self, batch_id: str) -> Path:
+        return self.state_dir / f"{batch_id}.batch.json"
+
+    def _record_saved(self, batch_id: str, saved: dict[str, str]) -> None:
+        """Add the paths of newly saved results to a batch's state file."""
+        state_path = self._state_path(batch_id)
+        state = json.loads(state_path.read_text(encoding="utf-8"))
+        state["saved"] = {**state.get("saved", {}), **saved}
+        atomic_write_text(
+            state_path, json.dumps(state, ensure_ascii=False, indent=2)
+        )
+
+    def _read_file_lines(self, file_id: str) -> list[str]:
+        text = self.client.files.content(file_id).text
+        return [line for line in text.splitlines() if line.strip()]
+
+    def _parse_output(
+        self, record: dict[str, Any]
+    ) -> tuple[Optional[str], Optional[str]]:
+        """Extract the content or error from one batch output line."""
+        if record.get("error"):
+            return None, str(record["error"])
+
+        response = record.get("response") or {}
+        if response.get("status_code") != 200:
+            return None, f"HTTP {response.get('status_code')}: {response}"
+
+        choices = response["body"]["choices"]
+        return choices[0]["message"]["content"] or "", None
@@ -0,0 +1,276 @@
+"""Benchmarks of the generation pipeline against a fake OpenAI server."""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Optional
+
+from fakedin.file_utils import atomic_write_text
+
+if TYPE_CHECKING:
+    from fakedin.fake_openai import FakeServerConfig
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+FLOWS = ("resume", "job", "resumes-for-job")
+FORMATS = ("markdown", "pdf")
+
+# Job description the resumes-for-job flow tailors résumés to
+SAMPLE_JOB_DESCRIPTION = """\
+# Senior Data Engineer
+
+**Northwind Analytics** | Portland, OR | Hybrid | $140,000 - $170,000
+
+## Responsibilities
+
+- Design and run batch and streaming data pipelines
+- Partner with analysts and product teams on data models
+
+## Required Qualifications
+
+- 6+ years of experience with Python and SQL
+- Experience with cloud data warehouses
+"""
+
+
+@dataclass(frozen=True)
+class BenchScenario:
+    """One flow and output format to benchmark."""
+
+    flow: str
+    output_format: str
+    count: int
+    concurrency: int
+    # PDF render processes; defaults to one per CPU
+    render_workers: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class BenchResult:
+    """Measurements of one benchmarked scenario."""
+
+    flow: str
+    output_format: str
+    items: int
+    concurrency: int
+    seconds: float
+    items_per_second: float
+    # CPU time of the generating process and its PDF render workers
+    cpu_seconds: float
+    # CPU time as a share of one core over the run
+    cpu_percent: float
+    # Peak resident memory of the generating process, if known
+    peak_rss_mb: Optional[float]
+    failed_requests: int
+    retries: int
+
+
+def build_scenarios(
+    flows: Iterable[str],
+    formats: Iterable[str],
+    count: int,
+    concurrency: int,
+    render_workers: Optional[int] = None,
+) -> list[BenchScenario]:
+    """Build the scenarios for every flow and format combination.
+
+    Job openings are only written as Markdown, so the job flow is skipped
+    for other formats.
+    """
+    return [
+        BenchScenario(
+            flow, output_format, count, concurrency, render_workers
+        )
+        for flow in flows
+        for output_format in formats
+        if not (flow == "job" and output_format != "markdown")
+    ]
+
+
+def run_benchmarks(
+    scenarios: Iterable[BenchScenario],
+    server_config: Optional[FakeServerConfig] = None,
+) -> list[BenchResult]:
+    """Run scenarios against one fake OpenAI server.
+
+    Each scenario runs in a fresh process, so its memory and CPU
+    measurements aren't affected by the scenarios before it.
+
+    Args:
+        scenarios: Scenarios to run, in order.
+        server_config: Behavior of the fake server.
+
+    Returns:
+        The result of each scenario.
+    """
+    # Imported here so that the CLI can list flows and formats cheaply
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    from fakedin.fake_openai import FakeOpenAIServer
+
+    results = []
+    with FakeOpenAIServer(server_config) as server:
+        for scenario in scenarios:
+            with ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as executor:
+                results.append(
+                    executor.submit(
+                        run_scenario, scenario, server.base_url
+                    ).result()
+                )
+    return results
+
+
+def run_scenario(scenario: BenchScenario, base_url: str) -> BenchResult:
+    """Run one scenario in the current process, writing to a temporary
+    directory.
+
+    Args:
+        scenario: Scenario to run.
+        base_url: Base URL of the OpenAI-compatible server to use.
+
+    Returns:
+        The scenario's measurements.
+    """
+    # Imported here so the parent process doesn't pay for them
+    from fakedin.job_generator import JobOpeningGenerator
+    from fakedin.llm_client import LLMClient
+    from fakedin.pdf_rendering import PdfRenderPool
+    from fakedin.resume_for_job_generator import ResumeForJobGenerator
+    from fakedin.resume_generator import ResumeGenerator
+
+    llm_client = LLMClient(api_key="fakedin-bench", base_url=base_url)
+    pdf_pool = None
+    if scenario.output_format == "pdf":
+        pdf_pool = PdfRenderPool(scenario.render_workers)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_dir = Path(temp_dir)
+        job_path = output_dir / "job.md"
+        job_path.write_text(SAMPLE_JOB_DESCRIPTION, encoding="utf-8")
+
+        started = time.perf_counter()
+        cpu_started = _cpu_seconds()
+        # Progress output would dominate the terminal and isn't measured
+        with contextlib.redirect_stdout(io.StringIO()):
+            try:
+                if scenario.flow == "resume":
+                    paths = ResumeGenerator(
+                        llm_client, pdf_pool
+                    ).generate_multiple(
+                        scenario.count,
+                        scenario.output_format,  # type: ignore[arg-type]
+                        output_dir,
+                        concurrency=scenario.concurrency,
+                    )
+                elif scenario.flow == "job":
+                    paths = JobOpeningGenerator(llm_client).generate_multiple(
+                        scenario.count,
+                        output_dir,
+                        concurrency=scenario.concurrency,
+                    )
+                elif scenario.flow == "resumes-for-job":
+                    paths = ResumeForJobGenerator(
+                        llm_client, pdf_pool
+                    ).generate_multiple(
+                        job_path,
+                        scenario.count,
+                        scenario.output_format,  # type: ignore[arg-type]
+                        output_dir,
+                        concurrency=scenario.concurrency,
+                    )
+                else:
+                    raise ValueError(f"Unknown flow {scenario.flow!r}")
+            finally:
+                # Waits for queued renders, and lets the workers' CPU time
+                # be counted
+                if pdf_pool is not None:
+                    pdf_pool.close()
+        seconds = time.perf_counter() - started
+        cpu_seconds = _cpu_seconds() - cpu_started
+
+    summary = llm_client.metrics.summarize()
+    return BenchResult(
+        flow=scenario.flow,
+        output_format=scenario.output_format,
+        items=len(paths),
+        concurrency=scenario.concurrency,
+        seconds=seconds,
+        items_per_second=len(paths) / seconds if seconds > 0 else 0.0,
+        cpu_seconds=cpu_seconds,
+        cpu_percent=100 * cpu_seconds / seconds if seconds > 0 else 0.0,
+        peak_rss_mb=_peak_rss_mb(),
+        failed_requests=summary.failed_requests,
+        retries=summary.retries,
+    )
+
+
+def _cpu_seconds() -> float:
+    """CPU time of this process and its finished child processes."""
+    if resource is None:
+        return time.process_time()
+    total = 0.0
+    for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN):
+        usage = resource.getrusage(who)
+        total += usage.ru_utime + usage.ru_stime
+    return total
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Peak resident memory of this process in MiB, if known."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS and kibibytes elsewhere
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def format_results(results: Iterable[BenchResult]) -> str:
+    """Lay results out as a text table."""
+    header = (
+        f"{'flow':<16} {'format':<8} {'items':>6} {'seconds':>8} "
+        f"{'items/s':>8} {'cpu s':>7} {'cpu %':>6} {'peak MB':>8} "
+        f"{'retries':>7}"
+    )
+    lines = [header, "-" * len(header)]
+    for result in results:
+        peak = (
+            f"{result.peak_rss_mb:8.1f}"
+            if result.peak_rss_mb is not None
+            else f"{'-':>8}"
+        )
+        lines.append(
+            f"{result.flow:<16} {result.output_format:<8} "
+            f"{result.items:>6} {result.seconds:>8.2f} "
+            f"{result.items_per_second:>8.2f} {result.cpu_seconds:>7.2f} "
+            f"{result.cpu_percent:>6.1f} {peak} {result.retries:>7}"
+        )
+    return "\n".join(lines)
+
+
+def write_results_json(
+    results: Iterable[BenchResult],
+    server_config: FakeServerConfig,
+    output_path: Path,
+) -> None:
+    """Write results, with the fake server's configuration, as JSON."""
+    report = {
+        "server": asdict(server_config),
+        "results": [asdict(result) for result in results],
+    }
+    atomic_write_text(output_path, json.dumps(report, indent=2) + "\n")
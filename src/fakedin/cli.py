@@ -5,10 +5,188 @@ from __future__ import annotations
 import argparse
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from fakedin.job_generator import JobOpeningGenerator
-from fakedin.resume_for_job_generator import ResumeForJobGenerator
-from fakedin.resume_generator import ResumeGenerator
+from fakedin import bench
+from fakedin.sharding import Shard, parse_shard
+from fakedin.sinks import SINKS, OutputSink, build_sink
+
+# The generators pull in openai, fpdf, promptdown and pydantic, which take
+# over a second to import, so each subcommand imports only what it uses
+# when it runs. Parsing arguments and --help stay fast.
+if TYPE_CHECKING:
+    from fakedin.batch import BatchRunner
+    from fakedin.llm_client import LLMClient
+    from fakedin.pdf_rendering import PdfRenderPool
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
+def _similarity_threshold(value: str) -> float:
+    threshold = float(value)
+    if not 0 < threshold <= 1:
+        raise argparse.ArgumentTypeError(
+            f"must be above 0 and at most 1, got {value}"
+        )
+    return threshold
+
+
+def _shard(value: str) -> Shard:
+    try:
+        return parse_shard(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from None
+
+
+def _add_shard_argument(
+    parser: argparse.ArgumentParser, items: str, merge_note: str = ""
+) -> None:
+    parser.add_argument(
+        "--shard",
+        type=_shard,
+        default=None,
+        metavar="INDEX/TOTAL",
+        help=f"Only handle the {items} of shard INDEX (from 0) of TOTAL, "
+        f"to split a run across machines{merge_note}",
+    )
+
+
+def _add_generation_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--concurrency",
+        "-c",
+        type=_positive_int,
+        default=1,
+        help="Maximum number of items generated at once (default: 1)",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Seed making the generated details reproducible; each item's "
+        "details depend only on the seed and its index",
+    )
+    parser.add_argument(
+        "--resume",
+        type=Path,
+        default=None,
+        metavar="RUN_DIR",
+        help="Continue an interrupted run in RUN_DIR, regenerating only "
+        "missing or failed items (overrides --output)",
+    )
+    _add_shard_argument(
+        parser, "items", "; combine the shards with 'fakedin merge'"
+    )
+    _add_client_arguments(parser)
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print each item to stdout as it is generated, writing "
+        "Markdown output incrementally (needs --concurrency 1, no --batch)",
+    )
+    parser.add_argument(
+        "--structured",
+        action="store_true",
+        help="Generate typed documents through a JSON schema and render the "
+        "output from them (implied by --format json; no --batch or --stream)",
+    )
+    parser.add_argument(
+        "--sink",
+        choices=SINKS,
+        default="files",
+        help="Where to store generated items: one file each, or records "
+        "appended to a few rolling JSONL or Parquet (needs pyarrow) "
+        "dataset files (default: files)",
+    )
+    parser.add_argument(
+        "--records-per-shard",
+        type=_positive_int,
+        default=10_000,
+        help="Records in each dataset file written by --sink jsonl or "
+        "parquet (default: 10000)",
+    )
+
+
+def _add_client_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reuse cached completions of identical requests and cache new "
+        "ones (off by default)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help=(
+            "Directory of the response cache; implies --cache (default: "
+            "$FAKEDIN_CACHE_DIR or ~/.cache/fakedin)"
+        ),
+    )
+    parser.add_argument(
+        "--requests-per-minute",
+        "--rpm",
+        type=float,
+        default=None,
+        help="Request rate limit (default: $FAKEDIN_REQUESTS_PER_MINUTE, "
+        "otherwise unlimited)",
+    )
+    parser.add_argument(
+        "--tokens-per-minute",
+        "--tpm",
+        type=float,
+        default=None,
+        help="Token rate limit (default: $FAKEDIN_TOKENS_PER_MINUTE, "
+        "otherwise unlimited)",
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=None,
+        help="Retries per request on rate limits, timeouts and server "
+        "errors (default: $FAKEDIN_MAX_RETRIES or 5)",
+    )
+    parser.add_argument(
+        "--metrics-json",
+        type=Path,
+        default=None,
+        metavar="JSON_FILE",
+        help="Also save every request's latency, tokens and retries, with "
+        "the run summary, to this JSON file",
+    )
+
+
+def _add_batch_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Submit all requests as one OpenAI batch and wait for it",
+    )
+    parser.add_argument(
+        "--batch-id",
+        default=None,
+        help="Resume waiting on a batch previously submitted with --batch",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=30.0,
+        help="Seconds between batch status checks (default: 30)",
+    )
+
+
+def _add_render_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--render-workers",
+        type=_positive_int,
+        default=None,
+        help="Processes rendering PDFs in parallel (default: one per CPU)",
+    )
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -31,9 +209,9 @@ def build_parser() -> argparse.ArgumentParser:
     resume_parser.add_argument(
         "--format",
         "-f",
-        choices=["pdf", "markdown"],
+        choices=["pdf", "markdown", "json"],
         default="markdown",
-        help="Output format: 'pdf' or 'markdown' (default: markdown)",
+        help="Output format: 'pdf', 'markdown' or 'json' (default: markdown)",
     )
     resume_parser.add_argument(
         "--output",
@@ -42,6 +220,33 @@ def build_parser() -> argparse.ArgumentParser:
         default=Path("./output"),
         help="Output directory (default: ./output)",
     )
+    resume_parser.add_argument(
+        "--items-per-request",
+        type=_positive_int,
+        default=1,
+        help="Resumes generated by each request, sharing one copy of the "
+        "instructions; falls back to one request each if the response "
+        "can't be split (default: 1)",
+    )
+    resume_parser.add_argument(
+        "--dedup-threshold",
+        type=_similarity_threshold,
+        default=None,
+        metavar="SIMILARITY",
+        help="Flag resumes whose estimated similarity to an earlier resume "
+        "of the run is at least this, from 0 to 1, such as 0.8",
+    )
+    resume_parser.add_argument(
+        "--regenerate-duplicates",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Regenerate a flagged resume up to N times before keeping it "
+        "(needs --dedup-threshold; default: 0)",
+    )
+    _add_generation_arguments(resume_parser)
+    _add_batch_arguments(resume_parser)
+    _add_render_arguments(resume_parser)
 
     job_parser = subparsers.add_parser(
         "job",
@@ -52,6 +257,13 @@ def build_parser() -> argparse.ArgumentParser:
         type=int,
         help="Number of job descriptions to generate",
     )
+    job_parser.add_argument(
+        "--format",
+        "-f",
+        choices=["markdown", "json"],
+        default="markdown",
+        help="Output format: 'markdown' or 'json' (default: markdown)",
+    )
     job_parser.add_argument(
         "--output",
         "-o",
@@ -59,27 +271,29 @@ def build_parser() -> argparse.ArgumentParser:
         default=Path("./output"),
         help="Output directory (default: ./output)",
     )
+    _add_generation_arguments(job_parser)
+    _add_batch_arguments(job_parser)
 
     resumes_for_job_parser = subparsers.add_parser(
         "resumes-for-job",
         help="Generate resumes tailored to a job description.",
     )
     resumes_for_job_parser.add_argument(
-        "job_description_file",
-        type=Path,
-        help="Path to the job description file (markdown format)",
+        "job_descriptions",
+        help="Job description file (markdown format), directory of them, "
+        "or quoted glob pattern such as 'jobs/**/*.md'",
     )
     resumes_for_job_parser.add_argument(
         "count",
         type=int,
-        help="Number of resumes to generate",
+        help="Number of resumes to generate for each job description",
     )
     resumes_for_job_parser.add_argument(
         "--format",
         "-f",
-        choices=["pdf", "markdown"],
+        choices=["pdf", "markdown", "json"],
         default="markdown",
-        help="Output format: 'pdf' or 'markdown' (default: markdown)",
+        help="Output format: 'pdf', 'markdown' or 'json' (default: markdown)",
     )
     resumes_for_job_parser.add_argument(
         "--output",
@@ -88,6 +302,197 @@ def build_parser() -> argparse.ArgumentParser:
         default=Path("./output"),
         help="Output directory (default: ./output)",
     )
+    _add_generation_arguments(resumes_for_job_parser)
+    _add_batch_arguments(resumes_for_job_parser)
+    _add_render_arguments(resumes_for_job_parser)
+
+    render_pdf_parser = subparsers.add_parser(
+        "render-pdf",
+        help="Render existing Markdown resumes as PDFs.",
+    )
+    render_pdf_parser.add_argument(
+        "directory",
+        type=Path,
+        help="Directory of Markdown (.md) files to render",
+    )
+    render_pdf_parser.add_argument(
+        "--output",
+        "-o",
+        type=Path,
+        default=None,
+        help="Output directory (default: next to each Markdown file)",
+    )
+    render_pdf_parser.add_argument(
+        "--combine",
+        type=Path,
+        default=None,
+        metavar="PDF_FILE",
+        help="Render every file into this one PDF instead, each starting "
+        "on a new page",
+    )
+    _add_shard_argument(render_pdf_parser, "files")
+    _add_render_arguments(render_pdf_parser)
+
+    corpus_parser = subparsers.add_parser(
+        "corpus",
+        help="Generate job descriptions and resumes tailored to each, with "
+        "both stages running at once.",
+    )
+    corpus_parser.add_argument(
+        "job_count",
+        type=int,
+        help="Number of job descriptions to generate",
+    )
+    corpus_parser.add_argument(
+        "resumes_per_job",
+        type=int,
+        help="Number of resumes to generate for each job description",
+    )
+    corpus_parser.add_argument(
+        "--format",
+        "-f",
+        choices=["pdf", "markdown"],
+        default="markdown",
+        help="Resume output format: 'pdf' or 'markdown' (default: markdown)",
+    )
+    corpus_parser.add_argument(
+        "--output",
+        "-o",
+        type=Path,
+        default=Path("./output"),
+        help="Output directory, getting jobs and resumes subdirectories "
+        "(default: ./output)",
+    )
+    corpus_parser.add_argument(
+        "--job-concurrency",
+        type=_positive_int,
+        default=1,
+        help="Maximum number of job descriptions generated at once "
+        "(default: 1)",
+    )
+    corpus_parser.add_argument(
+        "--concurrency",
+        "-c",
+        type=_positive_int,
+        default=1,
+        help="Maximum number of resumes generated at once (default: 1)",
+    )
+    corpus_parser.add_argument(
+        "--queue-size",
+        type=_positive_int,
+        default=None,
+        help="Maximum number of resumes waiting for a worker before job "
+        "generation pauses (default: twice --concurrency)",
+    )
+    corpus_parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Seed making the generated details reproducible",
+    )
+    _add_client_arguments(corpus_parser)
+    _add_render_arguments(corpus_parser)
+
+    bench_parser = subparsers.add_parser(
+        "bench",
+        help="Measure generation throughput against a local fake OpenAI "
+        "server.",
+    )
+    bench_parser.add_argument(
+        "--count",
+        "-n",
+        type=_positive_int,
+        default=50,
+        help="Items generated in each scenario (default: 50)",
+    )
+    bench_parser.add_argument(
+        "--concurrency",
+        "-c",
+        type=_positive_int,
+        default=8,
+        help="Maximum number of items generated at once (default: 8)",
+    )
+    bench_parser.add_argument(
+        "--flows",
+        nargs="+",
+        choices=bench.FLOWS,
+        default=list(bench.FLOWS),
+        help="Flows to benchmark (default: all)",
+    )
+    bench_parser.add_argument(
+        "--formats",
+        nargs="+",
+        choices=bench.FORMATS,
+        default=list(bench.FORMATS),
+        help="Output formats to benchmark; job openings are only benchmarked "
+        "as markdown (default: all)",
+    )
+    bench_parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.5,
+        help="Mean seconds the fake server takes to respond (default: 0.5)",
+    )
+    bench_parser.add_argument(
+        "--jitter",
+        type=float,
+        default=0.1,
+        help="Seconds the response time varies by, up or down "
+        "(default: 0.1)",
+    )
+    bench_parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="Share of requests the fake server fails, to exercise retries "
+        "(default: 0)",
+    )
+    bench_parser.add_argument(
+        "--response-size",
+        type=_positive_int,
+        default=4000,
+        help="Approximate characters in each fake response (default: 4000)",
+    )
+    bench_parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Seed making the fake server's delays, errors and responses "
+        "reproducible",
+    )
+    bench_parser.add_argument(
+        "--json",
+        type=Path,
+        default=None,
+        metavar="JSON_FILE",
+        help="Also save the results to this JSON file",
+    )
+    _add_render_arguments(bench_parser)
+
+    merge_parser = subparsers.add_parser(
+        "merge",
+        help="Merge the output directories of the shards of a resume, job "
+        "or resumes-for-job run.",
+    )
+    merge_parser.add_argument(
+        "run_dirs",
+        nargs="+",
+        type=Path,
+        metavar="RUN_DIR",
+        help="Output directory of a shard, run with --shard",
+    )
+    merge_parser.add_argument(
+        "--output",
+        "-o",
+        type=Path,
+        required=True,
+        help="Directory to write the merged run to",
+    )
+    merge_parser.add_argument(
+        "--allow-incomplete",
+        action="store_true",
+        help="Merge even if shards are missing or items failed",
+    )
 
     return parser
 
@@ -101,97 +506,505 @@ def _ensure_output_dir(output_dir: Path) -> None:
         raise SystemExit(1)
 
 
-def _ensure_job_description_file(path: Path) -> None:
-    if not path.exists():
+def _find_job_descriptions(args: argparse.Namespace) -> list[Path]:
+    from fakedin.resume_for_job_generator import find_job_descriptions
+
+    try:
+        paths = find_job_descriptions(args.job_descriptions)
+    except ValueError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        raise SystemExit(1)
+    if not paths:
+        print(
+            f"Error: No job description files found for "
+            f"'{args.job_descriptions}'.",
+            file=sys.stderr,
+        )
+        raise SystemExit(1)
+    if len(paths) > 1 and (args.batch or args.batch_id is not None):
         print(
-            f"Error: Job description file '{path}' not found.",
+            "Error: Batch mode takes a single job description file.",
             file=sys.stderr,
         )
         raise SystemExit(1)
+    return paths
+
+
+def _run_dir(args: argparse.Namespace) -> Path:
+    return args.resume if args.resume is not None else args.output
+
 
+def _build_llm_client(args: argparse.Namespace) -> LLMClient:
+    from fakedin.config import settings
+    from fakedin.llm_client import LLMClient
+    from fakedin.rate_limit import RateLimiter, RetryPolicy
+    from fakedin.response_cache import ResponseCache
 
-def _run_resume(count: int, output_format: str, output_dir: Path) -> None:
+    cache = None
+    if args.cache or args.cache_dir is not None:
+        cache = ResponseCache(
+            args.cache_dir or settings.cache_dir,
+            settings.cache_max_bytes,
+        )
+
+    requests_per_minute = args.requests_per_minute
+    if requests_per_minute is None:
+        requests_per_minute = settings.requests_per_minute
+    tokens_per_minute = args.tokens_per_minute
+    if tokens_per_minute is None:
+        tokens_per_minute = settings.tokens_per_minute
+    max_retries = args.max_retries
+    if max_retries is None:
+        max_retries = settings.max_retries
+
+    return LLMClient(
+        cache=cache,
+        rate_limiter=RateLimiter(
+            requests_per_minute=requests_per_minute or None,
+            tokens_per_minute=tokens_per_minute or None,
+        ),
+        retry_policy=RetryPolicy(max_retries=max_retries),
+    )
+
+
+def _build_batch_runner(
+    args: argparse.Namespace, llm_client: LLMClient
+) -> BatchRunner | None:
+    if not args.batch and args.batch_id is None:
+        return None
+
+    from fakedin.batch import BatchRunner
+
+    return BatchRunner(llm_client, _run_dir(args), args.poll_interval)
+
+
+def _write_metrics(args: argparse.Namespace, llm_client: LLMClient) -> None:
+    if args.metrics_json is None:
+        return
+    llm_client.metrics.write_json(args.metrics_json)
+    print(f"Request metrics saved to: {args.metrics_json}")
+
+
+def _build_pdf_pool(args: argparse.Namespace) -> PdfRenderPool | None:
+    if args.format != "pdf":
+        return None
+
+    from fakedin.pdf_rendering import PdfRenderPool
+
+    return PdfRenderPool(args.render_workers)
+
+
+def _build_sink(
+    args: argparse.Namespace, output_dir: Path, prefix: str
+) -> OutputSink | None:
+    return build_sink(args.sink, output_dir, prefix, args.records_per_shard)
+
+
+def _run_resume(args: argparse.Namespace) -> None:
+    from fakedin.dedup import NearDuplicateIndex
+    from fakedin.manifest import RunManifest
+    from fakedin.resume_generator import ResumeGenerator
+
+    output_dir = _run_dir(args)
     _ensure_output_dir(output_dir)
+    pdf_pool = _build_pdf_pool(args)
+    sink = None
+    duplicate_index = None
+    if args.dedup_threshold is not None:
+        duplicate_index = NearDuplicateIndex(args.dedup_threshold)
 
     try:
-        generator = ResumeGenerator()
-        generated_files = generator.generate_multiple(
-            count=count,
-            output_format=output_format,
-            output_dir=output_dir,
+        llm_client = _build_llm_client(args)
+        sink = _build_sink(args, output_dir, "resumes")
+        generator = ResumeGenerator(
+            llm_client,
+            pdf_pool,
+            sink,
+            duplicate_index,
+            args.regenerate_duplicates,
         )
+        batch_runner = _build_batch_runner(args, llm_client)
+        if batch_runner is not None:
+            generated_files = generator.generate_batch(
+                batch_runner,
+                count=args.count,
+                output_format=args.format,
+                output_dir=output_dir,
+                batch_id=args.batch_id,
+                seed=args.seed,
+            )
+        else:
+            generated_files = generator.generate_multiple(
+                count=args.count,
+                output_format=args.format,
+                output_dir=output_dir,
+                concurrency=args.concurrency,
+                manifest=RunManifest(output_dir),
+                resume=args.resume is not None,
+                seed=args.seed,
+                stream=args.stream,
+                structured=args.structured,
+                shard=args.shard,
+                items_per_request=args.items_per_request,
+            )
 
         print(f"\nGenerated {len(generated_files)} resumes successfully.")
+        if duplicate_index is not None and duplicate_index.flagged:
+            print(
+                f"{len(duplicate_index.flagged)} of them were flagged as "
+                "near-duplicates."
+            )
         print(f"Files saved to: {output_dir}")
+        _write_metrics(args, llm_client)
     except Exception as exc:
         print(f"Error: {exc}", file=sys.stderr)
         raise SystemExit(1)
+    finally:
+        if pdf_pool is not None:
+            pdf_pool.close()
+        if sink is not None:
+            sink.close()
+
 
+def _run_job(args: argparse.Namespace) -> None:
+    from fakedin.job_generator import JobOpeningGenerator
+    from fakedin.manifest import RunManifest
 
-def _run_job(count: int, output_dir: Path) -> None:
+    output_dir = _run_dir(args)
     _ensure_output_dir(output_dir)
+    sink = None
 
     try:
-        generator = JobOpeningGenerator()
-        generated_files = generator.generate_multiple(
-            count=count,
-            output_dir=output_dir,
-        )
+        llm_client = _build_llm_client(args)
+        sink = _build_sink(args, output_dir, "jobs")
+        generator = JobOpeningGenerator(llm_client, sink)
+        batch_runner = _build_batch_runner(args, llm_client)
+        if batch_runner is not None:
+            generated_files = generator.generate_batch(
+                batch_runner,
+                count=args.count,
+                output_dir=output_dir,
+                batch_id=args.batch_id,
+                seed=args.seed,
+            )
+        else:
+            generated_files = generator.generate_multiple(
+                count=args.count,
+                output_dir=output_dir,
+                concurrency=args.concurrency,
+                manifest=RunManifest(output_dir),
+                resume=args.resume is not None,
+                seed=args.seed,
+                stream=args.stream,
+                structured=args.structured,
+                shard=args.shard,
+                output_format=args.format,
+            )
 
         print(
             f"\nGenerated {len(generated_files)} job descriptions "
             "successfully."
         )
         print(f"Files saved to: {output_dir}")
+        _write_metrics(args, llm_client)
     except Exception as exc:
         print(f"Error: {exc}", file=sys.stderr)
         raise SystemExit(1)
+    finally:
+        if sink is not None:
+            sink.close()
 
 
-def _run_resumes_for_job(
-    job_description_file: Path,
-    count: int,
-    output_format: str,
-    output_dir: Path,
-) -> None:
-    _ensure_job_description_file(job_description_file)
+def _run_resumes_for_job(args: argparse.Namespace) -> None:
+    from fakedin.manifest import RunManifest
+    from fakedin.resume_for_job_generator import ResumeForJobGenerator
+
+    job_description_paths = _find_job_descriptions(args)
+    output_dir = _run_dir(args)
     _ensure_output_dir(output_dir)
+    pdf_pool = _build_pdf_pool(args)
+    sink = None
 
     try:
-        generator = ResumeForJobGenerator()
-        generated_files = generator.generate_multiple(
-            job_description_path=job_description_file,
-            count=count,
-            output_format=output_format,
+        llm_client = _build_llm_client(args)
+        sink = _build_sink(args, output_dir, "resumes_for_job")
+        generator = ResumeForJobGenerator(llm_client, pdf_pool, sink)
+        batch_runner = _build_batch_runner(args, llm_client)
+        if batch_runner is not None:
+            generated_files = generator.generate_batch(
+                batch_runner,
+                job_description_path=job_description_paths[0],
+                count=args.count,
+                output_format=args.format,
+                output_dir=output_dir,
+                batch_id=args.batch_id,
+                seed=args.seed,
+            )
+        elif len(job_description_paths) == 1:
+            generated_files = generator.generate_multiple(
+                job_description_path=job_description_paths[0],
+                count=args.count,
+                output_format=args.format,
+                output_dir=output_dir,
+                concurrency=args.concurrency,
+                manifest=RunManifest(output_dir),
+                resume=args.resume is not None,
+                seed=args.seed,
+                stream=args.stream,
+                structured=args.structured,
+                shard=args.shard,
+            )
+        else:
+            generated_files = generator.generate_for_jobs(
+                job_description_paths=job_description_paths,
+                count_per_job=args.count,
+                output_format=args.format,
+                output_dir=output_dir,
+                concurrency=args.concurrency,
+                manifest=RunManifest(output_dir),
+                resume=args.resume is not None,
+                seed=args.seed,
+                stream=args.stream,
+                structured=args.structured,
+                shard=args.shard,
+            )
+
+        if len(job_description_paths) == 1:
+            print(
+                f"\nGenerated {len(generated_files)} resumes for job: "
+                f"{job_description_paths[0].name}"
+            )
+        else:
+            print(
+                f"\nGenerated {len(generated_files)} resumes for "
+                f"{len(job_description_paths)} jobs"
+            )
+        print(f"Files saved to: {output_dir}")
+        _write_metrics(args, llm_client)
+    except Exception as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        raise SystemExit(1)
+    finally:
+        if pdf_pool is not None:
+            pdf_pool.close()
+        if sink is not None:
+            sink.close()
+
+
+def _run_render_pdf(args: argparse.Namespace) -> None:
+    from fakedin.pdf_rendering import PdfRenderPool, get_renderer
+
+    directory: Path = args.directory
+    if not directory.is_dir():
+        print(f"Error: Directory '{directory}' not found.", file=sys.stderr)
+        raise SystemExit(1)
+
+    markdown_paths = sorted(directory.glob("*.md"))
+    if args.shard is not None:
+        markdown_paths = args.shard.select(markdown_paths)
+    if not markdown_paths:
+        print(f"No Markdown files found in {directory}")
+        return
+
+    if args.combine is not None:
+        get_renderer().render_many(
+            (path.read_text(encoding="utf-8") for path in markdown_paths),
+            args.combine,
+        )
+        print(f"Rendered {len(markdown_paths)} files into {args.combine}")
+        return
+
+    if args.output is not None:
+        _ensure_output_dir(args.output)
+
+    failures = 0
+    with PdfRenderPool(args.render_workers) as pdf_pool:
+        results = pdf_pool.render_files(markdown_paths, args.output)
+        for completed, (markdown_path, future) in enumerate(results, 1):
+            try:
+                pdf_path = future.result()
+            except Exception as exc:
+                failures += 1
+                print(
+                    f"Failed to render {markdown_path}: {exc}",
+                    file=sys.stderr,
+                )
+                continue
+            print(f"Rendered {completed}/{len(markdown_paths)}: {pdf_path}")
+
+    print(
+        f"\nRendered {len(markdown_paths) - failures} of "
+        f"{len(markdown_paths)} files."
+    )
+    if failures:
+        raise SystemExit(1)
+
+
+def _run_corpus(args: argparse.Namespace) -> None:
+    from fakedin.corpus import CorpusGenerator
+
+    output_dir: Path = args.output
+    _ensure_output_dir(output_dir)
+    pdf_pool = _build_pdf_pool(args)
+
+    try:
+        llm_client = _build_llm_client(args)
+        result = CorpusGenerator(llm_client, pdf_pool).generate(
+            job_count=args.job_count,
+            resumes_per_job=args.resumes_per_job,
             output_dir=output_dir,
+            resume_format=args.format,
+            job_concurrency=args.job_concurrency,
+            resume_concurrency=args.concurrency,
+            queue_size=args.queue_size,
+            seed=args.seed,
         )
 
         print(
-            f"\nGenerated {len(generated_files)} resumes for job: "
-            f"{job_description_file.name}"
+            f"\nGenerated {len(result.job_paths)} job descriptions and "
+            f"{len(result.resume_paths)} resumes."
         )
+        if result.failed_jobs or result.failed_resumes:
+            print(
+                f"{result.failed_jobs} job descriptions and "
+                f"{result.failed_resumes} resumes failed."
+            )
         print(f"Files saved to: {output_dir}")
+        _write_metrics(args, llm_client)
+    except Exception as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        raise SystemExit(1)
+    finally:
+        if pdf_pool is not None:
+            pdf_pool.close()
+
+
+def _run_merge(args: argparse.Namespace) -> None:
+    from fakedin.merge import merge_runs
+
+    try:
+        result = merge_runs(
+            args.run_dirs, args.output, allow_incomplete=args.allow_incomplete
+        )
+    except ValueError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        raise SystemExit(1)
+
+    print(
+        f"Merged {len(args.run_dirs)} shards: {result.completed} items in "
+        f"{len(result.copied_paths)} files."
+    )
+    if result.missing:
+        print(f"{len(result.missing)} items are missing or failed.")
+    print(f"Files saved to: {args.output}")
+
+
+def _run_bench(args: argparse.Namespace) -> None:
+    from fakedin.fake_openai import FakeServerConfig
+
+    server_config = FakeServerConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        response_size=args.response_size,
+        seed=args.seed,
+    )
+    scenarios = bench.build_scenarios(
+        args.flows,
+        args.formats,
+        args.count,
+        args.concurrency,
+        args.render_workers,
+    )
+    if not scenarios:
+        print("Error: No scenarios to benchmark.", file=sys.stderr)
+        raise SystemExit(1)
+
+    print(
+        f"Running {len(scenarios)} scenarios of {args.count} items against "
+        f"a fake server ({args.latency}s latency, {args.error_rate:.0%} "
+        "errors)..."
+    )
+    try:
+        results = bench.run_benchmarks(scenarios, server_config)
     except Exception as exc:
         print(f"Error: {exc}", file=sys.stderr)
         raise SystemExit(1)
 
+    print()
+    print(bench.format_results(results))
+    if args.json is not None:
+        bench.write_results_json(results, server_config, args.json)
+        print(f"\nResults saved to: {args.json}")
+
 
 def main(argv: list[str] | None = None) -> None:
     """Run the FakedIn CLI."""
     parser = build_parser()
     args = parser.parse_args(argv)
 
+    if getattr(args, "stream", False) and (
+        args.concurrency > 1 or args.batch or args.batch_id is not None
+    ):
+        parser.error(
+            "--stream can't be combined with --concurrency > 1 or batch mode"
+        )
+    structured = getattr(args, "structured", False)
+    if structured or getattr(args, "format", None) == "json":
+        if args.stream or args.batch or args.batch_id is not None:
+            parser.error(
+                "--structured and --format json can't be combined with "
+                "--stream or batch mode"
+            )
+    if getattr(args, "items_per_request", 1) > 1 and (
+        structured
+        or args.format == "json"
+        or args.stream
+        or args.batch
+        or args.batch_id is not None
+    ):
+        parser.error(
+            "--items-per-request can't be combined with --structured, "
+            "--format json, --stream or batch mode"
+        )
+    if getattr(args, "sink", "files") != "files" and args.format == "pdf":
+        parser.error("--format pdf can't be combined with --sink")
+    if getattr(args, "dedup_threshold", None) is not None and (
+        args.stream or args.batch or args.batch_id is not None
+    ):
+        parser.error(
+            "--dedup-threshold can't be combined with --stream or batch mode"
+        )
+    if getattr(args, "max_retries", None) is not None and (
+        args.max_retries < 0
+    ):
+        parser.error("--max-retries can't be negative")
+    if getattr(args, "regenerate_duplicates", 0) < 0:
+        parser.error("--regenerate-duplicates can't be negative")
+    if getattr(args, "regenerate_duplicates", 0) and (
+        args.dedup_threshold is None
+    ):
+        parser.error("--regenerate-duplicates needs --dedup-threshold")
+    if getattr(args, "shard", None) is not None and (
+        getattr(args, "batch", False)
+        or getattr(args, "batch_id", None) is not None
+    ):
+        parser.error("--shard can't be combined with batch mode")
+
     if args.command == "resume":
-        _run_resume(args.count, args.format, args.output)
+        _run_resume(args)
     elif args.command == "job":
-        _run_job(args.count, args.output)
+        _run_job(args)
     elif args.command == "resumes-for-job":
-        _run_resumes_for_job(
-            args.job_description_file,
-            args.count,
-            args.format,
-            args.output,
-        )
+        _run_resumes_for_job(args)
+    elif args.command == "render-pdf":
+        _run_render_pdf(args)
+    elif args.command == "corpus":
+        _run_corpus(args)
+    elif args.command == "bench":
+        _run_bench(args)
+    elif args.command == "merge":
+        _run_merge(args)
     else:
         parser.print_help()
         raise SystemExit(1)
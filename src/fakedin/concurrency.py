@@ -0,0 +1,68 @@
+"""Helpers for running generation work concurrently."""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def run_concurrently(
+    task: Callable[[T], R],
+    items: Sequence[T],
+    concurrency: int = 1,
+    on_complete: Optional[Callable[[int, R], None]] = None,
+) -> list[R]:
+    """Run a task over a sequence of items with bounded concurrency.
+
+    Generation is dominated by waiting on the LLM API, so a thread pool lets
+    several requests be in flight at once without changing any of the
+    synchronous generation code.
+
+    Args:
+        task: Function to call for each item.
+        items: Items to process.
+        concurrency: Maximum number of tasks running at once. A value of 1
+            runs everything serially on the calling thread.
+        on_complete: Optional callback invoked on the calling thread after
+            each task finishes, with the number of completed tasks so far and
+            the task's result.
+
+    Returns:
+        Results in the same order as the input items.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    results: list[R] = []
+
+    if concurrency == 1 or len(items) <= 1:
+        for item in items:
+            result = task(item)
+            results.append(result)
+            if on_complete is not None:
+                on_complete(len(results), result)
+        return results
+
+    ordered: list[Optional[R]] = [None] * len(items)
+    completed = 0
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {
+            executor.submit(task, item): index
+            for index, item in enumerate(items)
+        }
+        try:
+            for future in as_completed(futures):
+                result = future.result()
+                ordered[futures[future]] = result
+                completed += 1
+                if on_complete is not None:
+                    on_complete(completed, result)
+        except BaseException:
+            # Don't start any queued work once a task has failed.
+            for future in futures:
+                future.cancel()
+            raise
+
+    return ordered  # type: ignore[return-value]
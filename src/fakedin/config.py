@@ -2,6 +2,7 @@
 
 import os
 from pathlib import Path
+from typing import Optional
 
 import dotenv
 from pydantic import BaseModel, Field
@@ -10,6 +11,12 @@ from pydantic import BaseModel, Field
 dotenv.load_dotenv()
 
 
+def _optional_float(name: str) -> Optional[float]:
+    """Read a float environment variable, or None if it isn't set."""
+    value = os.getenv(name)
+    return float(value) if value else None
+
+
 class Settings(BaseModel):
     """Settings for the FakedIn application."""
 
@@ -20,6 +27,72 @@ class Settings(BaseModel):
     openai_model: str = Field(
         default_factory=lambda: os.getenv("OPENAI_MODEL", "gpt-5.2")
     )
+    # OpenAI-compatible API to use instead of OpenAI's, if set
+    openai_base_url: Optional[str] = Field(
+        default_factory=lambda: os.getenv("OPENAI_BASE_URL") or None
+    )
+
+    # Connection pool shared by every LLMClient in the process
+    max_connections: int = Field(
+        default_factory=lambda: int(
+            os.getenv("FAKEDIN_MAX_CONNECTIONS", "100")
+        )
+    )
+    max_keepalive_connections: int = Field(
+        default_factory=lambda: int(
+            os.getenv("FAKEDIN_MAX_KEEPALIVE_CONNECTIONS", "20")
+        )
+    )
+    keepalive_expiry: float = Field(
+        default_factory=lambda: float(
+            os.getenv("FAKEDIN_KEEPALIVE_EXPIRY", "30")
+        )
+    )
+
+    # Rate limits (0 means no limit) and retries
+    requests_per_minute: float = Field(
+        default_factory=lambda: float(
+            os.getenv("FAKEDIN_REQUESTS_PER_MINUTE", "0")
+        )
+    )
+    tokens_per_minute: float = Field(
+        default_factory=lambda: float(
+            os.getenv("FAKEDIN_TOKENS_PER_MINUTE", "0")
+        )
+    )
+    max_retries: int = Field(
+        default_factory=lambda: int(os.getenv("FAKEDIN_MAX_RETRIES", "5"))
+    )
+    # Completion tokens assumed per request when budgeting tokens per minute
+    expected_completion_tokens: int = Field(
+        default_factory=lambda: int(
+            os.getenv("FAKEDIN_EXPECTED_COMPLETION_TOKENS", "1500")
+        )
+    )
+
+    # Token prices in dollars per million tokens, for cost estimates. Unset
+    # means unknown; the cached input price defaults to the input price.
+    input_cost_per_million: Optional[float] = Field(
+        default_factory=lambda: _optional_float(
+            "FAKEDIN_INPUT_COST_PER_MILLION"
+        )
+    )
+    cached_input_cost_per_million: Optional[float] = Field(
+        default_factory=lambda: _optional_float(
+            "FAKEDIN_CACHED_INPUT_COST_PER_MILLION"
+        )
+    )
+    output_cost_per_million: Optional[float] = Field(
+        default_factory=lambda: _optional_float(
+            "FAKEDIN_OUTPUT_COST_PER_MILLION"
+        )
+    )
+
+    # Source of names, places and job titles: "faker" or "local" (the
+    # bundled data pack, which doesn't need Faker)
+    data_backend: str = Field(
+        default_factory=lambda: os.getenv("FAKEDIN_DATA_BACKEND", "faker")
+    )
 
     # Paths
     base_dir: Path = Field(default_factory=lambda: Path(__file__).parent)
@@ -33,6 +106,21 @@ class Settings(BaseModel):
         default_factory=lambda: Path(__file__).parent / "data"
     )
 
+    # Response cache
+    cache_dir: Path = Field(
+        default_factory=lambda: Path(
+            os.getenv(
+                "FAKEDIN_CACHE_DIR",
+                str(Path.home() / ".cache" / "fakedin"),
+            )
+        )
+    )
+    cache_max_bytes: int = Field(
+        default_factory=lambda: int(
+            os.getenv("FAKEDIN_CACHE_MAX_BYTES", str(512 * 1024 * 1024))
+        )
+    )
+
     # Generation settings
     default_output_dir: Path = Field(
         default_factory=lambda: Path.cwd() / "output"
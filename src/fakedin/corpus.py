@@ -0,0 +1,281 @@
+"""Generating corpora of job openings and résumés tailored to them."""
+
+import queue
+import threading
+from concurrent.futures import Future, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from fakedin.file_utils import OutputPaths, after_saved
+from fakedin.job_generator import JobOpeningGenerator
+from fakedin.llm_client import LLMClient
+from fakedin.pdf_rendering import PdfRenderPool
+from fakedin.resume_for_job_generator import ResumeForJobGenerator
+from fakedin.resume_generator import OutputFormat
+from fakedin.seeding import derive_seed
+
+# Job details, and the details of the people to write résumés for
+_JobInput = tuple[dict[str, Any], list[dict[str, Any]]]
+
+# Streams of per-item seeds derived from a run's seed, so a job and a
+# person with the same index don't share one
+_JOB_SEEDS = 0
+_PERSON_SEEDS = 1
+
+
+@dataclass
+class CorpusResult:
+    """Files generated by a corpus run, in completion order."""
+
+    job_paths: list[Path] = field(default_factory=list)
+    resume_paths: list[Path] = field(default_factory=list)
+    failed_jobs: int = 0
+    failed_resumes: int = 0
+
+
+@dataclass(frozen=True)
+class _ResumeTask:
+    """A résumé waiting to be generated for a finished job opening."""
+
+    job_path: Path
+    job_text: str
+    # The job text wrapped for the prompt, shared by the job's résumés
+    job_block: str
+    person: dict[str, Any]
+
+
+class CorpusGenerator:
+    """Generator of job openings and résumés tailored to each of them."""
+
+    def __init__(
+        self,
+        llm_client: Optional[LLMClient] = None,
+        pdf_pool: Optional[PdfRenderPool] = None,
+    ):
+        """Initialize the corpus generator.
+
+        Args:
+            llm_client: Client to generate text with. Defaults to a new
+                client using the configured model.
+            pdf_pool: Optional process pool to render PDF résumés in.
+        """
+        self.llm_client = llm_client or LLMClient()
+        self.job_generator = JobOpeningGenerator(self.llm_client)
+        self.resume_generator = ResumeForJobGenerator(
+            self.llm_client, pdf_pool
+        )
+
+    def generate(
+        self,
+        job_count: int,
+        resumes_per_job: int,
+        output_dir: Path,
+        resume_format: OutputFormat = "markdown",
+        job_concurrency: int = 1,
+        resume_concurrency: int = 1,
+        queue_size: Optional[int] = None,
+        seed: Optional[int] = None,
+    ) -> CorpusResult:
+        """Generate job openings and résumés tailored to each of them.
+
+        The two stages run at once. Job workers generate job openings and,
+        as soon as one is saved, queue its résumés with the job text still
+        in memory. Résumé workers take them from the queue, so résumés for
+        the first jobs are generated while later jobs are still being
+        written. The queue is bounded: when résumés fall behind, job workers
+        wait instead of running ahead.
+
+        Job and person details are drawn up front on the calling thread, so
+        seeded runs are reproducible. Failures are reported and skipped; a
+        job opening that fails gets no résumés.
+
+        Args:
+            job_count: Number of job openings to generate.
+            resumes_per_job: Number of résumés to generate for each job.
+            output_dir: Directory to save the corpus in. Job openings go in
+                its jobs directory and résumés in its resumes directory.
+            resume_format: Format to output the résumés in ('pdf' or
+                'markdown').
+            job_concurrency: Maximum number of job openings generated at
+                once.
+            resume_concurrency: Maximum number of résumés generated at once.
+            queue_size: Maximum number of résumés waiting to be generated.
+                Defaults to twice resume_concurrency.
+            seed: Optional seed making the generated details reproducible.
+
+        Returns:
+            The generated files and failure counts.
+
+        Raises:
+            ValueError: If JSON résumés are requested, which needs
+                structured mode.
+        """
+        if resume_format == "json":
+            raise ValueError("Corpus runs don't support JSON output")
+
+        self.job_generator.output_paths = OutputPaths()
+        self.resume_generator.output_paths = OutputPaths()
+
+        jobs_dir = output_dir / "jobs"
+        resumes_dir = output_dir / "resumes"
+        total_resumes = job_count * resumes_per_job
+
+        job_seeds = person_seeds = None
+        if seed is not None:
+            job_seeds = derive_seed(seed, _JOB_SEEDS)
+            person_seeds = derive_seed(seed, _PERSON_SEEDS)
+
+        pending_jobs: queue.Queue[_JobInput] = queue.Queue()
+        for job_index in range(job_count):
+            job = self._draw_job(
+                derive_seed(job_seeds, job_index)
+                if job_seeds is not None
+                else None
+            )
+            people = [
+                self._draw_person(
+                    derive_seed(person_seeds, job_index * resumes_per_job + i)
+                    if person_seeds is not None
+                    else None
+                )
+                for i in range(resumes_per_job)
+            ]
+            pending_jobs.put((job, people))
+
+        resume_tasks: queue.Queue[Optional[_ResumeTask]] = queue.Queue(
+            maxsize=queue_size or 2 * resume_concurrency
+        )
+        result = CorpusResult()
+        # Also keeps progress lines from different workers apart
+        result_lock = threading.Lock()
+        # Résumés whose PDFs were still rendering when their worker moved on
+        rendering: list[Future[Path]] = []
+        first_call = len(self.llm_client.metrics.calls)
+
+        def _generate_jobs() -> None:
+            while True:
+                try:
+                    job, people = pending_jobs.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    job_text = self.llm_client.generate_from_promptdown(
+                        "job_opening", job
+                    )
+                    job_path = self.job_generator.save_job(
+                        job_text, job, jobs_dir
+                    )
+                except Exception as exc:
+                    with result_lock:
+                        result.failed_jobs += 1
+                        print(f"Failed to generate job opening: {exc}")
+                    continue
+
+                with result_lock:
+                    result.job_paths.append(job_path)
+                    done = len(result.job_paths) + result.failed_jobs
+                    print(
+                        f"Generated job opening {done}/{job_count}: "
+                        f"{job_path}"
+                    )
+                job_block = self.resume_generator.wrap_job_description(
+                    job_text
+                )
+                # Blocks while the résumé workers are behind
+                for person in people:
+                    resume_tasks.put(
+                        _ResumeTask(job_path, job_text, job_block, person)
+                    )
+
+        def _generate_resumes() -> None:
+            while True:
+                task = resume_tasks.get()
+                if task is None:
+                    return
+                try:
+                    resume_path = self.resume_generator.generate_for_person(
+                        task.person,
+                        task.job_path,
+                        task.job_text,
+                        resume_format,
+                        resumes_dir,
+                        job_description_block=task.job_block,
+                    )
+                except Exception as exc:
+                    with result_lock:
+                        result.failed_resumes += 1
+                        print(
+                            "Failed to generate résumé for "
+                            f"{task.job_path}: {exc}"
+                        )
+                    continue
+
+                # A PDF may still be rendering; it's counted once written
+                saved = after_saved(
+                    resume_path,
+                    lambda path, error, task=task: _resume_saved(
+                        task, path, error
+                    ),
+                )
+                if isinstance(saved, Future):
+                    with result_lock:
+                        rendering.append(saved)
+
+        def _resume_saved(
+            task: _ResumeTask,
+            resume_path: Optional[Path],
+            error: Optional[BaseException],
+        ) -> None:
+            with result_lock:
+                if error is not None:
+                    result.failed_resumes += 1
+                    print(
+                        "Failed to generate résumé for "
+                        f"{task.job_path}: {error}"
+                    )
+                    return
+                result.resume_paths.append(resume_path)
+                done = len(result.resume_paths) + result.failed_resumes
+                print(
+                    f"Generated résumé {done}/{total_resumes}: "
+                    f"{resume_path}"
+                )
+
+        # Daemon threads, so an interrupted run exits without waiting on
+        # requests in flight; outputs are written atomically.
+        job_workers = [
+            threading.Thread(target=_generate_jobs, daemon=True)
+            for _ in range(job_concurrency)
+        ]
+        resume_workers = [
+            threading.Thread(target=_generate_resumes, daemon=True)
+            for _ in range(resume_concurrency)
+        ]
+        for worker in job_workers + resume_workers:
+            worker.start()
+        for worker in job_workers:
+            worker.join()
+        for _ in resume_workers:
+            resume_tasks.put(None)
+        for worker in resume_workers:
+            worker.join()
+        wait(rendering)
+
+        calls = self.llm_client.metrics.calls[first_call:]
+        if calls:
+            print(f"\n{self.llm_client.metrics.summarize(calls).format()}")
+
+        return result
+
+    def _draw_job(self, seed: Optional[int]) -> dict[str, Any]:
+        """Generate job details, reseeding first if a seed is given."""
+        if seed is not None:
+            self.job_generator.job_generator.reseed(seed)
+        return self.job_generator.job_generator.generate_job()
+
+    def _draw_person(self, seed: Optional[int]) -> dict[str, Any]:
+        """Generate person details, reseeding first if a seed is given."""
+        if seed is not None:
+            self.resume_generator.person_generator.reseed(seed)
+        return self.resume_generator.person_generator.generate_person()
@@ -0,0 +1,192 @@
+"""Preloaded value pools for generating records without Faker calls."""
+
+import functools
+import itertools
+import random
+from dataclasses import dataclass
+
+from fakedin.config import settings
+
+BACKENDS = ("faker", "local")
+
+
+@dataclass(frozen=True)
+class DataPools:
+    """Immutable pools of values to sample records from.
+
+    Weighted pools store cumulative weights so sampling doesn't have to
+    recompute them on every call. Locations and domains come either from
+    fixed lists or, when those are empty, are built from their parts the
+    same way Faker builds them.
+    """
+
+    first_names: tuple[str, ...]
+    first_name_cum_weights: tuple[float, ...]
+    last_names: tuple[str, ...]
+    last_name_cum_weights: tuple[float, ...]
+    states: tuple[str, ...]
+    job_titles: tuple[str, ...]
+    company_suffixes: tuple[str, ...]
+    words: tuple[str, ...]
+    locations: tuple[tuple[str, str], ...] = ()
+    domains: tuple[str, ...] = ()
+    city_prefixes: tuple[str, ...] = ()
+    city_suffixes: tuple[str, ...] = ()
+    tlds: tuple[str, ...] = ()
+
+    def sample_first_names(self, rng: random.Random, n: int) -> list[str]:
+        """Sample n first names by popularity."""
+        return rng.choices(
+            self.first_names, cum_weights=self.first_name_cum_weights, k=n
+        )
+
+    def sample_last_names(self, rng: random.Random, n: int) -> list[str]:
+        """Sample n last names by popularity."""
+        return rng.choices(
+            self.last_names, cum_weights=self.last_name_cum_weights, k=n
+        )
+
+    def sample_locations(
+        self, rng: random.Random, n: int
+    ) -> tuple[list[str], list[str]]:
+        """Sample n locations as parallel lists of cities and states."""
+        if self.locations:
+            pairs = rng.choices(self.locations, k=n)
+            return [city for city, _ in pairs], [state for _, state in pairs]
+        return self.sample_cities(rng, n), rng.choices(self.states, k=n)
+
+    def sample_cities(self, rng: random.Random, n: int) -> list[str]:
+        """Sample n city names."""
+        if self.locations:
+            return [city for city, _ in rng.choices(self.locations, k=n)]
+
+        prefixes = rng.choices(self.city_prefixes, k=n)
+        suffixes = rng.choices(self.city_suffixes, k=n)
+        names = self.sample_first_names(rng, n)
+        formats = rng.choices(range(4), k=n)
+
+        cities = []
+        for fmt, prefix, name, suffix in zip(
+            formats, prefixes, names, suffixes
+        ):
+            if fmt == 0:
+                cities.append(f"{prefix} {name}{suffix}")
+            elif fmt == 1:
+                cities.append(f"{prefix} {name}")
+            else:
+                cities.append(f"{name}{suffix}")
+        return cities
+
+    def sample_domains(self, rng: random.Random, n: int) -> list[str]:
+        """Sample n company-style domain names."""
+        if self.domains:
+            return rng.choices(self.domains, k=n)
+
+        first = self.sample_last_names(rng, n)
+        second = self.sample_last_names(rng, n)
+        hyphenated = rng.choices((False, True), k=n)
+        tlds = rng.choices(self.tlds, k=n)
+        return [
+            (f"{a}-{b}.{tld}" if both else f"{a}.{tld}").lower()
+            for a, b, both, tld in zip(first, second, hyphenated, tlds)
+        ]
+
+    def sample_phone_numbers(self, rng: random.Random, n: int) -> list[str]:
+        """Sample n US-style phone numbers."""
+        return [
+            f"{area}-{exchange}-{line:04d}"
+            for area, exchange, line in zip(
+                rng.choices(range(200, 1000), k=n),
+                rng.choices(range(200, 1000), k=n),
+                rng.choices(range(10000), k=n),
+            )
+        ]
+
+
+def get_pools(backend: str) -> DataPools:
+    """Get the pools for a data backend ('faker' or 'local')."""
+    if backend == "faker":
+        return faker_pools()
+    if backend == "local":
+        return local_pools()
+    raise ValueError(
+        f"Unknown data backend: {backend} (expected one of {BACKENDS})"
+    )
+
+
+def _cumulative(weights: list[float]) -> tuple[float, ...]:
+    return tuple(itertools.accumulate(weights))
+
+
+@functools.cache
+def faker_pools() -> DataPools:
+    """Pools built once from Faker's en_US locale data."""
+    # Imported here so the local backend never loads Faker.
+    from faker.providers.address.en_US import Provider as AddressProvider
+    from faker.providers.company.en_US import Provider as CompanyProvider
+    from faker.providers.internet.en_US import Provider as InternetProvider
+    from faker.providers.job.en_US import Provider as JobProvider
+    from faker.providers.lorem.en_US import Provider as LoremProvider
+    from faker.providers.person.en_US import Provider as PersonProvider
+
+    return DataPools(
+        first_names=tuple(PersonProvider.first_names),
+        first_name_cum_weights=_cumulative(
+            list(PersonProvider.first_names.values())
+        ),
+        last_names=tuple(PersonProvider.last_names),
+        last_name_cum_weights=_cumulative(
+            list(PersonProvider.last_names.values())
+        ),
+        states=tuple(AddressProvider.states_abbr),
+        job_titles=tuple(JobProvider.jobs),
+        company_suffixes=tuple(CompanyProvider.company_suffixes),
+        words=tuple(LoremProvider.word_list),
+        city_prefixes=tuple(AddressProvider.city_prefixes),
+        city_suffixes=tuple(AddressProvider.city_suffixes),
+        tlds=tuple(InternetProvider.tlds),
+    )
+
+
+def _load_weighted(filename: str) -> tuple[tuple[str, ...], tuple[float, ...]]:
+    """Load 'value,weight' lines into values and cumulative weights."""
+    values = []
+    weights = []
+    for line in load_data_file(filename):
+        value, weight = line.rsplit(",", 1)
+        values.append(value)
+        weights.append(float(weight))
+    return tuple(values), _cumulative(weights)
+
+
+@functools.cache
+def local_pools() -> DataPools:
+    """Pools loaded once from the data pack bundled with FakedIn."""
+    first_names, first_name_cum_weights = _load_weighted("first_names.txt")
+    last_names, last_name_cum_weights = _load_weighted("last_names.txt")
+    locations = tuple(
+        tuple(line.rsplit(",", 1)) for line in load_data_file("locations.txt")
+    )
+
+    return DataPools(
+        first_names=first_names,
+        first_name_cum_weights=first_name_cum_weights,
+        last_names=last_names,
+        last_name_cum_weights=last_name_cum_weights,
+        states=tuple(sorted({state for _, state in locations})),
+        job_titles=tuple(load_data_file("job_titles.txt")),
+        company_suffixes=tuple(load_data_file("company_suffixes.txt")),
+        words=tuple(load_data_file("company_words.txt")),
+        locations=locations,  # type: ignore[arg-type]
+        domains=tuple(load_data_file("domains.txt")),
+    )
+
+
+def load_data_file(filename: str) -> list[str]:
+    """Load data from a file in the data directory."""
+    file_path = settings.data_dir / filename
+    if not file_path.exists():
+        raise FileNotFoundError(f"Data file not found: {file_path}")
+
+    with open(file_path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
@@ -0,0 +1,226 @@
+"""Near-duplicate detection for generated documents with MinHash and LSH."""
+
+import string
+import threading
+import zlib
+from dataclasses import dataclass
+from typing import Optional
+
+# Hashes of word shingles are 32-bit; the low bits pick a signature slot
+_HASH_BITS = 32
+# Dropped before splitting into words, so Markdown markup doesn't count
+_PUNCTUATION = string.punctuation.encode("ascii")
+
+
+@dataclass(frozen=True)
+class DuplicateMatch:
+    """A document found to be a near-duplicate of one already indexed."""
+
+    label: str
+    similar_to: str
+    # Estimated Jaccard similarity of the two documents' shingles
+    similarity: float
+
+
+def minhash_signature(
+    text: str, num_perm: int = 128, shingle_size: int = 3
+) -> tuple[int, ...]:
+    """Compute a MinHash signature of a text's word shingles.
+
+    Uses one-permutation hashing: every shingle is hashed once, the hash
+    picks one of num_perm slots, and each slot keeps the smallest hash it
+    got. Empty slots borrow from the next filled one. This estimates
+    Jaccard similarity like num_perm separate hash functions would, at
+    the cost of a single pass over the shingles.
+
+    Args:
+        text: Text to compute the signature of. Compared case-insensitively
+            and ignoring punctuation and layout.
+        num_perm: Number of values in the signature. Must be a power of 2.
+        shingle_size: Number of consecutive words in each shingle.
+
+    Returns:
+        The signature, with num_perm values.
+    """
+    slot_bits = num_perm.bit_length() - 1
+    slot_mask = num_perm - 1
+    empty = 1 << _HASH_BITS
+    words = text.lower().encode("utf-8").translate(None, _PUNCTUATION).split()
+    shingles = set(
+        map(b" ".join, zip(*(words[i:] for i in range(shingle_size))))
+    )
+    if not shingles:
+        shingles = {b" ".join(words)}
+
+    # Assigned largest first, so each slot ends up with its smallest hash
+    hashes = sorted(map(zlib.crc32, shingles), reverse=True)
+    smallest = {hashed & slot_mask: hashed >> slot_bits for hashed in hashes}
+    slots = [smallest.get(slot, empty) for slot in range(num_perm)]
+
+    if empty in slots:
+        slots = _densify(slots, empty)
+    return tuple(slots)
+
+
+def _densify(slots: list[int], empty: int) -> list[int]:
+    """Fill empty slots from the next filled slot, wrapping around.
+
+    Each borrowed value is offset by the distance it was borrowed over, so
+    that two signatures only agree on a borrowed slot when they agree on
+    the slot it came from and on the distance.
+    """
+    num_perm = len(slots)
+    if all(value == empty for value in slots):
+        return slots
+    filled = list(slots)
+    for slot, value in enumerate(slots):
+        if value != empty:
+            continue
+        distance = 1
+        while slots[(slot + distance) % num_perm] == empty:
+            distance += 1
+        filled[slot] = slots[(slot + distance) % num_perm] + distance * empty
+    return filled
+
+
+class NearDuplicateIndex:
+    """Incremental index of documents for finding near-duplicates.
+
+    Signatures are split into bands of rows, and documents sharing every
+    row of any band are candidates. The bands are sized so that documents
+    above the threshold are very likely to become candidates and documents
+    well below it are not. Candidates are then compared on their whole
+    signatures, so adding a document costs a few dictionary lookups rather
+    than a comparison with every document already indexed.
+
+    Safe to use from several threads at once.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        num_perm: int = 128,
+        shingle_size: int = 3,
+    ):
+        """Initialize an empty index.
+
+        Args:
+            threshold: Estimated Jaccard similarity above which documents
+                are near-duplicates, from 0 to 1.
+            num_perm: Number of values in each document's MinHash
+                signature. Must be a power of 2.
+            shingle_size: Number of consecutive words in each shingle.
+
+        Raises:
+            ValueError: If the threshold or num_perm is invalid.
+        """
+        if not 0 < threshold <= 1:
+            raise ValueError(
+                f"threshold must be above 0 and at most 1, got {threshold}"
+            )
+        if num_perm < 2 or num_perm & (num_perm - 1):
+            raise ValueError(f"num_perm must be a power of 2, got {num_perm}")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = _band_shape(num_perm, threshold)
+        self.flagged: list[DuplicateMatch] = []
+        self._buckets: list[dict[tuple[int, ...], list[int]]] = [
+            {} for _ in range(self.bands)
+        ]
+        self._signatures: list[tuple[int, ...]] = []
+        self._labels: list[str] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def add(
+        self, label: str, text: str, keep_duplicate: bool = True
+    ) -> Optional[DuplicateMatch]:
+        """Add a document, checking it against those already added.
+
+        Args:
+            label: Name to report the document by.
+            text: Text of the document.
+            keep_duplicate: Add the document even if it is a near-duplicate,
+                recording it in flagged. Otherwise a near-duplicate is left
+                out, so that it can be replaced.
+
+        Returns:
+            The most similar indexed document above the threshold, or None
+            if the document isn't a near-duplicate.
+        """
+        # Computed outside the lock, as it's most of the work
+        signature = minhash_signature(text, self.num_perm, self.shingle_size)
+        band_keys = [
+            signature[band * self.rows : (band + 1) * self.rows]
+            for band in range(self.bands)
+        ]
+
+        duplicate = None
+        with self._lock:
+            match = self._best_match(signature, band_keys)
+            if match is not None:
+                similar_to, similarity = match
+                duplicate = DuplicateMatch(
+                    label, self._labels[similar_to], similarity
+                )
+                if not keep_duplicate:
+                    return duplicate
+                self.flagged.append(duplicate)
+
+            document = len(self._labels)
+            self._labels.append(label)
+            self._signatures.append(signature)
+            for buckets, key in zip(self._buckets, band_keys):
+                buckets.setdefault(key, []).append(document)
+
+        return duplicate
+
+    def _best_match(
+        self,
+        signature: tuple[int, ...],
+        band_keys: list[tuple[int, ...]],
+    ) -> Optional[tuple[int, float]]:
+        """Find the most similar candidate above the threshold."""
+        candidates: set[int] = set()
+        for buckets, key in zip(self._buckets, band_keys):
+            candidates.update(buckets.get(key, ()))
+
+        best: Optional[tuple[int, float]] = None
+        for document in candidates:
+            similarity = _similarity(signature, self._signatures[document])
+            if similarity >= self.threshold and (
+                best is None or similarity > best[1]
+            ):
+                best = (document, similarity)
+        return best
+
+
+def _similarity(first: tuple[int, ...], second: tuple[int, ...]) -> float:
+    """Estimate the Jaccard similarity of two documents by their
+    signatures.
+    """
+    return sum(map(int.__eq__, first, second)) / len(first)
+
+
+def _band_shape(num_perm: int, threshold: float) -> tuple[int, int]:
+    """Choose the number of bands, and rows in each, for a threshold.
+
+    Documents with similarity s share a band with probability
+    1 - (1 - s^rows)^bands, which rises most steeply at about
+    (1 / bands)^(1 / rows). The shape putting that point just below the
+    threshold is chosen, so near-duplicates are rarely missed.
+    """
+    shapes = [
+        (num_perm // rows, rows)
+        for rows in range(1, num_perm + 1)
+        if num_perm % rows == 0
+    ]
+    below = [
+        (bands, rows)
+        for bands, rows in shapes
+        if (1 / bands) ** (1 / rows) <= threshold
+    ]
+    return max(below or shapes[:1], key=lambda shape: shape[1])
@@ -0,0 +1,214 @@
+"""Local stand-in for the OpenAI chat completions API, for benchmarks.
+
+The server answers every chat completion request with generated Markdown
+after a configurable delay, and fails a configurable share of requests, so
+the generation pipeline can be exercised end to end without an API key or
+any spending.
+"""
+
+import json
+import multiprocessing
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+
+WORDS = (
+    "led built designed shipped scaled improved reduced managed mentored "
+    "launched automated analyzed delivered migrated optimized partnered "
+    "platform pipeline customers revenue latency quality team roadmap "
+    "budget service process reporting compliance research operations "
+    "strategy clients growth retention onboarding infrastructure"
+).split()
+
+
+@dataclass(frozen=True)
+class FakeServerConfig:
+    """Behavior of the fake API server."""
+
+    # Mean seconds before a response is sent
+    latency: float = 0.5
+    # Seconds the delay varies by, up or down
+    jitter: float = 0.0
+    # Share of requests answered with a server error instead
+    error_rate: float = 0.0
+    # Approximate characters of generated content per response
+    response_size: int = 4000
+    seed: Optional[int] = None
+
+
+def fake_markdown(rng: random.Random, size: int) -> str:
+    """Generate résumé-like Markdown of roughly size characters.
+
+    Uses headings, bullets and inline bold and italic text, so responses
+    exercise the same rendering paths as real ones.
+    """
+    lines = ["# Alex Example", "", "alex@example.com | 555-0100", ""]
+    length = sum(len(line) + 1 for line in lines)
+    section = 0
+    while length < size:
+        section += 1
+        block = [f"## Section {section}", ""]
+        for _ in range(4):
+            words = rng.choices(WORDS, k=14)
+            words[2] = f"**{words[2]}**"
+            words[7] = f"_{words[7]}_"
+            block.append("- " + " ".join(words).capitalize() + ".")
+        block.append("")
+        lines.extend(block)
+        length += sum(len(line) + 1 for line in block)
+    return "\n".join(lines)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_FakeHTTPServer"
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send(404, {"error": {"message": "Not found"}})
+            return
+
+        request = json.loads(body or b"{}")
+        config = self.server.config
+        with self.server.rng_lock:
+            delay = config.latency + self.server.rng.uniform(
+                -config.jitter, config.jitter
+            )
+            failed = self.server.rng.random() < config.error_rate
+            seed = self.server.rng.getrandbits(32)
+        time.sleep(max(delay, 0.0))
+
+        if failed:
+            self._send(
+                500,
+                {
+                    "error": {
+                        "message": "Simulated server error",
+                        "type": "server_error",
+                    }
+                },
+            )
+            return
+
+        content = fake_markdown(random.Random(seed), config.response_size)
+        prompt_tokens = len(json.dumps(request.get("messages", []))) // 4
+        completion_tokens = len(content) // 4
+        self._send(
+            200,
+            {
+                "id": f"chatcmpl-fake-{seed}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "fake"),
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                    "prompt_tokens_details": {"cached_tokens": 0},
+                },
+            },
+        )
+
+    def _send(self, status: int, payload: dict[str, Any]) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # Benchmarks send thousands of requests; don't log each one
+        pass
+
+
+class _FakeHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], config: FakeServerConfig):
+        super().__init__(address, _Handler)
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.rng_lock = threading.Lock()
+
+
+def _serve(config: FakeServerConfig, host: str, port_sender: Any) -> None:
+    """Run the server until the process is terminated."""
+    server = _FakeHTTPServer((host, 0), config)
+    port_sender.send(server.server_address[1])
+    port_sender.close()
+    server.serve_forever()
+
+
+class FakeOpenAIServer:
+    """Fake OpenAI API served from a separate process.
+
+    Running in its own process keeps the server's CPU time and memory out
+    of measurements of the process using it.
+    """
+
+    def __init__(
+        self,
+        config: Optional[FakeServerConfig] = None,
+        host: str = "127.0.0.1",
+    ):
+        """Initialize the server. It starts on start() or entering a with
+        block.
+
+        Args:
+            config: Behavior of the server. Defaults to FakeServerConfig().
+            host: Address to listen on. A free port is picked.
+        """
+        self.config = config or FakeServerConfig()
+        self.host = host
+        self._process: Optional[multiprocessing.process.BaseProcess] = None
+        self._port: Optional[int] = None
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to give OpenAI clients."""
+        if self._port is None:
+            raise RuntimeError("The fake OpenAI server isn't running")
+        return f"http://{self.host}:{self._port}/v1"
+
+    def start(self) -> None:
+        """Start the server process and wait until it is listening."""
+        context = multiprocessing.get_context("spawn")
+        receiver, sender = context.Pipe(duplex=False)
+        self._process = context.Process(
+            target=_serve, args=(self.config, self.host, sender), daemon=True
+        )
+        self._process.start()
+        sender.close()
+        try:
+            if not receiver.poll(30):
+                raise EOFError
+            self._port = receiver.recv()
+        except EOFError:
+            self.stop()
+            raise RuntimeError("The fake OpenAI server didn't start") from None
+
+    def stop(self) -> None:
+        """Stop the server process."""
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+            self._process = None
+        self._port = None
+
+    def __enter__(self) -> "FakeOpenAIServer":
+        self.start()
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        self.stop()
@@ -0,0 +1,175 @@
+"""Helpers for writing output files."""
+
+import os
+import sys
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, TextIO, Union
+
+# Path of a saved output, or a future of it while the output is still being
+# written elsewhere, such as a PDF rendering in a worker process
+PathOrFuture = Union[Path, "Future[Path]"]
+
+
+@contextmanager
+def atomic_output(output_path: Path) -> Iterator[Path]:
+    """Provide a temporary path that replaces output_path once written.
+
+    The final file only appears once writing has finished, so an
+    interrupted run never leaves a partial file that looks complete.
+
+    Args:
+        output_path: Final path of the file.
+
+    Yields:
+        Temporary path in the same directory to write the file to.
+    """
+    temp_path = output_path.with_name(
+        f".{output_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    )
+    try:
+        yield temp_path
+        os.replace(temp_path, output_path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
+class OutputPaths:
+    """Output paths claimed during one run, so its outputs don't overwrite
+    each other.
+
+    Outputs are named after their details, so two items can get the same
+    name, such as the résumés of two people with the same name. Rather than
+    overwrite each other, the later one becomes name_2, name_3 and so on.
+    Only paths of the same run are taken: files left by an earlier run are
+    overwritten, as a rerun is expected to replace them.
+
+    Safe to use from several threads at once.
+    """
+
+    def __init__(self) -> None:
+        self._claimed: set[Path] = set()
+        self._lock = threading.Lock()
+
+    def claim(self, output_path: Path) -> Path:
+        """Claim an output path, numbering it if the run already has it.
+
+        Args:
+            output_path: Path the output would be saved to.
+
+        Returns:
+            The path to save the output to.
+        """
+        with self._lock:
+            candidate = output_path
+            number = 2
+            while candidate in self._claimed:
+                candidate = output_path.with_name(
+                    f"{output_path.stem}_{number}{output_path.suffix}"
+                )
+                number += 1
+            self._claimed.add(candidate)
+            return candidate
+
+    def reserve(self, output_path: Path) -> None:
+        """Mark a path as taken, such as the output of an item a resumed
+        run already completed.
+        """
+        with self._lock:
+            self._claimed.add(output_path)
+
+
+def wait_for_path(output: PathOrFuture) -> Path:
+    """Wait for an output to be saved, returning its path.
+
+    Raises:
+        Exception: Whatever error saving the output failed with.
+    """
+    return output.result() if isinstance(output, Future) else output
+
+
+def after_saved(
+    output: PathOrFuture,
+    callback: Callable[[Optional[Path], Optional[BaseException]], None],
+) -> PathOrFuture:
+    """Call a function once an output is saved, or has failed to be.
+
+    The callback gets the output's path, or the error saving it failed
+    with. For an output still being written, it runs on the thread that
+    finishes writing it.
+
+    Args:
+        output: The output.
+        callback: Function taking the path, or None and the error.
+
+    Returns:
+        The path, or a future of it that finishes only once the callback
+        has run, so waiting for the output also waits for the callback.
+    """
+    if not isinstance(output, Future):
+        callback(output, None)
+        return output
+
+    done: Future[Path] = Future()
+
+    def _on_done(future: Future[Path]) -> None:
+        try:
+            error = future.exception()
+            path = future.result() if error is None else None
+            callback(path, error)
+        except BaseException as exc:
+            done.set_exception(exc)
+            return
+        if error is None:
+            done.set_result(path)  # type: ignore[arg-type]
+        else:
+            done.set_exception(error)
+
+    output.add_done_callback(_on_done)
+    return done
+
+
+def atomic_write_text(output_path: Path, content: str) -> None:
+    """Write a UTF-8 text file atomically."""
+    with atomic_output(output_path) as temp_path:
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+
+def atomic_write_chunks(output_path: Path, chunks: Iterable[str]) -> None:
+    """Write a UTF-8 text file atomically from chunks as they arrive.
+
+    Each chunk is written out as soon as it is produced, so the text never
+    has to be held in memory as a whole.
+    """
+    with atomic_output(output_path) as temp_path:
+        with open(temp_path, "w", encoding="utf-8") as f:
+            for chunk in chunks:
+                f.write(chunk)
+
+
+def echo_chunks(
+    chunks: Iterable[str], stream: Optional[TextIO] = None
+) -> Iterator[str]:
+    """Pass chunks of text through, also writing each one to a stream.
+
+    Args:
+        chunks: Chunks of text, in order.
+        stream: Text stream to echo to. Defaults to stdout.
+
+    Yields:
+        The same chunks, unchanged.
+    """
+    stream = stream or sys.stdout
+    last = ""
+    for chunk in chunks:
+        stream.write(chunk)
+        stream.flush()
+        last = chunk
+        yield chunk
+    if not last.endswith("\n"):
+        stream.write("\n")
+        stream.flush()
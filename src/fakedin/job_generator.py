@@ -2,18 +2,49 @@
 
 import os
 from pathlib import Path
+from typing import Any, Iterable, Literal
 
+from fakedin.batch import BatchRequest, BatchRunner
+from fakedin.file_utils import (
+    OutputPaths,
+    atomic_write_chunks,
+    atomic_write_text,
+    echo_chunks,
+)
 from fakedin.job_data_generator import JobGenerator
 from fakedin.llm_client import LLMClient
+from fakedin.manifest import RunManifest
+from fakedin.models import JobOpening
+from fakedin.pipeline import generate_items
+from fakedin.seeding import derive_seed
+from fakedin.sharding import Shard
+from fakedin.sinks import OutputSink
+
+# JSON output is only available in structured mode
+OutputFormat = Literal["markdown", "json"]
 
 
 class JobOpeningGenerator:
     """Generator for fake job openings."""
 
-    def __init__(self):
-        """Initialize the job opening generator."""
+    def __init__(
+        self,
+        llm_client: LLMClient | None = None,
+        sink: OutputSink | None = None,
+    ):
+        """Initialize the job opening generator.
+
+        Args:
+            llm_client: Client to generate text with. Defaults to a new
+                client using the configured model.
+            sink: Optional sink to store job openings in as dataset
+                records, instead of saving each one as its own file.
+        """
         self.job_generator = JobGenerator()
-        self.llm_client = LLMClient()
+        self.llm_client = llm_client or LLMClient()
+        self.sink = sink
+        # Output paths of the current run, so same-named files get numbered
+        self.output_paths = OutputPaths()
 
     def generate(self, output_dir: Path | None = None) -> Path:
         """Generate a single job opening.
@@ -28,32 +59,145 @@ class JobOpeningGenerator:
         # Generate random job details
         job = self.job_generator.generate_job()
 
+        return self.generate_for_job(job, output_dir)
+
+    def generate_for_job(
+        self,
+        job: dict[str, Any],
+        output_dir: Path | None = None,
+        stream: bool = False,
+        structured: bool = False,
+        output_format: OutputFormat = "markdown",
+    ) -> Path:
+        """Generate a single job opening for already generated job details.
+
+        Args:
+            job: Job details, as produced by JobGenerator.
+            output_dir: Directory to save the job opening in. Defaults to the
+                current directory.
+            stream: Print the job opening to stdout as it is generated and
+                write it to disk incrementally.
+            structured: Generate a typed JobOpening and render the output
+                from it. Always used for JSON output.
+            output_format: Format to output the job opening in ('markdown'
+                or 'json').
+
+        Returns:
+            Path to the generated file.
+        """
+        if structured or output_format == "json":
+            job_opening = self.llm_client.generate_structured_from_promptdown(
+                "job_opening_structured", job, JobOpening
+            )
+            return self.save_job_document(
+                job_opening, job, output_format, output_dir
+            )
+
         # Generate job opening content using LLM
-        job_text = self.llm_client.generate_from_promptdown(
-            "job_opening",
-            job,
-        )
+        job_text: str | Iterable[str]
+        if stream:
+            job_text = echo_chunks(
+                self.llm_client.stream_from_promptdown("job_opening", job)
+            )
+        else:
+            job_text = self.llm_client.generate_from_promptdown(
+                "job_opening",
+                job,
+            )
+
+        return self.save_job(job_text, job, output_dir)
+
+    def save_job(
+        self,
+        job_text: str | Iterable[str],
+        job: dict[str, Any],
+        output_dir: Path | None = None,
+    ) -> Path:
+        """Save generated job opening text under a name derived from the job.
+
+        With a sink, the job opening is stored in it instead.
+
+        Args:
+            job_text: Generated job opening in Markdown, either whole or as
+                chunks of text still being generated.
+            job: Job details the opening was generated for.
+            output_dir: Directory to save the job opening in. Defaults to the
+                current directory.
+
+        Returns:
+            Path to the saved file.
+        """
+        if self.sink is not None:
+            if not isinstance(job_text, str):
+                job_text = "".join(job_text)
+            return self.sink.write(self._file_stem(job), job, job_text)
 
         # Create output directory if it doesn't exist
         if output_dir is None:
             output_dir = Path.cwd()
         os.makedirs(output_dir, exist_ok=True)
 
-        # Create sanitized filename
-        sanitized_name = (
-            job["company_name"].lower().replace(" ", "_").replace(".", "")
-        )
-        sanitized_field = (
-            job["career_field"].lower().replace(" ", "_").replace(".", "")
+        output_path = self.output_paths.claim(
+            output_dir / f"{self._file_stem(job)}.md"
         )
-
-        output_path = output_dir / f"{sanitized_name}_{sanitized_field}_job.md"
         self._save_as_markdown(job_text, output_path)
 
         return output_path
 
+    def save_job_document(
+        self,
+        job_opening: JobOpening,
+        job: dict[str, Any],
+        output_format: OutputFormat = "markdown",
+        output_dir: Path | None = None,
+    ) -> Path:
+        """Save a structured job opening as JSON, or rendered as Markdown.
+
+        With a sink, the job opening and its document are stored in it instead.
+
+        Args:
+            job_opening: Generated job opening.
+            job: Job details the opening was generated for.
+            output_format: Format to output the job opening in ('markdown'
+                or 'json').
+            output_dir: Directory to save the job opening in. Defaults to the
+                current directory.
+
+        Returns:
+            Path to the saved file.
+        """
+        if self.sink is not None:
+            return self.sink.write(
+                self._file_stem(job),
+                job,
+                job_opening.to_markdown(),
+                job_opening.model_dump(),
+            )
+        if output_format != "json":
+            return self.save_job(job_opening.to_markdown(), job, output_dir)
+
+        if output_dir is None:
+            output_dir = Path.cwd()
+        os.makedirs(output_dir, exist_ok=True)
+
+        output_path = self.output_paths.claim(
+            output_dir / f"{self._file_stem(job)}.json"
+        )
+        atomic_write_text(output_path, job_opening.model_dump_json(indent=2))
+        return output_path
+
     def generate_multiple(
-        self, count: int, output_dir: Path | None = None
+        self,
+        count: int,
+        output_dir: Path | None = None,
+        concurrency: int = 1,
+        manifest: RunManifest | None = None,
+        resume: bool = False,
+        seed: int | None = None,
+        stream: bool = False,
+        structured: bool = False,
+        output_format: OutputFormat = "markdown",
+        shard: Shard | None = None,
     ) -> list[Path]:
         """Generate multiple job openings.
 
@@ -61,20 +205,121 @@ class JobOpeningGenerator:
             count: Number of job openings to generate.
             output_dir: Directory to save the job openings in. Defaults to the
                 current directory.
+            concurrency: Maximum number of job openings generated at once.
+            manifest: Optional manifest to record the run in.
+            resume: Continue the run recorded in the manifest, skipping job
+                openings that were already generated.
+            seed: Optional seed making the generated jobs reproducible.
+            stream: Print each job opening to stdout as it is generated.
+                Best used with a concurrency of 1 so outputs don't
+                interleave.
+            structured: Generate typed job openings and render the outputs
+                from them. Always used for JSON output.
+            output_format: Format to output the job openings in ('markdown'
+                or 'json').
+            shard: Optional shard of the run to generate, for spreading
+                the run across machines.
+
+        Returns:
+            List of paths to the generated files, in generation order.
+        """
+        self.output_paths = OutputPaths()
+        return generate_items(
+            count,
+            draw_item=self._draw_job,
+            produce=lambda job: self.generate_for_job(
+                job, output_dir, stream, structured, output_format
+            ),
+            label="job opening",
+            concurrency=concurrency,
+            manifest=manifest,
+            resume=resume,
+            seed=seed,
+            metrics=self.llm_client.metrics,
+            shard=shard,
+            output_paths=self.output_paths,
+        )
+
+    def generate_batch(
+        self,
+        batch_runner: BatchRunner,
+        count: int,
+        output_dir: Path | None = None,
+        batch_id: str | None = None,
+        seed: int | None = None,
+    ) -> list[Path]:
+        """Generate multiple job openings through the OpenAI Batch API.
+
+        Args:
+            batch_runner: Runner used to submit and collect the batch.
+            count: Number of job openings to generate. Ignored when resuming.
+            output_dir: Directory to save the job openings in. Defaults to the
+                current directory.
+            batch_id: Id of a previously submitted batch to resume instead
+                of submitting a new one.
+            seed: Optional seed making the generated jobs reproducible.
 
         Returns:
             List of paths to the generated files.
         """
-        generated_files: list[Path] = []
+        self.output_paths = OutputPaths()
+        if batch_id is None:
+            requests = []
+            for i in range(count):
+                job = self._draw_job(
+                    derive_seed(seed, i) if seed is not None else None
+                )
+                requests.append(
+                    BatchRequest(
+                        custom_id=f"job-{i}",
+                        messages=self.llm_client.build_messages(
+                            "job_opening", job
+                        ),
+                        metadata=job,
+                    )
+                )
+            batch_id = batch_runner.submit(requests)
+            print(f"Submitted batch {batch_id} with {count} job openings")
+
+        return batch_runner.save_results(
+            batch_id,
+            batch_runner.collect(batch_id),
+            lambda result: self.save_job(
+                result.content or "", result.metadata, output_dir
+            ),
+            label="job opening",
+            output_paths=self.output_paths,
+        )
 
-        for i in range(count):
-            file_path = self.generate(output_dir)
-            generated_files.append(file_path)
-            print(f"Generated job opening {i + 1}/{count}: {file_path}")
+    def _draw_job(self, seed: int | None) -> dict[str, Any]:
+        """Generate job details, reseeding first if a seed is given."""
+        if seed is not None:
+            self.job_generator.reseed(seed)
+        return self.job_generator.generate_job()
 
-        return generated_files
+    def _file_stem(self, job: dict[str, Any]) -> str:
+        """Build the output file name, without extension, for a job."""
+        sanitized_name = (
+            job["company_name"]
+            .lower()
+            .replace(" ", "_")
+            .replace(".", "")
+            .replace("/", "_")
+        )
+        sanitized_field = (
+            job["career_field"]
+            .lower()
+            .replace(" ", "_")
+            .replace(".", "")
+            .replace("/", "_")
+        )
+        return f"{sanitized_name}_{sanitized_field}_job"
 
-    def _save_as_markdown(self, content: str, output_path: Path) -> None:
+    def _save_as_markdown(
+        self, content: str | Iterable[str], output_path: Path
+    ) -> None:
         """Save the job opening as a Markdown file."""
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(content)
+        if isinstance(content, str):
+            atomic_write_text(output_path, content)
+        else:
+            atomic_write_chunks(output_path, content)
@@ -1,25 +1,249 @@
 """Client for interacting with LLMs."""
 
-from typing import Any, Optional
+from __future__ import annotations
 
-import openai
-from promptdown import StructuredPrompt
+import asyncio
+import functools
+import threading
+import time
+import weakref
+from dataclasses import replace
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Generator,
+    Iterator,
+    Optional,
+    TypeVar,
+    Union,
+)
+
+from pydantic import BaseModel, ValidationError
 
 from fakedin.config import settings, validate_settings
+from fakedin.metrics import CallMetrics, MetricsCollector, default_prices
+from fakedin.models import json_schema_format
+from fakedin.prompt_cache import prompt_cache
+from fakedin.rate_limit import RateLimiter, RetryPolicy
+from fakedin.response_cache import ResponseCache
+
+if TYPE_CHECKING:
+    import httpx
+    import openai
+
+# OpenAI clients are shared process-wide so that every LLMClient reuses the
+# same pooled TCP/TLS connections instead of opening its own.
+_clients_lock = threading.Lock()
+_shared_clients: dict[tuple[str, Optional[str]], openai.OpenAI] = {}
+# Async connections belong to the event loop that opened them, so async
+# clients are shared per loop and dropped along with it.
+_shared_async_clients: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop,
+    dict[tuple[str, Optional[str]], openai.AsyncOpenAI],
+] = weakref.WeakKeyDictionary()
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+ResultT = TypeVar("ResultT")
+
+# Steps of a request, with the waiting and sending left to whoever runs
+# them, so the sync and async APIs share one implementation. Each step is
+# either seconds to wait, or a function sending the request whose result
+# (or exception) is passed back in. The steps return the request's result.
+_Steps = Generator[Union[float, Callable[[], Any]], Any, ResultT]
+
+
+def _connection_limits() -> httpx.Limits:
+    """Build the connection pool limits from settings."""
+    import httpx
+
+    return httpx.Limits(
+        max_connections=settings.max_connections,
+        max_keepalive_connections=settings.max_keepalive_connections,
+        keepalive_expiry=settings.keepalive_expiry,
+    )
+
+
+def get_shared_client(
+    api_key: str, base_url: Optional[str] = None
+) -> openai.OpenAI:
+    """Get the process-wide synchronous OpenAI client for an API key and
+    API base URL (None for the OpenAI API).
+    """
+    # openai takes most of a second to import, so it is only imported once
+    # a request is about to be sent.
+    import openai
+
+    with _clients_lock:
+        client = _shared_clients.get((api_key, base_url))
+        if client is None:
+            client = openai.OpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                # Retries are scheduled by LLMClient so that they respect
+                # the shared rate limiter.
+                max_retries=0,
+                http_client=openai.DefaultHttpxClient(
+                    limits=_connection_limits()
+                ),
+            )
+            _shared_clients[(api_key, base_url)] = client
+        return client
+
+
+def get_shared_async_client(
+    api_key: str, base_url: Optional[str] = None
+) -> openai.AsyncOpenAI:
+    """Get the async OpenAI client for an API key and API base URL on the
+    running loop.
+
+    Must be called from within a running event loop.
+    """
+    import openai
+
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        clients = _shared_async_clients.setdefault(loop, {})
+        client = clients.get((api_key, base_url))
+        if client is None:
+            client = openai.AsyncOpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                max_retries=0,
+                http_client=openai.DefaultAsyncHttpxClient(
+                    limits=_connection_limits()
+                ),
+            )
+            clients[(api_key, base_url)] = client
+        return client
+
+
+def reset_shared_clients() -> None:
+    """Forget all shared clients so new ones are built on next use.
+
+    Existing clients are not closed; callers still holding them may keep
+    using them.
+    """
+    with _clients_lock:
+        _shared_clients.clear()
+        _shared_async_clients.clear()
+
+
+def estimate_tokens(messages: list[dict[str, Any]]) -> int:
+    """Roughly estimate the tokens a request will use, for rate limiting.
+
+    Uses about four characters per prompt token plus the configured
+    expected completion length.
+    """
+    characters = 0
+    for message in messages:
+        content = message.get("content") or ""
+        if isinstance(content, str):
+            characters += len(content)
+        else:
+            characters += sum(len(part.get("text", "")) for part in content)
+    return characters // 4 + settings.expected_completion_tokens
+
+
+def _run_steps(steps: _Steps[ResultT]) -> ResultT:
+    """Carry out the steps of a request on the calling thread.
+
+    Returns:
+        What the steps return.
+    """
+    try:
+        step = next(steps)
+        while True:
+            if not callable(step):
+                time.sleep(step)
+                step = next(steps)
+                continue
+            try:
+                result = step()
+            except Exception as exc:
+                step = steps.throw(exc)
+            else:
+                step = steps.send(result)
+    except StopIteration as stop:
+        return stop.value
+
+
+async def _arun_steps(steps: _Steps[ResultT]) -> ResultT:
+    """Carry out the steps of a request on the running event loop, where
+    sending returns an awaitable.
+
+    Returns:
+        What the steps return.
+    """
+    try:
+        step = next(steps)
+        while True:
+            if not callable(step):
+                await asyncio.sleep(step)
+                step = next(steps)
+                continue
+            try:
+                result = await step()
+            except Exception as exc:
+                step = steps.throw(exc)
+            else:
+                step = steps.send(result)
+    except StopIteration as stop:
+        return stop.value
 
 
 class LLMClient:
     """Client for generating text via OpenAI API."""
 
-    def __init__(self, model: Optional[str] = None):
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        metrics: Optional[MetricsCollector] = None,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+    ):
         """Initialize the LLM client.
 
         Args:
             model: The model to use. Defaults to the one in settings.
+            cache: Optional persistent cache of responses. Requests whose
+                model and messages are already cached are not sent.
+            rate_limiter: Limiter shared by every request made through this
+                client. Defaults to one using the limits in settings.
+            retry_policy: Policy for retrying failed requests. Defaults to
+                one using the retry count in settings.
+            metrics: Collector to record every request's latency, tokens
+                and retries in. Defaults to a new one pricing tokens as
+                configured in settings.
+            api_key: API key to use. Defaults to the one in settings.
+            base_url: Base URL of an OpenAI-compatible API to send requests
+                to. Defaults to the one in settings, if any, and otherwise
+                the OpenAI API.
         """
-        validate_settings()
-        self.client = openai.OpenAI(api_key=settings.openai_api_key)
+        if api_key is None:
+            validate_settings()
+        self.api_key = api_key or settings.openai_api_key
+        self.base_url = base_url or settings.openai_base_url
         self.model = model or settings.openai_model
+        self.cache = cache
+        self.rate_limiter = rate_limiter or RateLimiter(
+            requests_per_minute=settings.requests_per_minute or None,
+            tokens_per_minute=settings.tokens_per_minute or None,
+        )
+        self.retry_policy = retry_policy or RetryPolicy(
+            max_retries=settings.max_retries
+        )
+        self.metrics = metrics or MetricsCollector(default_prices())
+
+    @property
+    def client(self) -> openai.OpenAI:
+        """Shared OpenAI client for this client's API key and base URL,
+        created when it is first needed.
+        """
+        return get_shared_client(self.api_key, self.base_url)
 
     def generate_from_promptdown(
         self, prompt_file: str, variables: dict[str, Any]
@@ -34,20 +258,7 @@ class LLMClient:
             Generated text.
         """
         try:
-            prompt_path = settings.get_prompt_path(prompt_file)
-
-            # Load the structured prompt from the file
-            structured_prompt = StructuredPrompt.from_promptdown_file(
-                str(prompt_path)
-            )
-
-            # Apply template values to the prompt
-            structured_prompt = structured_prompt.apply_template_values(
-                variables
-            )
-
-            # Convert to chat completion messages format
-            messages = structured_prompt.to_chat_completion_messages()
+            messages = self.build_messages(prompt_file, variables)
 
             # Generate the response using the model
             return self.generate_with_messages(messages)
@@ -60,22 +271,446 @@ class LLMClient:
                 f"Error generating from promptdown: {exc}"
             ) from exc
 
-    def generate_with_messages(self, messages: list[dict[str, Any]]) -> str:
+    def generate_with_messages(
+        self,
+        messages: list[dict[str, Any]],
+        response_format: Optional[dict[str, Any]] = None,
+        validate: Optional[Callable[[str], Any]] = None,
+    ) -> str:
         """Generate text using the OpenAI API with formatted messages.
 
         Args:
             messages: The messages to send to the API in chat format.
+            response_format: Optional response format of the request, such
+                as a JSON schema the response must follow.
+            validate: Optional function raising if a response is unusable.
+                Only responses it accepts are cached, so a bad response
+                isn't replayed on the next attempt.
 
         Returns:
             Generated text.
         """
+        return _run_steps(
+            self._generation(
+                lambda: self.client.chat.completions.create,
+                messages,
+                response_format,
+                validate,
+            )
+        )
+
+    def generate_structured_from_promptdown(
+        self,
+        prompt_file: str,
+        variables: dict[str, Any],
+        model: type[ModelT],
+    ) -> ModelT:
+        """Generate a typed document using a promptdown file.
+
+        Args:
+            prompt_file: Name of the promptdown file (without extension).
+            variables: Variables to use in the prompt.
+            model: Pydantic model the response must be an instance of.
+
+        Returns:
+            The generated document.
+        """
+        try:
+            messages = self.build_messages(prompt_file, variables)
+        except FileNotFoundError:
+            raise FileNotFoundError(
+                f"Prompt file not found: {prompt_file}.prompt.md"
+            )
+
+        return self.generate_structured(messages, model)
+
+    def generate_structured(
+        self, messages: list[dict[str, Any]], model: type[ModelT]
+    ) -> ModelT:
+        """Generate a typed document using a JSON schema response format.
+
+        Args:
+            messages: The messages to send to the API in chat format.
+            model: Pydantic model the response must be an instance of.
+
+        Returns:
+            The generated document.
+
+        Raises:
+            RuntimeError: If the response doesn't match the model.
+        """
+        documents: list[ModelT] = []
+
+        def _validate(content: str) -> None:
+            try:
+                documents.append(model.model_validate_json(content))
+            except ValidationError as exc:
+                raise RuntimeError(
+                    f"Response does not match {model.__name__}: {exc}"
+                ) from exc
+
+        self.generate_with_messages(
+            messages,
+            response_format=json_schema_format(model),
+            validate=_validate,
+        )
+        return documents[-1]
+
+    def stream_from_promptdown(
+        self, prompt_file: str, variables: dict[str, Any]
+    ) -> Iterator[str]:
+        """Stream text generated from a promptdown file.
+
+        Args:
+            prompt_file: Name of the promptdown file (without extension).
+            variables: Variables to use in the prompt.
+
+        Returns:
+            Iterator over chunks of the generated text.
+        """
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,  # type: ignore
+            messages = self.build_messages(prompt_file, variables)
+        except FileNotFoundError:
+            raise FileNotFoundError(
+                f"Prompt file not found: {prompt_file}.prompt.md"
             )
 
-            # Extract the generated text from the response
-            return response.choices[0].message.content or ""
+        return self.stream_with_messages(messages)
+
+    def stream_with_messages(
+        self, messages: list[dict[str, Any]]
+    ) -> Iterator[str]:
+        """Stream generated text as it arrives from the OpenAI API.
+
+        The request is sent when iteration starts. Failures to start the
+        stream are retried like any other request; a stream that breaks off
+        part way raises instead, since its chunks have already been handed
+        out. A cached response is yielded as a single chunk.
+
+        Args:
+            messages: The messages to send to the API in chat format.
+
+        Yields:
+            Chunks of the generated text, in order.
+        """
+        cache_key = self._cache_key(messages)
+        if cache_key is not None and self.cache is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
+
+        create = self.client.chat.completions.create
+        estimated_tokens = estimate_tokens(messages)
+        started = time.perf_counter()
+        stream, attempt = _run_steps(
+            self._attempts(
+                functools.partial(
+                    create,
+                    model=self.model,
+                    messages=messages,
+                    stream=True,
+                    stream_options={"include_usage": True},
+                ),
+                estimated_tokens,
+                started,
+            )
+        )
+
+        # Already imported to send the request
+        import openai
+
+        # Only kept when the full response has to be cached
+        parts: Optional[list[str]] = [] if cache_key is not None else None
+        usage = None
+        try:
+            for chunk in stream:
+                # The final chunk carries usage and no choices
+                usage = self._record_usage(chunk, estimated_tokens) or usage
+                if not chunk.choices:
+                    continue
+                text = chunk.choices[0].delta.content
+                if text:
+                    if parts is not None:
+                        parts.append(text)
+                    yield text
+        except openai.OpenAIError as exc:
+            self._record_call(started, attempt, usage, failed=True)
+            raise RuntimeError(f"Error generating text: {exc}") from exc
+        finally:
+            stream.close()
+
+        self._record_call(started, attempt, usage)
+
+        if parts is not None:
+            self._store_in_cache(cache_key, "".join(parts))
+
+    async def agenerate_from_promptdown(
+        self, prompt_file: str, variables: dict[str, Any]
+    ) -> str:
+        """Asynchronously generate text using a promptdown file.
+
+        Args:
+            prompt_file: Name of the promptdown file (without extension).
+            variables: Variables to use in the prompt.
+
+        Returns:
+            Generated text.
+        """
+        try:
+            messages = self.build_messages(prompt_file, variables)
+
+            return await self.agenerate_with_messages(messages)
+        except FileNotFoundError:
+            raise FileNotFoundError(
+                f"Prompt file not found: {prompt_file}.prompt.md"
+            )
         except Exception as exc:
+            raise RuntimeError(
+                f"Error generating from promptdown: {exc}"
+            ) from exc
+
+    async def agenerate_with_messages(
+        self,
+        messages: list[dict[str, Any]],
+        response_format: Optional[dict[str, Any]] = None,
+        validate: Optional[Callable[[str], Any]] = None,
+    ) -> str:
+        """Asynchronously generate text using formatted messages.
+
+        Behaves like generate_with_messages. Requests share one pooled
+        async client per event loop, so many of them can be awaited
+        concurrently over reused connections.
+
+        Args:
+            messages: The messages to send to the API in chat format.
+            response_format: Optional response format of the request, such
+                as a JSON schema the response must follow.
+            validate: Optional function raising if a response is unusable.
+                Only responses it accepts are cached.
+
+        Returns:
+            Generated text.
+        """
+        return await _arun_steps(
+            self._generation(
+                lambda: get_shared_async_client(
+                    self.api_key, self.base_url
+                ).chat.completions.create,
+                messages,
+                response_format,
+                validate,
+            )
+        )
+
+    def _generation(
+        self,
+        connect: Callable[[], Callable[..., Any]],
+        messages: list[dict[str, Any]],
+        response_format: Optional[dict[str, Any]],
+        validate: Optional[Callable[[str], Any]],
+    ) -> _Steps[str]:
+        """Steps of generating text, shared by the sync and async APIs.
+
+        Answers from the cache when it can. Otherwise sends the request
+        through _attempts, records it, and caches the response once
+        validate accepts it.
+
+        Args:
+            connect: Function returning the function that sends a chat
+                completion request, called only if one is needed.
+            messages: The messages to send to the API in chat format.
+            response_format: Optional response format of the request.
+            validate: Optional function raising if a response is unusable.
+
+        Returns:
+            Generated text.
+        """
+        cache_key = self._cache_key(messages, response_format)
+        if cache_key is not None and self.cache is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                try:
+                    if validate is not None:
+                        validate(cached)
+                except Exception:
+                    # Cached without being validated; request it again
+                    pass
+                else:
+                    return cached
+
+        # Connected first, so importing openai isn't counted as latency
+        create = connect()
+        estimated_tokens = estimate_tokens(messages)
+        started = time.perf_counter()
+        # Only sent when set, so requests without one are unchanged
+        extra_args = (
+            {"response_format": response_format} if response_format else {}
+        )
+        response, attempt = yield from self._attempts(
+            functools.partial(
+                create, model=self.model, messages=messages, **extra_args
+            ),
+            estimated_tokens,
+            started,
+        )
+
+        self._record_call(
+            started, attempt, self._record_usage(response, estimated_tokens)
+        )
+
+        # Extract the generated text from the response
+        content = response.choices[0].message.content or ""
+
+        if validate is not None:
+            validate(content)
+        self._store_in_cache(cache_key, content)
+        return content
+
+    def _attempts(
+        self,
+        send: Callable[[], Any],
+        estimated_tokens: int,
+        started: float,
+    ) -> _Steps[tuple[Any, int]]:
+        """Steps of sending a request until it succeeds or can't be retried.
+
+        Every attempt waits for the rate limiter first, and failed attempts
+        are retried as the retry policy allows.
+
+        Args:
+            send: Function sending the request once.
+            estimated_tokens: Tokens the request is estimated to use.
+            started: time.perf_counter() when the request was first tried.
+
+        Returns:
+            The response and the number of retries it needed.
+        """
+        attempt = 0
+        while True:
+            wait = self.rate_limiter.reserve(estimated_tokens)
+            if wait > 0:
+                yield wait
+            try:
+                response = yield send
+            except Exception as exc:
+                yield self._handle_failure(
+                    attempt, exc, estimated_tokens, started
+                )
+                attempt += 1
+            else:
+                return response, attempt
+
+    def _handle_failure(
+        self,
+        attempt: int,
+        exc: Exception,
+        estimated_tokens: int,
+        started: float,
+    ) -> float:
+        """Work out how long to wait before retrying a failed request.
+
+        Raises:
+            RuntimeError: If the request should not be retried.
+        """
+        # A failed request doesn't consume its token estimate.
+        self.rate_limiter.record_usage(estimated_tokens, 0)
+
+        delay = self.retry_policy.get_delay(attempt, exc)
+        if delay is None:
+            self._record_call(started, attempt, None, failed=True)
             raise RuntimeError(f"Error generating text: {exc}") from exc
+
+        import openai
+
+        if isinstance(exc, openai.RateLimitError):
+            # Hold back every worker sharing this client, not just this one.
+            self.rate_limiter.pause(delay)
+        return delay
+
+    def _record_usage(self, response: Any, estimated_tokens: int) -> Any:
+        """Correct the rate limiter's token estimate with actual usage.
+
+        Returns:
+            The response's usage, if it has any.
+        """
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            self.rate_limiter.record_usage(
+                estimated_tokens, usage.total_tokens
+            )
+        return usage
+
+    def _record_call(
+        self,
+        started: float,
+        retries: int,
+        usage: Any,
+        failed: bool = False,
+    ) -> None:
+        """Record a finished request's latency, tokens and retries.
+
+        Args:
+            started: time.perf_counter() when the request was first tried.
+            retries: Retries the request needed.
+            usage: Usage reported with the response, if any.
+            failed: Whether the request finally failed.
+        """
+        latency = time.perf_counter() - started
+        call = CallMetrics(
+            model=self.model,
+            started=time.time() - latency,
+            latency=latency,
+            retries=retries,
+            failed=failed,
+        )
+        if usage is not None:
+            # Prompt tokens read from the provider's prompt prefix cache
+            details = getattr(usage, "prompt_tokens_details", None)
+            call = replace(
+                call,
+                prompt_tokens=usage.prompt_tokens,
+                cached_prompt_tokens=(
+                    getattr(details, "cached_tokens", None) or 0
+                ),
+                completion_tokens=usage.completion_tokens,
+            )
+        self.metrics.record(call)
+
+    def _cache_key(
+        self,
+        messages: list[dict[str, Any]],
+        response_format: Optional[dict[str, Any]] = None,
+    ) -> Optional[str]:
+        """Get the response cache key for a request, if caching is on."""
+        if self.cache is None:
+            return None
+        return ResponseCache.make_key(self.model, messages, response_format)
+
+    def _store_in_cache(self, cache_key: Optional[str], content: str) -> None:
+        """Cache a response, skipping empty ones."""
+        if cache_key is not None and self.cache is not None and content:
+            self.cache.set(cache_key, content)
+
+    def build_messages(
+        self, prompt_file: str, variables: dict[str, Any]
+    ) -> list[dict[str, Any]]:
+        """Render a promptdown file into chat completion messages.
+
+        Args:
+            prompt_file: Name of the promptdown file (without extension).
+            variables: Variables to use in the prompt.
+
+        Returns:
+            Messages in chat completion format.
+        """
+        prompt_path = settings.get_prompt_path(prompt_file)
+
+        # Load the parsed prompt, reusing it across calls
+        structured_prompt = prompt_cache.get(prompt_path)
+
+        # Apply template values to a copy of the prompt
+        structured_prompt = structured_prompt.apply_template_values(variables)
+
+        # Convert to chat completion messages format
+        return structured_prompt.to_chat_completion_messages()
@@ -0,0 +1,90 @@
+"""Append-only manifest of the items in a generation run."""
+
+import json
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from fakedin.file_utils import atomic_write_text
+
+PENDING = "pending"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+@dataclass
+class ManifestRecord:
+    """The state of one item of a run at some point in time."""
+
+    index: int
+    status: str
+    item: dict[str, Any]
+    seed: Optional[int] = None
+    output_path: Optional[str] = None
+    error: Optional[str] = None
+
+
+class RunManifest:
+    """Append-only JSONL log of item states for a run directory.
+
+    Every state change is appended as a new line, so the latest line for an
+    index is its current state. A line cut short by a crash is ignored when
+    the manifest is read back.
+    """
+
+    FILENAME = "manifest.jsonl"
+    # Details of the whole run, such as its size and shard
+    INFO_FILENAME = "run.json"
+
+    def __init__(self, run_dir: Path):
+        """Initialize the manifest for a run directory.
+
+        Args:
+            run_dir: Directory the run writes its outputs to.
+        """
+        self.run_dir = run_dir
+        self.path = run_dir / self.FILENAME
+        self.info_path = run_dir / self.INFO_FILENAME
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        """Start a new run, discarding any existing manifest."""
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self.path.write_text("", encoding="utf-8")
+
+    def load(self) -> dict[int, ManifestRecord]:
+        """Read the latest record for every index in the manifest."""
+        records: dict[int, ManifestRecord] = {}
+        if not self.path.exists():
+            return records
+
+        with self._lock, open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = ManifestRecord(**json.loads(line))
+                except (ValueError, TypeError):
+                    continue
+                records[record.index] = record
+
+        return records
+
+    def append(self, record: ManifestRecord) -> None:
+        """Append a record to the manifest."""
+        line = json.dumps(asdict(record), ensure_ascii=False) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+
+    def save_info(self, info: dict[str, Any]) -> None:
+        """Record details of the whole run."""
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(self.info_path, json.dumps(info, indent=2) + "\n")
+
+    def load_info(self) -> Optional[dict[str, Any]]:
+        """Read the details of the whole run, or None if none were saved."""
+        if not self.info_path.exists():
+            return None
+        return json.loads(self.info_path.read_text(encoding="utf-8"))
@@ -0,0 +1,184 @@
+"""Merging the run directories of a sharded generation run."""
+
+import shutil
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from fakedin.manifest import COMPLETED, ManifestRecord, RunManifest
+from fakedin.sharding import parse_shard
+
+
+@dataclass
+class MergeResult:
+    """Outcome of merging the shards of a run."""
+
+    # Indices of the whole run whose items were merged
+    completed: int = 0
+    # Indices missing from the merged run, when merging allows it
+    missing: list[int] = field(default_factory=list)
+    copied_paths: list[Path] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class _ShardRun:
+    """A run directory, with its run details and manifest records."""
+
+    run_dir: Path
+    info: dict[str, Any]
+    records: dict[int, ManifestRecord]
+
+
+def merge_runs(
+    run_dirs: Iterable[Path],
+    output_dir: Path,
+    allow_incomplete: bool = False,
+) -> MergeResult:
+    """Merge the run directories of the shards of one run.
+
+    The shards are checked for consistency first: they must come from the
+    same run, with the same kind of item, count and seed, and be different
+    shards of it. Each of their items must belong to the shard that
+    generated it, and no item may appear in two shards. Then the outputs
+    are copied into the output directory, with one manifest for the whole
+    run. Outputs with the same file name in different shards are renamed.
+
+    Args:
+        run_dirs: Output directories of the shard runs.
+        output_dir: Directory to write the merged run to.
+        allow_incomplete: Merge even if shards or items are missing or
+            failed, recording them as they are.
+
+    Returns:
+        The merged item count, missing indices and copied files.
+
+    Raises:
+        ValueError: If the shards are inconsistent, or incomplete when that
+            isn't allowed, or the output directory already holds a run.
+    """
+    runs = [_load_run(Path(run_dir)) for run_dir in run_dirs]
+    if not runs:
+        raise ValueError("No run directories to merge")
+    merged_manifest = RunManifest(output_dir)
+    if merged_manifest.path.exists():
+        raise ValueError(f"{output_dir} already holds a run")
+
+    first = runs[0].info
+    shard_totals = set()
+    runs_by_shard: dict[int, _ShardRun] = {}
+    for run in runs:
+        for key in ("label", "count", "seed"):
+            if run.info[key] != first[key]:
+                raise ValueError(
+                    f"{run.run_dir} has {key} {run.info[key]!r}, but "
+                    f"{runs[0].run_dir} has {first[key]!r}"
+                )
+        if run.info["shard"] is None:
+            raise ValueError(f"{run.run_dir} isn't a shard of a run")
+        shard = parse_shard(run.info["shard"])
+        shard_totals.add(shard.total)
+        if shard.index in runs_by_shard:
+            raise ValueError(
+                f"{run.run_dir} and {runs_by_shard[shard.index].run_dir} "
+                f"are both shard {shard}"
+            )
+        runs_by_shard[shard.index] = run
+        # With each item in the shard owning it, no item is in two shards
+        for index in run.records:
+            if not shard.owns(index):
+                raise ValueError(
+                    f"{run.run_dir} has item {index}, which doesn't belong "
+                    f"to shard {shard}"
+                )
+    if len(shard_totals) > 1:
+        raise ValueError(
+            f"The runs were split into different numbers of shards: "
+            f"{sorted(shard_totals)}"
+        )
+
+    count = first["count"]
+    [shard_total] = shard_totals
+    missing_shards = sorted(set(range(shard_total)) - set(runs_by_shard))
+    missing = [
+        index
+        for index in range(count)
+        if not _is_complete(runs_by_shard.get(index % shard_total), index)
+    ]
+    if missing and not allow_incomplete:
+        details = f"{len(missing)} of {count} items are missing or failed"
+        if missing_shards:
+            shard_list = ", ".join(
+                f"{index}/{shard_total}" for index in missing_shards
+            )
+            details += f", with no run given for shard {shard_list}"
+        raise ValueError(
+            f"The shards are incomplete: {details} "
+            "(merge anyway with --allow-incomplete)"
+        )
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    result = MergeResult(completed=count - len(missing), missing=missing)
+    merged_manifest.reset()
+    for shard_index, run in sorted(runs_by_shard.items()):
+        # Several records share one file when written to a dataset sink
+        copied: dict[Path, Path] = {}
+        for _, record in sorted(run.records.items()):
+            if record.status == COMPLETED and record.output_path is not None:
+                source = _output_file(run.run_dir, record.output_path)
+                if source is not None:
+                    if source not in copied:
+                        copied[source] = _copy_output(
+                            source, output_dir, shard_index
+                        )
+                        result.copied_paths.append(copied[source])
+                    merged_path = str(copied[source])
+                    record = ManifestRecord(
+                        **{**asdict(record), "output_path": merged_path}
+                    )
+            merged_manifest.append(record)
+    merged_manifest.save_info({**first, "shard": None})
+
+    return result
+
+
+def _load_run(run_dir: Path) -> _ShardRun:
+    """Read the details and manifest of a shard's run directory."""
+    manifest = RunManifest(run_dir)
+    if not manifest.path.exists():
+        raise ValueError(f"{run_dir} has no {RunManifest.FILENAME}")
+    info = manifest.load_info()
+    if info is None:
+        raise ValueError(f"{run_dir} has no {RunManifest.INFO_FILENAME}")
+    return _ShardRun(run_dir, info, manifest.load())
+
+
+def _is_complete(run: Optional[_ShardRun], index: int) -> bool:
+    """Whether a shard generated an item, with its output still there."""
+    if run is None:
+        return False
+    record = run.records.get(index)
+    return (
+        record is not None
+        and record.status == COMPLETED
+        and record.output_path is not None
+        and _output_file(run.run_dir, record.output_path) is not None
+    )
+
+
+def _output_file(run_dir: Path, output_path: str) -> Optional[Path]:
+    """Find an output, which may have been moved with its run directory."""
+    for candidate in (run_dir / Path(output_path).name, Path(output_path)):
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def _copy_output(source: Path, output_dir: Path, shard_index: int) -> Path:
+    """Copy an output, renaming it if another shard's output has its name."""
+    destination = output_dir / source.name
+    if destination.exists():
+        destination = output_dir / (
+            f"{source.stem}-shard{shard_index}{source.suffix}"
+        )
+    shutil.copy2(source, destination)
+    return destination
@@ -0,0 +1,209 @@
+"""Latency, token and cost accounting for LLM requests."""
+
+import json
+import math
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional, Sequence
+
+from fakedin.config import settings
+from fakedin.file_utils import atomic_write_text
+
+
+@dataclass(frozen=True)
+class CallMetrics:
+    """Measurements of one request, including any retries it needed."""
+
+    model: str
+    # Wall clock time the request was first attempted, in epoch seconds
+    started: float
+    # Seconds from the first attempt until the response was complete
+    latency: float
+    prompt_tokens: int = 0
+    cached_prompt_tokens: int = 0
+    completion_tokens: int = 0
+    retries: int = 0
+    failed: bool = False
+
+
+@dataclass(frozen=True)
+class TokenPrices:
+    """Prices of a model's tokens, in dollars per million tokens."""
+
+    input: float
+    output: float
+    # Defaults to the input price
+    cached_input: Optional[float] = None
+
+    def cost(
+        self,
+        prompt_tokens: int,
+        cached_prompt_tokens: int,
+        completion_tokens: int,
+    ) -> float:
+        """Estimate the cost in dollars of some token counts."""
+        cached_input = (
+            self.input if self.cached_input is None else self.cached_input
+        )
+        return (
+            (prompt_tokens - cached_prompt_tokens) * self.input
+            + cached_prompt_tokens * cached_input
+            + completion_tokens * self.output
+        ) / 1_000_000
+
+
+def default_prices() -> Optional[TokenPrices]:
+    """Token prices from settings, or None if they aren't configured."""
+    if settings.input_cost_per_million is None:
+        return None
+    if settings.output_cost_per_million is None:
+        return None
+    return TokenPrices(
+        input=settings.input_cost_per_million,
+        output=settings.output_cost_per_million,
+        cached_input=settings.cached_input_cost_per_million,
+    )
+
+
+@dataclass(frozen=True)
+class RunSummary:
+    """Aggregate measurements of a run's requests."""
+
+    requests: int
+    failed_requests: int
+    retries: int
+    prompt_tokens: int
+    cached_prompt_tokens: int
+    completion_tokens: int
+    # Latency percentiles of successful requests, in seconds
+    latency_p50: float
+    latency_p95: float
+    latency_p99: float
+    # Seconds from the first request starting to the last one finishing
+    wall_time: float
+    completion_tokens_per_second: float
+    # Dollars, if token prices are configured
+    cost_estimate: Optional[float] = None
+
+    @property
+    def cached_fraction(self) -> float:
+        """Share of prompt tokens served from the provider's prompt cache."""
+        if not self.prompt_tokens:
+            return 0.0
+        return self.cached_prompt_tokens / self.prompt_tokens
+
+    def format(self) -> str:
+        """Describe the summary in a few lines of text."""
+        lines = [
+            f"Requests: {self.requests:,} "
+            f"({self.failed_requests:,} failed, {self.retries:,} retries)",
+            f"Latency: p50 {self.latency_p50:.2f}s, "
+            f"p95 {self.latency_p95:.2f}s, p99 {self.latency_p99:.2f}s",
+            f"Tokens: {self.prompt_tokens:,} prompt "
+            f"({self.cached_prompt_tokens:,} cached, "
+            f"{self.cached_fraction:.0%}), "
+            f"{self.completion_tokens:,} completion",
+            f"Throughput: {self.completion_tokens_per_second:,.1f} "
+            f"completion tokens/s over {self.wall_time:.1f}s",
+        ]
+        if self.cost_estimate is not None:
+            lines.append(f"Estimated cost: ${self.cost_estimate:,.4f}")
+        return "\n".join(lines)
+
+
+class MetricsCollector:
+    """Thread-safe record of the requests made by one or more clients."""
+
+    def __init__(self, prices: Optional[TokenPrices] = None):
+        """Initialize an empty collector.
+
+        Args:
+            prices: Token prices used to estimate costs. Without them,
+                summaries have no cost estimate.
+        """
+        self.prices = prices
+        self._lock = threading.Lock()
+        self._calls: list[CallMetrics] = []
+
+    def record(self, call: CallMetrics) -> None:
+        """Add the measurements of a request."""
+        with self._lock:
+            self._calls.append(call)
+
+    @property
+    def calls(self) -> list[CallMetrics]:
+        """Measurements of every request so far, in completion order."""
+        with self._lock:
+            return list(self._calls)
+
+    def summarize(
+        self, calls: Optional[Sequence[CallMetrics]] = None
+    ) -> RunSummary:
+        """Aggregate the measurements of some requests.
+
+        Args:
+            calls: Requests to summarize. Defaults to all of them.
+
+        Returns:
+            The summary.
+        """
+        if calls is None:
+            calls = self.calls
+
+        succeeded = [call for call in calls if not call.failed]
+        latencies = sorted(call.latency for call in succeeded)
+        prompt_tokens = sum(call.prompt_tokens for call in calls)
+        cached_prompt_tokens = sum(call.cached_prompt_tokens for call in calls)
+        completion_tokens = sum(call.completion_tokens for call in calls)
+
+        wall_time = 0.0
+        if calls:
+            first_start = min(call.started for call in calls)
+            last_end = max(call.started + call.latency for call in calls)
+            wall_time = last_end - first_start
+
+        cost_estimate = None
+        if self.prices is not None:
+            cost_estimate = self.prices.cost(
+                prompt_tokens, cached_prompt_tokens, completion_tokens
+            )
+
+        return RunSummary(
+            requests=len(calls),
+            failed_requests=len(calls) - len(succeeded),
+            retries=sum(call.retries for call in calls),
+            prompt_tokens=prompt_tokens,
+            cached_prompt_tokens=cached_prompt_tokens,
+            completion_tokens=completion_tokens,
+            latency_p50=percentile(latencies, 50),
+            latency_p95=percentile(latencies, 95),
+            latency_p99=percentile(latencies, 99),
+            wall_time=wall_time,
+            completion_tokens_per_second=(
+                completion_tokens / wall_time if wall_time > 0 else 0.0
+            ),
+            cost_estimate=cost_estimate,
+        )
+
+    def write_json(self, output_path: Path) -> None:
+        """Write the summary and every request's measurements as JSON."""
+        calls = self.calls
+        report = {
+            "summary": asdict(self.summarize(calls)),
+            "calls": [asdict(call) for call in calls],
+        }
+        atomic_write_text(output_path, json.dumps(report, indent=2) + "\n")
+
+
+def percentile(sorted_values: Sequence[float], percent: float) -> float:
+    """Linearly interpolated percentile of sorted values, 0 if empty."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * percent / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = position - lower
+    return (
+        sorted_values[lower] * (1 - fraction) + sorted_values[upper] * fraction
+    )
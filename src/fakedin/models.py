@@ -0,0 +1,159 @@
+"""Typed models of generated documents, for structured output mode."""
+
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict
+
+
+class _Document(BaseModel):
+    """Base for models the LLM fills in through a strict JSON schema."""
+
+    # Strict structured outputs reject schemas allowing unknown keys
+    model_config = ConfigDict(extra="forbid")
+
+
+class WorkExperience(_Document):
+    """One position in a résumé's work history."""
+
+    title: str
+    company: str
+    location: str
+    start_date: str
+    # "Present" for a current position
+    end_date: str
+    highlights: list[str]
+
+    def to_markdown(self) -> str:
+        """Render the position as a Markdown section."""
+        lines = [
+            f"### {self.title} - {self.company}",
+            "",
+            f"_{self.location} | {self.start_date} - {self.end_date}_",
+        ]
+        if self.highlights:
+            lines.append("")
+            lines.extend(f"- {highlight}" for highlight in self.highlights)
+        return "\n".join(lines)
+
+
+class Education(_Document):
+    """One degree or program in a résumé."""
+
+    degree: str
+    institution: str
+    location: str
+    graduation_year: str
+    details: list[str]
+
+    def to_markdown(self) -> str:
+        """Render the entry as a Markdown section."""
+        lines = [
+            f"### {self.degree}",
+            "",
+            f"**{self.institution}**, {self.location} | "
+            f"{self.graduation_year}",
+        ]
+        if self.details:
+            lines.append("")
+            lines.extend(f"- {detail}" for detail in self.details)
+        return "\n".join(lines)
+
+
+class Resume(_Document):
+    """A complete generated résumé."""
+
+    full_name: str
+    email: str
+    phone_number: str
+    location: str
+    summary: str
+    experience: list[WorkExperience]
+    education: list[Education]
+    skills: list[str]
+    certifications: list[str]
+
+    def to_markdown(self) -> str:
+        """Render the résumé as Markdown, laid out like a free-form one."""
+        sections = [
+            f"# {self.full_name}",
+            f"{self.email} | {self.phone_number} | {self.location}",
+            "## Professional Summary",
+            self.summary,
+            "## Work Experience",
+            *(job.to_markdown() for job in self.experience),
+            "## Education",
+            *(entry.to_markdown() for entry in self.education),
+            "## Skills",
+            _bullets(self.skills),
+        ]
+        if self.certifications:
+            sections += ["## Certifications", _bullets(self.certifications)]
+        return "\n\n".join(sections) + "\n"
+
+
+class JobOpening(_Document):
+    """A complete generated job opening."""
+
+    title: str
+    company_name: str
+    location: str
+    work_model: str
+    salary_range: str
+    company_overview: str
+    summary: str
+    responsibilities: list[str]
+    required_qualifications: list[str]
+    preferred_qualifications: list[str]
+    benefits: list[str]
+    application_process: str
+
+    def to_markdown(self) -> str:
+        """Render the job opening as Markdown."""
+        sections = [
+            f"# {self.title}",
+            f"**{self.company_name}** | {self.location} | "
+            f"{self.work_model} | {self.salary_range}",
+            "## About Us",
+            self.company_overview,
+            "## About the Role",
+            self.summary,
+            "## Responsibilities",
+            _bullets(self.responsibilities),
+            "## Required Qualifications",
+            _bullets(self.required_qualifications),
+        ]
+        if self.preferred_qualifications:
+            sections += [
+                "## Preferred Qualifications",
+                _bullets(self.preferred_qualifications),
+            ]
+        sections += [
+            "## Benefits",
+            _bullets(self.benefits),
+            "## How to Apply",
+            self.application_process,
+        ]
+        return "\n\n".join(sections) + "\n"
+
+
+def _bullets(items: list[str]) -> str:
+    return "\n".join(f"- {item}" for item in items)
+
+
+def json_schema_format(model: type[BaseModel]) -> dict[str, Any]:
+    """Build the OpenAI JSON schema response format for a model.
+
+    Args:
+        model: Model the response must be an instance of.
+
+    Returns:
+        A strict "json_schema" response_format for chat completions.
+    """
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": model.__name__,
+            "schema": model.model_json_schema(),
+            "strict": True,
+        },
+    }
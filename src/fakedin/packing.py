@@ -0,0 +1,49 @@
+"""Packing several items into one LLM request and splitting the response."""
+
+import re
+from typing import Optional
+
+# Line the model starts each item of a packed response with
+ITEM_DELIMITER = re.compile(r"^=== ITEM (\d+) ===[ \t]*$", re.MULTILINE)
+
+
+def pack_items(blocks: list[str], heading: str) -> str:
+    """Join the details of several items into one numbered prompt section.
+
+    Args:
+        blocks: Details of each item, in order.
+        heading: Name of an item, used to head each block.
+
+    Returns:
+        The blocks, each under a Markdown heading naming its number.
+    """
+    return "\n\n".join(
+        f"### {heading} {number}\n\n{block}"
+        for number, block in enumerate(blocks, 1)
+    )
+
+
+def split_items(text: str, count: int) -> Optional[list[str]]:
+    """Split a packed response into its items.
+
+    Args:
+        text: Response holding items that each start with a delimiter line
+            naming the item's number.
+        count: Number of items the response should hold.
+
+    Returns:
+        The items in order, or None if the response doesn't hold exactly
+        items 1 to count, each with some text.
+    """
+    matches = list(ITEM_DELIMITER.finditer(text))
+    if [int(match.group(1)) for match in matches] != list(range(1, count + 1)):
+        return None
+
+    ends = [match.start() for match in matches[1:]] + [len(text)]
+    items = [
+        text[match.end() : end].strip()
+        for match, end in zip(matches, ends)
+    ]
+    if not all(items):
+        return None
+    return items
@@ -0,0 +1,426 @@
+"""Rendering Markdown résumés as PDF files."""
+
+from __future__ import annotations
+
+import functools
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional
+
+from fakedin.file_utils import atomic_output
+
+if TYPE_CHECKING:
+    from fpdf import FPDF  # type: ignore
+
+# Bold (**text** or __text__) or italic (*text* or _text_) spans, bold
+# first. Groups 1 and 3 hold bold text, groups 2 and 4 italic text.
+INLINE_PATTERN = re.compile(r"\*(?:\*(.*?)\*\*|(.*?)\*)|_(?:_(.*?)__|(.*?)_)")
+
+# FPDF style after turning on bold or italic in a given style
+BOLD = {"": "B", "B": "B", "I": "BI", "BI": "BI"}
+ITALIC = {"": "I", "B": "BI", "I": "I", "BI": "BI"}
+
+# Unicode characters the core PDF fonts can't encode, and their replacements
+SANITIZE_REPLACEMENTS = tuple(
+    {
+        "\u2013": "-",  # en dash
+        "\u2014": "--",  # em dash
+        "\u2018": "'",  # left single quote
+        "\u2019": "'",  # right single quote
+        "\u201c": '"',  # left double quote
+        "\u201d": '"',  # right double quote
+        "\u2022": "-",  # bullet - replace with hyphen
+        "\u2026": "...",  # ellipsis
+        "\u00a0": " ",  # non-breaking space
+        "\u2212": "-",  # minus sign
+        "\u200b": "",  # zero width space
+    }.items()
+)
+
+
+@dataclass(frozen=True)
+class BlockStyle:
+    """Font and spacing of one kind of Markdown block."""
+
+    font_style: str
+    size: float
+    line_height: float
+
+
+# Heading prefixes and the styles of their blocks
+HEADING_STYLES = (
+    ("# ", BlockStyle("B", 18, 10)),
+    ("## ", BlockStyle("B", 14, 10)),
+    ("### ", BlockStyle("B", 12, 10)),
+)
+BODY_STYLE = BlockStyle("", 12, 10)
+# Space left after every paragraph
+PARAGRAPH_SPACING = 5
+
+# Measured widths kept per renderer before the cache is started over
+MAX_CACHED_WIDTHS = 100_000
+
+# Words with the whitespace that follows them
+TOKEN_PATTERN = re.compile(r"\s*\S+\s*|\s+")
+
+
+class PdfRenderer:
+    """Lays out Markdown résumés as PDF pages.
+
+    Wrapping text is the bulk of the work of rendering a résumé, so the
+    renderer wraps lines itself using text widths it measures once and
+    remembers across documents, then places each line with a single cell
+    per styled run. One renderer is meant to be reused for every document
+    a process renders; it is safe to share between threads.
+
+    Supported Markdown:
+    - **bold** for bold text
+    - _italic_ or *italic* for italic text
+    - Headings (# H1, ## H2, ### H3)
+    - List items (-, *)
+    """
+
+    def __init__(self, font_family: str = "Helvetica"):
+        """Initialize the renderer.
+
+        Args:
+            font_family: Core PDF font family to lay text out in.
+        """
+        # Package name is fpdf2, but module name is fpdf. Imported here as
+        # it is slow to import and only needed once PDFs are rendered.
+        from fpdf import FPDF  # type: ignore
+
+        self.font_family = font_family
+        # Only used to measure text, never output
+        self._metrics = FPDF()
+        self._metrics_lock = threading.Lock()
+        self._widths: dict[tuple[str, float, str], float] = {}
+
+    def render(self, content: str, output_path: Path) -> None:
+        """Render one Markdown document as a PDF file."""
+        self.render_many([content], output_path)
+
+    def render_many(self, contents: Iterable[str], output_path: Path) -> None:
+        """Render Markdown documents into one PDF file.
+
+        Each document starts on a new page.
+
+        Args:
+            contents: Markdown documents, in order.
+            output_path: Path of the PDF file.
+        """
+        # Ensure the parent directory exists
+        os.makedirs(output_path.parent, exist_ok=True)
+
+        from fpdf import FPDF  # type: ignore
+
+        pdf = FPDF()
+        for content in contents:
+            pdf.add_page()
+            self._layout(pdf, content)
+
+        # Save the PDF
+        with atomic_output(output_path) as temp_path:
+            pdf.output(str(temp_path))
+
+    def _layout(self, pdf: FPDF, content: str) -> None:
+        """Lay out one Markdown document from the current position."""
+        # Preprocess the content to replace problematic Unicode characters
+        content = sanitize_for_pdf(content)
+
+        # Process the content by paragraphs for better formatting. Lines
+        # are laid out one by one, so headings directly followed by contact
+        # details or subheadings still break where the Markdown does.
+        for paragraph in content.split("\n\n"):
+            for line in paragraph.split("\n"):
+                runs, block_style = _line_runs(line)
+                self._write_block(pdf, runs, block_style)
+
+            # Add some spacing between paragraphs
+            pdf.ln(PARAGRAPH_SPACING)
+
+    def _write_block(
+        self,
+        pdf: FPDF,
+        runs: list[tuple[str, str]],
+        block_style: BlockStyle,
+    ) -> None:
+        """Wrap styled runs to the page width and write them as lines."""
+        size = block_style.size
+        max_width = pdf.epw
+        line: list[tuple[str, str, float]] = []
+        line_width = 0.0
+
+        for text, style in runs:
+            for token in TOKEN_PATTERN.findall(text):
+                width = self._width(token, style, size)
+                fits = (
+                    line_width + self._width(token.rstrip(), style, size)
+                    <= max_width
+                )
+                if line and not fits:
+                    self._write_line(pdf, line, block_style)
+                    token = token.lstrip()
+                    width = self._width(token, style, size)
+                    line, line_width = [], 0.0
+                    if not token:
+                        continue
+
+                if width > max_width:
+                    # A single word wider than the page is split anywhere
+                    pieces = self._split_word(token, style, size, max_width)
+                    for piece in pieces:
+                        if line:
+                            self._write_line(pdf, line, block_style)
+                        piece_width = self._width(piece, style, size)
+                        line = [(piece, style, piece_width)]
+                    line_width = line[-1][2]
+                    continue
+
+                if line and line[-1][1] == style:
+                    previous_text, _, previous_width = line[-1]
+                    line[-1] = (
+                        previous_text + token,
+                        style,
+                        previous_width + width,
+                    )
+                else:
+                    line.append((token, style, width))
+                line_width += width
+
+        self._write_line(pdf, line, block_style)
+
+    def _write_line(
+        self,
+        pdf: FPDF,
+        segments: list[tuple[str, str, float]],
+        block_style: BlockStyle,
+    ) -> None:
+        """Write one wrapped line, one cell per styled segment."""
+        for text, style, width in segments:
+            pdf.set_font(self.font_family, style=style, size=block_style.size)
+            pdf.cell(w=width, h=block_style.line_height, text=text)
+        pdf.ln(block_style.line_height)
+
+    def _split_word(
+        self, word: str, style: str, size: float, max_width: float
+    ) -> list[str]:
+        """Split a word wider than max_width into pieces that fit."""
+        pieces = []
+        piece = ""
+        for char in word:
+            if piece and self._width(piece + char, style, size) > max_width:
+                pieces.append(piece)
+                piece = ""
+            piece += char
+        pieces.append(piece)
+        return pieces
+
+    def _width(self, text: str, style: str, size: float) -> float:
+        """Width of text in a font style and size, measured once."""
+        key = (style, size, text)
+        width = self._widths.get(key)
+        if width is None:
+            with self._metrics_lock:
+                self._metrics.set_font(
+                    self.font_family, style=style, size=size
+                )
+                width = self._metrics.get_string_width(text)
+            if len(self._widths) >= MAX_CACHED_WIDTHS:
+                self._widths.clear()
+            self._widths[key] = width
+        return width
+
+
+def _line_runs(line: str) -> tuple[list[tuple[str, str]], BlockStyle]:
+    """Styled runs of one line of Markdown, and the style of its block."""
+    for prefix, block_style in HEADING_STYLES:
+        if line.startswith(prefix):
+            runs = parse_inline_runs(
+                line[len(prefix):], block_style.font_style
+            )
+            return runs, block_style
+    if line.startswith("- ") or line.startswith("* "):
+        # Use standard hyphen instead of bullet character
+        return [("- ", "")] + parse_inline_runs(line[2:]), BODY_STYLE
+    return parse_inline_runs(line), BODY_STYLE
+
+
+@functools.cache
+def get_renderer() -> PdfRenderer:
+    """Get the PDF renderer shared by everything in this process."""
+    return PdfRenderer()
+
+
+def write_pdf(content: str, output_path: Path) -> None:
+    """Lay out Markdown as a PDF file with the shared renderer."""
+    get_renderer().render(content, output_path)
+
+
+def parse_inline_runs(text: str, style: str = "") -> list[tuple[str, str]]:
+    """Split a line of Markdown into runs of text and their FPDF styles.
+
+    Handles **bold** or __bold__ and *italic* or _italic_, including italic
+    text inside bold text, in a single scan of the line.
+
+    Args:
+        text: Line of Markdown.
+        style: FPDF style the line starts in ('', 'B', 'I' or 'BI').
+
+    Returns:
+        (text, style) runs with the markers removed, in order.
+    """
+    # Most lines have no markup at all
+    if "*" not in text and "_" not in text:
+        return [(text, style)] if text else []
+
+    runs: list[tuple[str, str]] = []
+    last_end = 0
+
+    for match in INLINE_PATTERN.finditer(text):
+        start = match.start()
+        if start > last_end:
+            runs.append((text[last_end:start], style))
+
+        group = match.lastindex
+        inner = match.group(group)  # type: ignore[arg-type]
+        if group == 1 or group == 3:
+            # Bold text may itself contain italic text
+            runs.extend(parse_inline_runs(inner, BOLD[style]))
+        elif inner:
+            runs.append((inner, ITALIC[style]))
+
+        last_end = match.end()
+
+    if last_end < len(text):
+        runs.append((text[last_end:], style))
+
+    return runs
+
+
+def parse_inline_formatting(text: str) -> str:
+    """Strip inline Markdown formatting markers from a line.
+
+    This function handles:
+    - **bold** or __bold__
+    - *italic* or _italic_
+    """
+    # If text is None or empty, return empty string
+    if not text:
+        return ""
+
+    return "".join(run_text for run_text, _ in parse_inline_runs(text))
+
+
+def sanitize_for_pdf(text: str) -> str:
+    """Sanitize text for PDF output by replacing unsupported Unicode
+    characters.
+    """
+    # Chained str.replace calls beat str.translate here: each one is a fast
+    # C-level scan, while translate looks up every character of the text.
+    for char, replacement in SANITIZE_REPLACEMENTS:
+        if char in text:
+            text = text.replace(char, replacement)
+
+    return text
+
+
+def render_markdown_file(
+    markdown_path: Path, output_path: Optional[Path] = None
+) -> Path:
+    """Render a Markdown file as a PDF.
+
+    Args:
+        markdown_path: Markdown file to render.
+        output_path: Path of the PDF. Defaults to the Markdown path with a
+            .pdf suffix.
+
+    Returns:
+        Path to the rendered PDF.
+    """
+    if output_path is None:
+        output_path = markdown_path.with_suffix(".pdf")
+    write_pdf(markdown_path.read_text(encoding="utf-8"), output_path)
+    return output_path
+
+
+class PdfRenderPool:
+    """Process pool that renders PDFs off the generating threads.
+
+    PDF layout is CPU-bound and holds the GIL, so rendering on the threads
+    making LLM requests slows every one of them down. Handing layout to
+    worker processes lets it run on other cores while requests continue.
+    The pool is safe to share between threads.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """Initialize the render pool. Workers start on first use.
+
+        Args:
+            max_workers: Maximum worker processes. Defaults to the number of
+                CPUs.
+        """
+        self.max_workers = max_workers
+        # Spawned rather than forked: callers are usually multi-threaded,
+        # and forking a multi-threaded process can deadlock the child.
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    def submit(self, content: str, output_path: Path) -> "Future[None]":
+        """Queue Markdown content to be rendered to a PDF file."""
+        return self._executor.submit(write_pdf, content, output_path)
+
+    def render(self, content: str, output_path: Path) -> None:
+        """Render Markdown content to a PDF file in a worker process.
+
+        Blocks the calling thread until the PDF is written, without holding
+        the GIL while layout runs.
+
+        Raises:
+            Exception: Whatever error rendering failed with.
+        """
+        self.submit(content, output_path).result()
+
+    def render_files(
+        self, markdown_paths: Iterable[Path], output_dir: Optional[Path] = None
+    ) -> Iterator[tuple[Path, "Future[Path]"]]:
+        """Render Markdown files to PDFs across all workers.
+
+        Args:
+            markdown_paths: Markdown files to render.
+            output_dir: Directory for the PDFs. Defaults to next to each
+                Markdown file.
+
+        Yields:
+            Each Markdown path with the finished future of its render, in
+            completion order.
+        """
+        futures = {}
+        for markdown_path in markdown_paths:
+            output_path = None
+            if output_dir is not None:
+                output_path = output_dir / f"{markdown_path.stem}.pdf"
+            future = self._executor.submit(
+                render_markdown_file, markdown_path, output_path
+            )
+            futures[future] = markdown_path
+
+        for future in as_completed(futures):
+            yield futures[future], future
+
+    def close(self) -> None:
+        """Wait for queued renders and shut the workers down."""
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "PdfRenderPool":
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        self.close()
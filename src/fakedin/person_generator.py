@@ -1,33 +1,70 @@
 """Utilities for generating random realistic person data."""
 
 import random
-from typing import Any
-
-from faker import Faker
+from bisect import bisect_right
+from typing import Any, Optional
 
 from fakedin.config import settings
+from fakedin.data_pools import get_pools
 
+# Experience years at which each level after Entry-Level starts
+EXPERIENCE_LEVEL_THRESHOLDS = (3, 7, 15)
+EXPERIENCE_LEVELS = ("Entry-Level", "Mid-Level", "Senior", "Executive")
+WORKING_AGES = range(22, 66)
 
-def load_data_file(filename: str) -> list[str]:
-    """Load data from a file in the data directory."""
-    file_path = settings.data_dir / filename
-    if not file_path.exists():
-        raise FileNotFoundError(f"Data file not found: {file_path}")
 
-    with open(file_path, "r", encoding="utf-8") as f:
-        return [line.strip() for line in f if line.strip()]
+def experience_level_for_years(experience_years: int) -> str:
+    """Get the experience level matching a number of years of experience."""
+    return EXPERIENCE_LEVELS[
+        bisect_right(EXPERIENCE_LEVEL_THRESHOLDS, experience_years)
+    ]
 
 
 class PersonGenerator:
     """Generator for random person details."""
 
-    def __init__(self):
-        """Initialize the person generator."""
-        # Initialize Faker for generating realistic data
-        self.faker = Faker("en_US")
+    def __init__(
+        self, seed: Optional[int] = None, backend: Optional[str] = None
+    ):
+        """Initialize the person generator.
+
+        Args:
+            seed: Optional seed making the generated people reproducible.
+            backend: Data backend, "faker" or "local". Defaults to the
+                data_backend setting.
+        """
+        self.backend = backend or settings.data_backend
+        self.pools = get_pools(self.backend)
+        # Initialize Faker for generating realistic data, unless the bundled
+        # data pack is used instead
+        if self.backend == "faker":
+            from faker import Faker
+
+            self.faker = Faker("en_US")
+        else:
+            self.faker = None
+        self.random = random.Random()
+        self.reseed(seed)
+
+    def reseed(self, seed: Optional[int]) -> None:
+        """Reseed this generator's random sources.
+
+        Each generator has its own random state rather than sharing the
+        global one, so generators never affect each other's output.
+
+        Args:
+            seed: New seed, or None to seed from system randomness.
+        """
+        self.random.seed(seed)
+        if self.faker is not None:
+            self.faker.seed_instance(seed)
 
     def generate_person(self) -> dict[str, Any]:
         """Generate random details for a person."""
+        if self.faker is None:
+            people = self.generate_people(1)
+            return {key: values[0] for key, values in people.items()}
+
         # Generate name using Faker
         first_name = self.faker.first_name()
         last_name = self.faker.last_name()
@@ -48,22 +85,15 @@ class PersonGenerator:
         # Generate career field and job title using Faker
         career_field = self.faker.job()
 
-        age = random.randint(22, 65)  # Working age range
+        age = self.random.randint(22, 65)  # Working age range
 
         # Randomize experience level based on age
         experience_years = min(
-            random.randint(0, age - 21), 40
+            self.random.randint(0, age - 21), 40
         )  # Assuming career starts at around 21
 
         # Determine experience level
-        if experience_years < 3:
-            experience_level = "Entry-Level"
-        elif experience_years < 7:
-            experience_level = "Mid-Level"
-        elif experience_years < 15:
-            experience_level = "Senior"
-        else:
-            experience_level = "Executive"
+        experience_level = experience_level_for_years(experience_years)
 
         return {
             "first_name": first_name,
@@ -79,3 +109,58 @@ class PersonGenerator:
             "experience_years": experience_years,
             "experience_level": experience_level,
         }
+
+    def generate_people(self, n: int) -> dict[str, list[Any]]:
+        """Generate random details for many people in one pass.
+
+        Every attribute is drawn for all n people at once from preloaded
+        pools instead of through per-person Faker calls, which makes this
+        much faster for large fixtures. Values follow the same rules as
+        generate_person.
+
+        Args:
+            n: Number of people to generate.
+
+        Returns:
+            Columnar details: a dict with the same keys as generate_person,
+            each mapping to a list of n values.
+        """
+        rng = self.random
+        pools = self.pools
+
+        first_names = pools.sample_first_names(rng, n)
+        last_names = pools.sample_last_names(rng, n)
+        cities, states = pools.sample_locations(rng, n)
+        ages = rng.choices(WORKING_AGES, k=n)
+        # Same distribution as randint(0, age - 21), capped at 40 years
+        experience_years = [
+            min(int(rng.random() * (age - 20)), 40) for age in ages
+        ]
+
+        return {
+            "first_name": first_names,
+            "last_name": last_names,
+            "full_name": [
+                f"{first} {last}"
+                for first, last in zip(first_names, last_names)
+            ],
+            "email": [
+                f"{first.lower()}.{last.lower()}@{domain}"
+                for first, last, domain in zip(
+                    first_names, last_names, pools.sample_domains(rng, n)
+                )
+            ],
+            "phone_number": pools.sample_phone_numbers(rng, n),
+            "age": ages,
+            "city": cities,
+            "state": states,
+            "location": [
+                f"{city}, {state}" for city, state in zip(cities, states)
+            ],
+            "career_field": rng.choices(pools.job_titles, k=n),
+            "experience_years": experience_years,
+            "experience_level": [
+                experience_level_for_years(years)
+                for years in experience_years
+            ],
+        }
@@ -0,0 +1,280 @@
+"""Shared driver for generating many items in one run."""
+
+import threading
+from concurrent.futures import Future, wait
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from fakedin.concurrency import run_concurrently
+from fakedin.file_utils import OutputPaths, PathOrFuture, after_saved
+from fakedin.manifest import (
+    COMPLETED,
+    FAILED,
+    PENDING,
+    ManifestRecord,
+    RunManifest,
+)
+from fakedin.metrics import MetricsCollector
+from fakedin.seeding import derive_seed
+from fakedin.sharding import Shard
+
+
+def generate_items(
+    count: int,
+    draw_item: Callable[[Optional[int]], dict[str, Any]],
+    produce: Callable[[dict[str, Any]], PathOrFuture],
+    label: str,
+    concurrency: int = 1,
+    manifest: Optional[RunManifest] = None,
+    resume: bool = False,
+    seed: Optional[int] = None,
+    produce_group: Optional[
+        Callable[[list[dict[str, Any]]], list[PathOrFuture]]
+    ] = None,
+    group_size: int = 1,
+    metrics: Optional[MetricsCollector] = None,
+    item_context: Optional[Callable[[int], dict[str, Any]]] = None,
+    shard: Optional[Shard] = None,
+    output_paths: Optional[OutputPaths] = None,
+) -> list[Path]:
+    """Generate a run of items, optionally tracked in a run manifest.
+
+    Item details are drawn serially on the calling thread; only producing
+    the outputs (the LLM calls) runs concurrently. Given produce_group and
+    a group_size above 1, items are produced group_size at a time, and the
+    failure of a group fails all of its items.
+
+    Without a manifest, the first failure aborts the run. With one, every
+    item's state is recorded, failures are logged and skipped, and a resumed
+    run reuses the recorded details of unfinished items while skipping
+    completed ones whose output still exists.
+
+    Args:
+        count: Number of items in the run.
+        draw_item: Function returning the details of an item, given the
+            item's seed (None for an unseeded run).
+        produce: Function generating and saving an item, returning the path
+            it was saved to. It may instead return a future of the path
+            while the output is still being written, such as a PDF
+            rendering in a pool, and go on to the next item. The item is
+            recorded when the future finishes, and the run waits for every
+            such output before it ends.
+        label: Description of an item used in progress messages.
+        concurrency: Maximum number of items produced at once.
+        manifest: Optional manifest to record the run in.
+        resume: Continue the run recorded in the manifest instead of
+            starting a new one.
+        seed: Optional seed of the run. Each item gets its own seed derived
+            from it and its index, so item details are reproducible.
+        produce_group: Optional function generating and saving a group of
+            items at once, returning the paths they were saved to (or
+            futures of them) in order.
+        group_size: Maximum number of items in a group.
+        metrics: Optional collector the LLM requests are recorded in. A
+            summary of the requests made during the run is printed at the
+            end.
+        item_context: Optional function returning details fixed by an
+            item's index rather than drawn, such as the job an item is for.
+            They are added to the drawn details.
+        shard: Optional shard of the run to generate. Only the items it
+            owns are generated, with the indices and seeds they have in the
+            whole run.
+        output_paths: Optional output paths claimed by the run. The outputs
+            of items a resumed run already completed are reserved in it, so
+            new items with the same names don't overwrite them.
+
+    The kind of item, count, seed and shard are saved with the manifest,
+    and a resumed run must use the same ones.
+
+    Returns:
+        Paths of the items generated by this call, in index order.
+
+    Raises:
+        ValueError: If a resumed run was started with a different kind of
+            item, count, seed or shard.
+    """
+    run_info = {
+        "label": label,
+        "count": count,
+        "seed": seed,
+        "shard": str(shard) if shard is not None else None,
+    }
+    previous: dict[int, ManifestRecord] = {}
+    if manifest is not None:
+        saved_info = manifest.load_info() if resume else None
+        if saved_info is not None:
+            for key, value in run_info.items():
+                if saved_info.get(key) != value:
+                    raise ValueError(
+                        f"The run in {manifest.run_dir} was started with "
+                        f"{key} {saved_info.get(key)!r}, not {value!r}"
+                    )
+        else:
+            # A new run, or one recorded before run details were saved
+            manifest.save_info(run_info)
+        if resume:
+            previous = manifest.load()
+        else:
+            manifest.reset()
+
+    indices = range(count)
+    if shard is not None:
+        indices = shard.indices(count)
+        print(f"Shard {shard}: {len(indices)} of {count} {label}s")
+
+    pending: list[ManifestRecord] = []
+    skipped = 0
+    for index in indices:
+        record = previous.get(index)
+        if (
+            record is not None
+            and record.status == COMPLETED
+            and record.output_path is not None
+            and Path(record.output_path).exists()
+        ):
+            if output_paths is not None:
+                output_paths.reserve(Path(record.output_path))
+            skipped += 1
+            continue
+
+        if record is None:
+            item_seed = derive_seed(seed, index) if seed is not None else None
+            item = draw_item(item_seed)
+            if item_context is not None:
+                item = {**item, **item_context(index)}
+            record = ManifestRecord(
+                index=index,
+                status=PENDING,
+                item=item,
+                seed=item_seed,
+            )
+            if manifest is not None:
+                manifest.append(record)
+        pending.append(record)
+
+    if skipped:
+        print(f"Skipping {skipped} already completed {label}s")
+
+    total = len(pending)
+    completed = 0
+    first_call = len(metrics.calls) if metrics is not None else 0
+    failures = 0
+    # Outputs can finish on other threads, such as PDFs rendered in a pool
+    progress_lock = threading.Lock()
+
+    def _record_failure(record: ManifestRecord, exc: BaseException) -> None:
+        assert manifest is not None
+        manifest.append(
+            ManifestRecord(
+                index=record.index,
+                status=FAILED,
+                item=record.item,
+                seed=record.seed,
+                error=str(exc),
+            )
+        )
+        print(f"Failed to generate {label} {record.index}: {exc}")
+
+    def _record_success(record: ManifestRecord, output_path: Path) -> None:
+        assert manifest is not None
+        manifest.append(
+            ManifestRecord(
+                index=record.index,
+                status=COMPLETED,
+                item=record.item,
+                seed=record.seed,
+                output_path=str(output_path),
+            )
+        )
+
+    def _saved(
+        record: ManifestRecord,
+        output_path: Optional[Path],
+        error: Optional[BaseException],
+    ) -> None:
+        nonlocal completed, failures
+        with progress_lock:
+            completed += 1
+            if error is not None:
+                failures += 1
+                if manifest is not None:
+                    _record_failure(record, error)
+                return
+            assert output_path is not None
+            if manifest is not None:
+                _record_success(record, output_path)
+            print(f"Generated {label} {completed}/{total}: {output_path}")
+
+    def _when_saved(
+        record: ManifestRecord, output: PathOrFuture
+    ) -> PathOrFuture:
+        return after_saved(
+            output, lambda path, error: _saved(record, path, error)
+        )
+
+    def _produce(record: ManifestRecord) -> Optional[PathOrFuture]:
+        try:
+            output = produce(record.item)
+        except Exception as exc:
+            if manifest is None:
+                raise
+            _saved(record, None, exc)
+            return None
+        return _when_saved(record, output)
+
+    def _produce_group(
+        records: list[ManifestRecord],
+    ) -> list[Optional[PathOrFuture]]:
+        assert produce_group is not None
+        try:
+            outputs = produce_group([record.item for record in records])
+        except Exception as exc:
+            if manifest is None:
+                raise
+            for record in records:
+                _saved(record, None, exc)
+            return [None] * len(records)
+        return [
+            _when_saved(record, output)
+            for record, output in zip(records, outputs)
+        ]
+
+    outputs: list[Optional[PathOrFuture]]
+    if produce_group is not None and group_size > 1:
+        groups = [
+            pending[start : start + group_size]
+            for start in range(0, len(pending), group_size)
+        ]
+        group_outputs = run_concurrently(
+            _produce_group, groups, concurrency=concurrency
+        )
+        outputs = [output for group in group_outputs for output in group]
+    else:
+        outputs = run_concurrently(_produce, pending, concurrency=concurrency)
+
+    # Outputs still being written, such as PDFs rendering in a pool, are
+    # waited for so they are recorded before the run ends
+    wait([output for output in outputs if isinstance(output, Future)])
+    results: list[Path] = []
+    for output in outputs:
+        if isinstance(output, Future):
+            if manifest is None:
+                # Without a manifest, a failure aborts the run
+                results.append(output.result())
+            elif output.exception() is None:
+                results.append(output.result())
+        elif output is not None:
+            results.append(output)
+
+    if metrics is not None:
+        calls = metrics.calls[first_call:]
+        if calls:
+            print(f"\n{metrics.summarize(calls).format()}")
+
+    if failures and manifest is not None:
+        print(
+            f"{failures} {label}s failed; run again with "
+            f"--resume {manifest.run_dir} to retry them"
+        )
+
+    return results
@@ -0,0 +1,81 @@
+"""In-process cache of parsed promptdown files."""
+
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+from promptdown import StructuredPrompt
+
+
+@dataclass(frozen=True)
+class PromptCacheStats:
+    """Snapshot of prompt cache usage."""
+
+    hits: int
+    misses: int
+
+
+class PromptCache:
+    """Cache of parsed StructuredPrompt objects keyed by path and mtime.
+
+    Cached prompts must be treated as read-only. StructuredPrompt's
+    apply_template_values returns a new prompt, so templating a cached prompt
+    never changes the cached copy.
+    """
+
+    def __init__(self):
+        """Initialize an empty prompt cache."""
+        self._lock = threading.Lock()
+        self._prompts: dict[Path, tuple[int, StructuredPrompt]] = {}
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, prompt_path: Path) -> StructuredPrompt:
+        """Get the parsed prompt for a file, parsing it if needed.
+
+        The file is re-parsed whenever its modification time changes.
+
+        Args:
+            prompt_path: Path to the promptdown file.
+
+        Returns:
+            The parsed prompt.
+
+        Raises:
+            FileNotFoundError: If the prompt file does not exist.
+        """
+        mtime = os.stat(prompt_path).st_mtime_ns
+
+        with self._lock:
+            cached = self._prompts.get(prompt_path)
+            if cached is not None and cached[0] == mtime:
+                self._hits += 1
+                return cached[1]
+            self._misses += 1
+
+        structured_prompt = StructuredPrompt.from_promptdown_file(
+            str(prompt_path)
+        )
+
+        with self._lock:
+            self._prompts[prompt_path] = (mtime, structured_prompt)
+
+        return structured_prompt
+
+    @property
+    def stats(self) -> PromptCacheStats:
+        """Current hit and miss counts."""
+        with self._lock:
+            return PromptCacheStats(hits=self._hits, misses=self._misses)
+
+    def clear(self) -> None:
+        """Remove all cached prompts and reset the counters."""
+        with self._lock:
+            self._prompts.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+# Prompts never change during a run, so one cache serves the whole process.
+prompt_cache = PromptCache()
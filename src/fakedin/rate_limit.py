@@ -0,0 +1,216 @@
+"""Client-side rate limiting and retry scheduling for LLM requests."""
+
+import random
+import threading
+import time
+from typing import Callable, Optional
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at a fixed rate.
+
+    Callers reserve capacity up front and are told how long to wait before
+    using it, so the bucket may go negative. This keeps waiting fair between
+    workers and works for both threads and coroutines.
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize a full token bucket.
+
+        Args:
+            rate_per_minute: Tokens added per minute.
+            capacity: Maximum tokens held at once. Defaults to one minute's
+                worth of tokens.
+            clock: Monotonic clock returning seconds.
+        """
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive")
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = clock()
+
+    def reserve(self, amount: float) -> float:
+        """Take tokens from the bucket.
+
+        Args:
+            amount: Number of tokens to take.
+
+        Returns:
+            Seconds the caller must wait before the tokens are available.
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def adjust(self, amount: float) -> None:
+        """Return tokens to the bucket, or take more if negative."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+
+
+class RateLimiter:
+    """Request and token rate limits shared by all workers of a client.
+
+    A rate limit response from the API pauses every worker, not just the
+    one that received it, so a burst of workers backs off together.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the rate limiter.
+
+        Args:
+            requests_per_minute: Maximum requests per minute, or None for no
+                limit.
+            tokens_per_minute: Maximum tokens per minute, or None for no
+                limit.
+            clock: Monotonic clock returning seconds.
+        """
+        self._clock = clock
+        self._requests = (
+            TokenBucket(requests_per_minute, clock=clock)
+            if requests_per_minute
+            else None
+        )
+        self._tokens = (
+            TokenBucket(tokens_per_minute, clock=clock)
+            if tokens_per_minute
+            else None
+        )
+        self._lock = threading.Lock()
+        self._paused_until = 0.0
+
+    def reserve(self, tokens: int) -> float:
+        """Reserve capacity for one request.
+
+        Args:
+            tokens: Estimated number of tokens the request will use.
+
+        Returns:
+            Seconds to wait before sending the request.
+        """
+        wait = 0.0
+        if self._requests is not None:
+            wait = max(wait, self._requests.reserve(1))
+        if self._tokens is not None:
+            wait = max(wait, self._tokens.reserve(tokens))
+        with self._lock:
+            wait = max(wait, self._paused_until - self._clock())
+        return wait
+
+    def acquire(self, tokens: int) -> None:
+        """Block until one request using the given tokens may be sent."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: int) -> None:
+        """Correct the token budget once a request's real usage is known."""
+        if self._tokens is not None:
+            self._tokens.adjust(estimated_tokens - actual_tokens)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back all requests for the given number of seconds."""
+        with self._lock:
+            self._paused_until = max(
+                self._paused_until, self._clock() + seconds
+            )
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter that honors Retry-After."""
+
+    def __init__(
+        self,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+    ):
+        """Initialize the retry policy.
+
+        Args:
+            max_retries: Maximum retries after the first attempt.
+            base_delay: Delay ceiling in seconds for the first retry.
+            max_delay: Largest delay in seconds between attempts.
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def get_delay(self, attempt: int, error: Exception) -> Optional[float]:
+        """Decide whether and when to retry a failed request.
+
+        Args:
+            attempt: Number of retries already made for this request.
+            error: The error the last attempt failed with.
+
+        Returns:
+            Seconds to wait before retrying, or None to give up.
+        """
+        if attempt >= self.max_retries:
+            return None
+        if not isinstance(error, retryable_errors()):
+            return None
+
+        retry_after = get_retry_after(error)
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+
+        ceiling = min(self.max_delay, self.base_delay * 2**attempt)
+        return random.uniform(0, ceiling)
+
+
+def retryable_errors() -> tuple[type[Exception], ...]:
+    """Errors worth retrying: rate limits, timeouts, dropped connections
+    and server-side failures. Anything else (bad request, auth) fails
+    immediately.
+    """
+    # Imported here since openai is slow to import and the errors are only
+    # needed once a request has failed
+    import openai
+
+    return (
+        openai.RateLimitError,
+        openai.APIConnectionError,
+        openai.InternalServerError,
+    )
+
+
+def get_retry_after(error: Exception) -> Optional[float]:
+    """Read the server's requested retry delay from an API error, if any."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+
+    headers = response.headers
+    try:
+        if "retry-after-ms" in headers:
+            return float(headers["retry-after-ms"]) / 1000
+        if "retry-after" in headers:
+            return float(headers["retry-after"])
+    except ValueError:
+        # HTTP-date values aren't used by the OpenAI API.
+        return None
+    return None
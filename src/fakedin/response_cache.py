@@ -0,0 +1,196 @@
+"""Persistent on-disk cache of LLM completions."""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+
+class ResponseCache:
+    """SQLite-backed cache of completions keyed by model and messages.
+
+    Entries are evicted least recently used first once the total size of
+    the cached responses exceeds the configured limit. The total is kept
+    in the database alongside the responses, so storing a response doesn't
+    have to add up the sizes of all the others.
+    """
+
+    DATABASE_NAME = "responses.sqlite3"
+
+    def __init__(self, cache_dir: Path, max_size_bytes: int):
+        """Open (or create) a response cache.
+
+        Args:
+            cache_dir: Directory holding the cache database.
+            max_size_bytes: Maximum total size of cached responses.
+        """
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self.path = cache_dir / self.DATABASE_NAME
+        self.max_size_bytes = max_size_bytes
+        self._lock = threading.Lock()
+        # The connection is shared by worker threads, guarded by _lock.
+        self._connection = sqlite3.connect(
+            self.path,
+            timeout=30,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS responses_last_access
+                ON responses (last_access);
+            CREATE TABLE IF NOT EXISTS cache_info (
+                id INTEGER PRIMARY KEY CHECK (id = 0),
+                total_size INTEGER NOT NULL
+            );
+            """
+        )
+        # Caches created before the total was kept add it up once
+        self._connection.execute("BEGIN IMMEDIATE")
+        self._connection.execute(
+            "INSERT OR IGNORE INTO cache_info (id, total_size) "
+            "SELECT 0, COALESCE(SUM(size), 0) FROM responses "
+            "WHERE NOT EXISTS (SELECT 1 FROM cache_info)"
+        )
+        self._connection.execute("COMMIT")
+
+    @staticmethod
+    def make_key(
+        model: str,
+        messages: list[dict[str, Any]],
+        response_format: Optional[dict[str, Any]] = None,
+    ) -> str:
+        """Build the cache key for a request.
+
+        Args:
+            model: Model the request is sent to.
+            messages: Chat completion messages of the request.
+            response_format: Response format of the request, if any.
+
+        Returns:
+            Hex digest identifying the request.
+        """
+        request: dict[str, Any] = {"model": model, "messages": messages}
+        # Left out when unset so free-form keys stay the same
+        if response_format is not None:
+            request["response_format"] = response_format
+        payload = json.dumps(
+            request,
+            sort_keys=True,
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached response, marking it as recently used.
+
+        Args:
+            key: Key from make_key.
+
+        Returns:
+            The cached response, or None if it is not cached.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT response FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._connection.execute(
+                "UPDATE responses SET last_access = ? WHERE key = ?",
+                (time.time(), key),
+            )
+            return row[0]
+
+    def set(self, key: str, response: str) -> None:
+        """Store a response, evicting old entries if over the size limit.
+
+        Args:
+            key: Key from make_key.
+            response: Response text to cache.
+        """
+        size = len(response.encode("utf-8"))
+        if size > self.max_size_bytes:
+            return
+
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                replaced = connection.execute(
+                    "SELECT size FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                connection.execute(
+                    "INSERT OR REPLACE INTO responses "
+                    "(key, response, size, last_access) VALUES (?, ?, ?, ?)",
+                    (key, response, size, time.time()),
+                )
+                total = self._add_to_total(
+                    connection, size - (replaced[0] if replaced else 0)
+                )
+                if total > self.max_size_bytes:
+                    self._evict(connection, total)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+    def total_size(self) -> int:
+        """Total size in bytes of all cached responses."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT total_size FROM cache_info"
+            ).fetchone()
+            return row[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT COUNT(*) FROM responses"
+            ).fetchone()
+            return row[0]
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def _add_to_total(
+        self, connection: sqlite3.Connection, change: int
+    ) -> int:
+        """Change the total size of the cached responses, returning it."""
+        connection.execute(
+            "UPDATE cache_info SET total_size = total_size + ?", (change,)
+        )
+        return connection.execute(
+            "SELECT total_size FROM cache_info"
+        ).fetchone()[0]
+
+    def _evict(self, connection: sqlite3.Connection, total: int) -> None:
+        """Delete least recently used entries until under the size limit."""
+        rows = connection.execute(
+            "SELECT key, size FROM responses ORDER BY last_access"
+        )
+        stale_keys = []
+        evicted = 0
+        for key, size in rows:
+            if total - evicted <= self.max_size_bytes:
+                break
+            stale_keys.append((key,))
+            evicted += size
+
+        connection.executemany(
+            "DELETE FROM responses WHERE key = ?", stale_keys
+        )
+        self._add_to_total(connection, -evicted)
@@ -1,35 +1,68 @@
 """Module for generating résumés tailored to job descriptions."""
 
+import glob
 import os
 from pathlib import Path
-from typing import Literal, Optional
+from typing import Any, Iterable, Optional, Sequence, Union
 
-from fakedin.resume_generator import ResumeGenerator
+from fakedin.batch import BatchRequest, BatchRunner
+from fakedin.file_utils import (
+    OutputPaths,
+    PathOrFuture,
+    atomic_write_text,
+    echo_chunks,
+    wait_for_path,
+)
+from fakedin.resume_generator import OutputFormat, ResumeGenerator
 from fakedin.person_generator import PersonGenerator
 from fakedin.llm_client import LLMClient
+from fakedin.manifest import RunManifest
+from fakedin.models import Resume
+from fakedin.pdf_rendering import PdfRenderPool
+from fakedin.pipeline import generate_items
+from fakedin.seeding import derive_seed
+from fakedin.sharding import Shard
+from fakedin.sinks import OutputSink
 
 
 class ResumeForJobGenerator:
     """Generator for résumés tailored to job descriptions."""
 
-    def __init__(self):
-        """Initialize the resume for job generator."""
+    def __init__(
+        self,
+        llm_client: Optional[LLMClient] = None,
+        pdf_pool: Optional[PdfRenderPool] = None,
+        sink: Optional[OutputSink] = None,
+    ):
+        """Initialize the resume for job generator.
+
+        Args:
+            llm_client: Client to generate text with. Defaults to a new
+                client using the configured model.
+            pdf_pool: Optional process pool to render PDFs in.
+            sink: Optional sink to store résumés in as dataset records,
+                instead of saving each one as its own file.
+        """
         self.person_generator = PersonGenerator()
-        self.llm_client = LLMClient()
-        self.resume_generator = ResumeGenerator()  # For saving functionality
+        self.llm_client = llm_client or LLMClient()
+        self.sink = sink
+        # Output paths of the current run, so same-named files get numbered
+        self.output_paths = OutputPaths()
+        # For saving functionality; shares our client rather than making one
+        self.resume_generator = ResumeGenerator(self.llm_client, pdf_pool)
 
     def generate(
         self,
         job_description_path: Path,
-        output_format: Literal["pdf", "markdown"] = "markdown",
+        output_format: OutputFormat = "markdown",
         output_dir: Optional[Path] = None,
     ) -> Path:
         """Generate a single résumé tailored to a job description.
 
         Args:
             job_description_path: Path to the job description file.
-            output_format: Format to output the resume in ('pdf' or 'markdown')
-                format.
+            output_format: Format to output the resume in ('pdf', 'markdown'
+                or 'json').
             output_dir: Directory to save the resume in. Defaults to the
                 current directory.
 
@@ -37,22 +70,136 @@ class ResumeForJobGenerator:
             Path to the generated file.
         """
         # Read the job description
-        with open(job_description_path, "r", encoding="utf-8") as f:
-            job_description = f.read()
+        job_description = self._read_job_description(job_description_path)
 
         # Generate random person details
         person = self.person_generator.generate_person()
 
-        # Create parameters for the prompt
-        job_description_markdown_block = f"```markdown\n{job_description}\n```"
-        params = {**person, "job_description": job_description_markdown_block}
+        return wait_for_path(
+            self.generate_for_person(
+                person,
+                job_description_path,
+                job_description,
+                output_format,
+                output_dir,
+            )
+        )
+
+    def generate_for_person(
+        self,
+        person: dict[str, Any],
+        job_description_path: Path,
+        job_description: str,
+        output_format: OutputFormat = "markdown",
+        output_dir: Optional[Path] = None,
+        stream: bool = False,
+        structured: bool = False,
+        job_description_block: Optional[str] = None,
+    ) -> PathOrFuture:
+        """Generate a single tailored résumé for already generated person
+        details.
+
+        Args:
+            person: Person details, as produced by PersonGenerator.
+            job_description_path: Path to the job description file, used to
+                name the output file.
+            job_description: Contents of the job description file.
+            output_format: Format to output the resume in ('pdf', 'markdown'
+                or 'json').
+            output_dir: Directory to save the resume in. Defaults to the
+                current directory.
+            stream: Print the résumé to stdout as it is generated and write
+                Markdown output to disk incrementally.
+            structured: Generate a typed Resume and render the output from
+                it. Always used for JSON output.
+            job_description_block: The job description as wrapped for the
+                prompt by wrap_job_description, so that runs of many
+                résumés for one job wrap it once. Wrapped from
+                job_description when not given.
+
+        Returns:
+            Path to the generated file, or a future of it while a PDF
+            renders in the PDF pool.
+        """
+        if job_description_block is None:
+            job_description_block = self.wrap_job_description(job_description)
+        variables = self._prompt_variables(person, job_description_block)
+
+        if structured or output_format == "json":
+            resume = self.llm_client.generate_structured_from_promptdown(
+                "resume_for_job_structured", variables, Resume
+            )
+            return self.save_resume_document(
+                resume,
+                person,
+                job_description_path,
+                output_format,
+                output_dir,
+            )
 
         # Generate resume content using LLM
-        resume_text = self.llm_client.generate_from_promptdown(
-            "resume_for_job",
-            params,
+        resume_text: Union[str, Iterable[str]]
+        if stream:
+            resume_text = echo_chunks(
+                self.llm_client.stream_from_promptdown(
+                    "resume_for_job", variables
+                )
+            )
+        else:
+            resume_text = self.llm_client.generate_from_promptdown(
+                "resume_for_job",
+                variables,
+            )
+
+        return self.save_resume(
+            resume_text,
+            person,
+            job_description_path,
+            output_format,
+            output_dir,
         )
 
+    def save_resume(
+        self,
+        resume_text: Union[str, Iterable[str]],
+        person: dict[str, Any],
+        job_description_path: Path,
+        output_format: OutputFormat = "markdown",
+        output_dir: Optional[Path] = None,
+    ) -> PathOrFuture:
+        """Save a generated tailored résumé under a name derived from the
+        person and the job description file.
+
+        If PDF creation fails, the résumé is saved as Markdown instead. With
+        a sink, the résumé is stored in it whatever the output format.
+
+        Args:
+            resume_text: Generated résumé in Markdown, either whole or as
+                chunks of text still being generated.
+            person: Person details the résumé was generated for.
+            job_description_path: Path to the job description file.
+            output_format: Format to output the resume in ('pdf', 'markdown'
+                or 'json').
+            output_dir: Directory to save the resume in. Defaults to the
+                current directory.
+
+        Returns:
+            Path to the saved file, or a future of it while a PDF
+            renders in the PDF pool.
+        """
+        # Create sanitized filename
+        job_description_filename = job_description_path.stem
+        sanitized_name = person["full_name"].lower().replace(" ", "_")
+
+        if self.sink is not None:
+            if not isinstance(resume_text, str):
+                resume_text = "".join(resume_text)
+            return self.sink.write(
+                f"{sanitized_name}_for_{job_description_filename}",
+                self._sink_metadata(person, job_description_path),
+                resume_text,
+            )
+
         # Create output directory if it doesn't exist
         if output_dir is None:
             output_dir = Path.cwd()
@@ -60,73 +207,394 @@ class ResumeForJobGenerator:
         # Ensure the output directory exists
         os.makedirs(output_dir, exist_ok=True)
 
-        # Create sanitized filename
-        job_description_filename = job_description_path.stem
-        sanitized_name = person["full_name"].lower().replace(" ", "_")
-
         # Save the resume in the requested format
         if output_format == "pdf":
+            # PDF layout needs the whole text
+            if not isinstance(resume_text, str):
+                resume_text = "".join(resume_text)
             output_filename = (
                 f"{sanitized_name}_for_{job_description_filename}.pdf"
             )
-            output_path = output_dir / output_filename
-            try:
-                self.resume_generator.save_as_pdf(
-                    resume_text,
-                    output_path,
-                    person,
-                )
-            except Exception as exc:
-                print(f"Error creating PDF: {exc}")
-                # Fallback to markdown
-                markdown_filename = (
-                    f"{sanitized_name}_for_{job_description_filename}.md"
-                )
-                markdown_path = output_dir / markdown_filename
-                self.resume_generator.save_as_markdown(
-                    resume_text,
-                    markdown_path,
-                )
-                print(f"Saved as markdown file instead: {markdown_path}")
-                output_path = markdown_path
-        else:  # markdown
-            output_filename = (
+            output_path = self.output_paths.claim(output_dir / output_filename)
+            markdown_filename = (
                 f"{sanitized_name}_for_{job_description_filename}.md"
             )
-            output_path = output_dir / output_filename
-            self.resume_generator.save_as_markdown(resume_text, output_path)
+            return self.resume_generator.save_as_pdf_or_markdown(
+                resume_text,
+                output_path,
+                person,
+                lambda: self.output_paths.claim(
+                    output_dir / markdown_filename
+                ),
+            )
 
+        # Markdown
+        output_filename = f"{sanitized_name}_for_{job_description_filename}.md"
+        output_path = self.output_paths.claim(output_dir / output_filename)
+        self.resume_generator.save_as_markdown(resume_text, output_path)
+        return output_path
+
+    def save_resume_document(
+        self,
+        resume: Resume,
+        person: dict[str, Any],
+        job_description_path: Path,
+        output_format: OutputFormat = "markdown",
+        output_dir: Optional[Path] = None,
+    ) -> PathOrFuture:
+        """Save a structured tailored résumé as JSON, or rendered as
+        Markdown or PDF.
+
+        With a sink, the résumé and its document are stored in it instead.
+
+        Args:
+            resume: Generated résumé.
+            person: Person details the résumé was generated for.
+            job_description_path: Path to the job description file.
+            output_format: Format to output the resume in ('pdf', 'markdown'
+                or 'json').
+            output_dir: Directory to save the resume in. Defaults to the
+                current directory.
+
+        Returns:
+            Path to the saved file, or a future of it while a PDF
+            renders in the PDF pool.
+        """
+        sanitized_name = person["full_name"].lower().replace(" ", "_")
+        name = f"{sanitized_name}_for_{job_description_path.stem}"
+
+        if self.sink is not None:
+            return self.sink.write(
+                name,
+                self._sink_metadata(person, job_description_path),
+                resume.to_markdown(),
+                resume.model_dump(),
+            )
+        if output_format != "json":
+            return self.save_resume(
+                resume.to_markdown(),
+                person,
+                job_description_path,
+                output_format,
+                output_dir,
+            )
+
+        if output_dir is None:
+            output_dir = Path.cwd()
+        os.makedirs(output_dir, exist_ok=True)
+
+        output_path = self.output_paths.claim(output_dir / f"{name}.json")
+        atomic_write_text(output_path, resume.model_dump_json(indent=2))
         return output_path
 
     def generate_multiple(
         self,
         job_description_path: Path,
         count: int,
-        output_format: Literal["pdf", "markdown"] = "markdown",
+        output_format: OutputFormat = "markdown",
         output_dir: Optional[Path] = None,
+        concurrency: int = 1,
+        manifest: Optional[RunManifest] = None,
+        resume: bool = False,
+        seed: Optional[int] = None,
+        stream: bool = False,
+        structured: bool = False,
+        shard: Optional[Shard] = None,
     ) -> list[Path]:
         """Generate multiple résumés tailored to a job description.
 
         Args:
             job_description_path: Path to the job description file.
             count: Number of résumés to generate.
-            output_format: Format to output the resumes in ('pdf' or
-                'markdown') format.
+            output_format: Format to output the resumes in ('pdf',
+                'markdown' or 'json').
             output_dir: Directory to save the resumes in. Defaults to the
                 current directory.
+            concurrency: Maximum number of résumés generated at once.
+            manifest: Optional manifest to record the run in.
+            resume: Continue the run recorded in the manifest, skipping
+                résumés that were already generated.
+            seed: Optional seed making the generated people reproducible.
+            stream: Print each résumé to stdout as it is generated. Best
+                used with a concurrency of 1 so outputs don't interleave.
+            structured: Generate typed résumés and render the outputs from
+                them. Always used for JSON output.
+            shard: Optional shard of the run to generate, for spreading
+                the run across machines.
 
         Returns:
-            List of paths to the generated files.
+            List of paths to the generated files, in generation order.
         """
-        generated_files: list[Path] = []
+        job_description = self._read_job_description(job_description_path)
+        job_description_block = self.wrap_job_description(job_description)
 
-        for i in range(count):
-            file_path = self.generate(
+        self.output_paths = OutputPaths()
+        return generate_items(
+            count,
+            draw_item=self._draw_person,
+            produce=lambda person: self.generate_for_person(
+                person,
                 job_description_path,
+                job_description,
+                output_format,
+                output_dir,
+                stream,
+                structured,
+                job_description_block,
+            ),
+            label="résumé",
+            concurrency=concurrency,
+            manifest=manifest,
+            resume=resume,
+            seed=seed,
+            metrics=self.llm_client.metrics,
+            shard=shard,
+            output_paths=self.output_paths,
+        )
+
+    def generate_for_jobs(
+        self,
+        job_description_paths: Sequence[Path],
+        count_per_job: int,
+        output_format: OutputFormat = "markdown",
+        output_dir: Optional[Path] = None,
+        concurrency: int = 1,
+        manifest: Optional[RunManifest] = None,
+        resume: bool = False,
+        seed: Optional[int] = None,
+        stream: bool = False,
+        structured: bool = False,
+        shard: Optional[Shard] = None,
+    ) -> list[Path]:
+        """Generate résumés tailored to each of several job descriptions in
+        one run.
+
+        Every job description is read and wrapped for the prompt once up
+        front, and the résumés for
+        all jobs share one set of workers, so requests for different jobs
+        overlap. Résumé i for job j is item j * count_per_job + i of the
+        run, and each item records the job it is for.
+
+        Args:
+            job_description_paths: Paths to the job description files.
+            count_per_job: Number of résumés to generate for each job.
+            output_format: Format to output the resumes in ('pdf',
+                'markdown' or 'json').
+            output_dir: Directory to save the resumes in. Defaults to the
+                current directory.
+            concurrency: Maximum number of résumés generated at once.
+            manifest: Optional manifest to record the run in.
+            resume: Continue the run recorded in the manifest, skipping
+                résumés that were already generated.
+            seed: Optional seed making the generated people reproducible.
+            stream: Print each résumé to stdout as it is generated. Best
+                used with a concurrency of 1 so outputs don't interleave.
+            structured: Generate typed résumés and render the outputs from
+                them. Always used for JSON output.
+            shard: Optional shard of the run to generate, for spreading
+                the run across machines.
+
+        Returns:
+            List of paths to the generated files, in generation order.
+        """
+        # Each job's contents and their block for the prompt
+        job_descriptions: dict[str, tuple[str, str]] = {}
+
+        def _job_description(path: str) -> tuple[str, str]:
+            # A resumed run may include jobs that weren't passed this time
+            if path not in job_descriptions:
+                job_description = self._read_job_description(Path(path))
+                job_descriptions[path] = (
+                    job_description,
+                    self.wrap_job_description(job_description),
+                )
+            return job_descriptions[path]
+
+        for path in job_description_paths:
+            _job_description(str(path))
+
+        def _produce(item: dict[str, Any]) -> Path:
+            job_description, job_description_block = _job_description(
+                item["job_description_path"]
+            )
+            return self.generate_for_person(
+                item["person"],
+                Path(item["job_description_path"]),
+                job_description,
                 output_format,
                 output_dir,
+                stream,
+                structured,
+                job_description_block,
+            )
+
+        self.output_paths = OutputPaths()
+        return generate_items(
+            len(job_description_paths) * count_per_job,
+            draw_item=lambda item_seed: {
+                "person": self._draw_person(item_seed)
+            },
+            item_context=lambda index: {
+                "job_description_path": str(
+                    job_description_paths[index // count_per_job]
+                )
+            },
+            produce=_produce,
+            label="résumé",
+            concurrency=concurrency,
+            manifest=manifest,
+            resume=resume,
+            seed=seed,
+            metrics=self.llm_client.metrics,
+            shard=shard,
+            output_paths=self.output_paths,
+        )
+
+    def generate_batch(
+        self,
+        batch_runner: BatchRunner,
+        job_description_path: Path,
+        count: int,
+        output_format: OutputFormat = "markdown",
+        output_dir: Optional[Path] = None,
+        batch_id: Optional[str] = None,
+        seed: Optional[int] = None,
+    ) -> list[Path]:
+        """Generate multiple tailored résumés through the OpenAI Batch API.
+
+        Args:
+            batch_runner: Runner used to submit and collect the batch.
+            job_description_path: Path to the job description file. Ignored
+                when resuming.
+            count: Number of résumés to generate. Ignored when resuming.
+            output_format: Format to output the resumes in ('pdf' or
+                'markdown').
+            output_dir: Directory to save the resumes in. Defaults to the
+                current directory.
+            batch_id: Id of a previously submitted batch to resume instead
+                of submitting a new one.
+            seed: Optional seed making the generated people reproducible.
+
+        Returns:
+            List of paths to the generated files.
+
+        Raises:
+            ValueError: If JSON output is requested, which needs structured
+                mode.
+        """
+        if output_format == "json":
+            raise ValueError("Batch mode doesn't support JSON output")
+
+        self.output_paths = OutputPaths()
+        if batch_id is None:
+            job_description_block = self.wrap_job_description(
+                self._read_job_description(job_description_path)
             )
-            generated_files.append(file_path)
-            print(f"Generated résumé {i + 1}/{count} for job: {file_path}")
+            requests = []
+            for i in range(count):
+                person = self._draw_person(
+                    derive_seed(seed, i) if seed is not None else None
+                )
+                requests.append(
+                    BatchRequest(
+                        custom_id=f"resume-for-job-{i}",
+                        messages=self.llm_client.build_messages(
+                            "resume_for_job",
+                            self._prompt_variables(
+                                person, job_description_block
+                            ),
+                        ),
+                        metadata={
+                            "person": person,
+                            "job_description_path": str(job_description_path),
+                        },
+                    )
+                )
+            batch_id = batch_runner.submit(requests)
+            print(f"Submitted batch {batch_id} with {count} résumés")
+
+        return batch_runner.save_results(
+            batch_id,
+            batch_runner.collect(batch_id),
+            lambda result: wait_for_path(
+                self.save_resume(
+                    result.content or "",
+                    result.metadata["person"],
+                    Path(result.metadata["job_description_path"]),
+                    output_format,
+                    output_dir,
+                )
+            ),
+            label="résumé for job",
+            output_paths=self.output_paths,
+        )
+
+    def _draw_person(self, seed: Optional[int]) -> dict[str, Any]:
+        """Generate person details, reseeding first if a seed is given."""
+        if seed is not None:
+            self.person_generator.reseed(seed)
+        return self.person_generator.generate_person()
+
+    def wrap_job_description(self, job_description: str) -> str:
+        """Wrap a job description in the Markdown block the prompts take."""
+        return f"```markdown\n{job_description}\n```"
+
+    def _prompt_variables(
+        self, person: dict[str, Any], job_description_block: str
+    ) -> dict[str, Any]:
+        """Build the prompt variables for a person and a wrapped job
+        description.
+        """
+        return {**person, "job_description": job_description_block}
 
-        return generated_files
+    def _sink_metadata(
+        self, person: dict[str, Any], job_description_path: Path
+    ) -> dict[str, Any]:
+        """Build the details stored with a résumé in a sink."""
+        return {
+            "person": person,
+            "job_description_path": str(job_description_path),
+        }
+
+    def _read_job_description(self, job_description_path: Path) -> str:
+        """Read the contents of a job description file."""
+        with open(job_description_path, "r", encoding="utf-8") as f:
+            return f.read()
+
+
+def find_job_descriptions(pattern: Union[str, Path]) -> list[Path]:
+    """Find job description files.
+
+    Args:
+        pattern: A job description file, a directory of Markdown (.md) job
+            descriptions, or a glob pattern matching job description files
+            (** matches any number of directories).
+
+    Returns:
+        Paths of the job description files, sorted.
+
+    Raises:
+        ValueError: If two of the files have the same name apart from the
+            suffix, as their résumés would be named the same.
+    """
+    path = Path(pattern)
+    if path.is_file():
+        return [path]
+    if path.is_dir():
+        return sorted(path.glob("*.md"))
+    paths = sorted(
+        Path(match)
+        for match in glob.glob(str(pattern), recursive=True)
+        if Path(match).is_file()
+    )
+    paths_by_stem: dict[str, Path] = {}
+    for job_description_path in paths:
+        other = paths_by_stem.setdefault(
+            job_description_path.stem, job_description_path
+        )
+        if other != job_description_path:
+            raise ValueError(
+                f"{other} and {job_description_path} have the same name, "
+                "so their résumés would be named the same"
+            )
+    return paths
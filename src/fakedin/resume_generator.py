@@ -1,35 +1,112 @@
 """Module for generating realistic fake résumés."""
 
 import os
-import re
+from concurrent.futures import Future
 from pathlib import Path
-from typing import Any, Literal, Optional
-
-# Package name is fpdf2, but module name is fpdf.
-from fpdf import FPDF  # type: ignore
-
-from fakedin.person_generator import PersonGenerator
+from typing import Any, Callable, Iterable, Literal, Optional, TypeVar, Union
+
+from fakedin.batch import BatchRequest, BatchRunner
+from fakedin.dedup import NearDuplicateIndex
+from fakedin.file_utils import (
+    OutputPaths,
+    PathOrFuture,
+    atomic_write_chunks,
+    atomic_write_text,
+    echo_chunks,
+    wait_for_path,
+)
 from fakedin.llm_client import LLMClient
+from fakedin.manifest import RunManifest
+from fakedin.models import Resume
+from fakedin.packing import pack_items, split_items
+from fakedin.person_generator import PersonGenerator
+from fakedin.pdf_rendering import (
+    PdfRenderPool,
+    parse_inline_formatting,
+    sanitize_for_pdf,
+    write_pdf,
+)
+from fakedin.pipeline import generate_items
+from fakedin.seeding import derive_seed
+from fakedin.sharding import Shard
+from fakedin.sinks import OutputSink
+
+# JSON output is only available in structured mode
+OutputFormat = Literal["pdf", "markdown", "json"]
+
+# A résumé as generated, either as Markdown text or as a typed document
+DocumentT = TypeVar("DocumentT", str, Resume)
+
+# Details of one person in a packed request, as given in resume.prompt.md
+PERSON_DETAILS = """\
+Full Name: {full_name}
+Age: {age}
+Email: {email}
+Phone: {phone_number}
+City: {city}
+State: {state}
+Full Location: {location}
+Career Field: {career_field}
+Experience Level: {experience_level} ({experience_years} years of experience)\
+"""
+
+# Follow-up asking for a résumé again when it was a near-duplicate. The
+# attempt number also keeps the request from being answered from the cache.
+DISTINCT_REQUEST = """\
+A résumé you wrote for someone else came out nearly identical to what you \
+would likely write here. Make this one clearly distinct: choose different \
+employers, accomplishments, wording and section structure where the details \
+allow. (Attempt {attempt})\
+"""
 
 
 class ResumeGenerator:
     """Generator for fake résumés."""
 
-    def __init__(self):
-        """Initialize the resume generator."""
+    def __init__(
+        self,
+        llm_client: Optional[LLMClient] = None,
+        pdf_pool: Optional[PdfRenderPool] = None,
+        sink: Optional[OutputSink] = None,
+        duplicate_index: Optional[NearDuplicateIndex] = None,
+        regenerate_duplicates: int = 0,
+    ):
+        """Initialize the resume generator.
+
+        Args:
+            llm_client: Client to generate text with. Defaults to a new
+                client using the configured model.
+            pdf_pool: Optional process pool to render PDFs in, so layout
+                overlaps with LLM requests instead of running on the
+                threads making them. Saving a PDF then returns a future of
+                its path while it renders.
+            sink: Optional sink to store résumés in as dataset records,
+                instead of saving each one as its own file.
+            duplicate_index: Optional index to check every generated résumé
+                against, flagging near-duplicates of earlier ones. Streamed
+                résumés aren't checked.
+            regenerate_duplicates: Times to regenerate a near-duplicate
+                résumé before keeping it flagged.
+        """
         self.person_generator = PersonGenerator()
-        self.llm_client = LLMClient()
+        self.llm_client = llm_client or LLMClient()
+        self.pdf_pool = pdf_pool
+        self.sink = sink
+        self.duplicate_index = duplicate_index
+        self.regenerate_duplicates = regenerate_duplicates
+        # Output paths of the current run, so same-named files get numbered
+        self.output_paths = OutputPaths()
 
     def generate(
         self,
-        output_format: Literal["pdf", "markdown"] = "markdown",
+        output_format: OutputFormat = "markdown",
         output_dir: Optional[Path] = None,
     ) -> Path:
         """Generate a single résumé.
 
         Args:
-            output_format: Format to output the resume in ('pdf' or 'markdown')
-                format.
+            output_format: Format to output the resume in ('pdf', 'markdown'
+                or 'json').
             output_dir: Directory to save the resume in. Defaults to the
                 current directory.
 
@@ -39,218 +116,534 @@ class ResumeGenerator:
         # Generate random person details
         person = self.person_generator.generate_person()
 
+        return wait_for_path(
+            self.generate_for_person(person, output_format, output_dir)
+        )
+
+    def generate_for_person(
+        self,
+        person: dict[str, Any],
+        output_format: OutputFormat = "markdown",
+        output_dir: Optional[Path] = None,
+        stream: bool = False,
+        structured: bool = False,
+    ) -> PathOrFuture:
+        """Generate a single résumé for already generated person details.
+
+        Args:
+            person: Person details, as produced by PersonGenerator.
+            output_format: Format to output the resume in ('pdf', 'markdown'
+                or 'json').
+            output_dir: Directory to save the resume in. Defaults to the
+                current directory.
+            stream: Print the résumé to stdout as it is generated and write
+                Markdown output to disk incrementally.
+            structured: Generate a typed Resume and render the output from
+                it. Always used for JSON output.
+
+        Returns:
+            Path to the generated file, or a future of it while a PDF
+            renders in the PDF pool.
+        """
+        if structured or output_format == "json":
+            resume = self.llm_client.generate_structured_from_promptdown(
+                "resume_structured", person, Resume
+            )
+            resume = self._deduplicate(
+                resume,
+                person,
+                lambda attempt: self.llm_client.generate_structured(
+                    self._distinct_messages(
+                        "resume_structured", person, attempt
+                    ),
+                    Resume,
+                ),
+            )
+            return self.save_resume_document(
+                resume, person, output_format, output_dir
+            )
+
         # Generate resume content using LLM
-        resume_text = self.llm_client.generate_from_promptdown(
-            "resume",
-            person,
+        resume_text: Union[str, Iterable[str]]
+        if stream:
+            resume_text = echo_chunks(
+                self.llm_client.stream_from_promptdown("resume", person)
+            )
+        else:
+            resume_text = self.llm_client.generate_from_promptdown(
+                "resume",
+                person,
+            )
+            resume_text = self._deduplicate(
+                resume_text, person, self._regenerate_text(person)
+            )
+
+        return self.save_resume(resume_text, person, output_format, output_dir)
+
+    def generate_for_people(
+        self,
+        people: list[dict[str, Any]],
+        output_format: OutputFormat = "markdown",
+        output_dir: Optional[Path] = None,
+    ) -> list[PathOrFuture]:
+        """Generate résumés for several people in one request.
+
+        The system prompt and instructions are sent once for all of them.
+        If the response can't be split into one résumé per person, each
+        résumé is generated with its own request instead.
+
+        Args:
+            people: Person details, as produced by PersonGenerator.
+            output_format: Format to output the resumes in ('pdf' or
+                'markdown').
+            output_dir: Directory to save the resumes in. Defaults to the
+                current directory.
+
+        Returns:
+            Paths to the generated files (or futures of them while PDFs
+            render in the PDF pool), in the order of the people.
+        """
+        if len(people) == 1:
+            return [
+                self.generate_for_person(people[0], output_format, output_dir)
+            ]
+
+        response = self.llm_client.generate_from_promptdown(
+            "resume_multi",
+            {
+                "count": len(people),
+                "people": pack_items(
+                    [PERSON_DETAILS.format(**person) for person in people],
+                    "Person",
+                ),
+            },
         )
+        resume_texts = split_items(response, len(people))
+        if resume_texts is None:
+            print(
+                f"Couldn't split {len(people)} résumés from one response; "
+                "generating them one at a time"
+            )
+            return [
+                self.generate_for_person(person, output_format, output_dir)
+                for person in people
+            ]
+
+        return [
+            self.save_resume(
+                self._deduplicate(
+                    resume_text, person, self._regenerate_text(person)
+                ),
+                person,
+                output_format,
+                output_dir,
+            )
+            for resume_text, person in zip(resume_texts, people)
+        ]
+
+    def _deduplicate(
+        self,
+        resume: DocumentT,
+        person: dict[str, Any],
+        regenerate: Callable[[int], DocumentT],
+    ) -> DocumentT:
+        """Check a résumé against the duplicate index, if there is one.
+
+        A near-duplicate is regenerated up to regenerate_duplicates times,
+        and then kept and flagged in the index.
+
+        Args:
+            resume: Generated résumé.
+            person: Person details the résumé was generated for.
+            regenerate: Function generating the résumé again, given the
+                number of the attempt.
+
+        Returns:
+            The résumé to keep.
+        """
+        if self.duplicate_index is None:
+            return resume
+
+        label = person["full_name"]
+        attempt = 0
+        while True:
+            keep = attempt >= self.regenerate_duplicates
+            text = resume if isinstance(resume, str) else resume.to_markdown()
+            match = self.duplicate_index.add(label, text, keep_duplicate=keep)
+            if match is None:
+                return resume
+            description = (
+                f"near-duplicate résumé for {label} "
+                f"({match.similarity:.0%} similar to {match.similar_to})"
+            )
+            if keep:
+                print(f"Flagged {description}")
+                return resume
+            attempt += 1
+            print(f"Regenerating {description}")
+            resume = regenerate(attempt)
+
+    def _regenerate_text(self, person: dict[str, Any]) -> Callable[[int], str]:
+        """Function generating a distinct Markdown résumé for a person."""
+        return lambda attempt: self.llm_client.generate_with_messages(
+            self._distinct_messages("resume", person, attempt)
+        )
+
+    def _distinct_messages(
+        self, prompt_file: str, person: dict[str, Any], attempt: int
+    ) -> list[dict[str, Any]]:
+        """Messages asking for a résumé unlike a near-duplicate of it."""
+        messages = self.llm_client.build_messages(prompt_file, person)
+        content = DISTINCT_REQUEST.format(attempt=attempt)
+        messages.append({"role": "user", "content": content})
+        return messages
+
+    def save_resume(
+        self,
+        resume_text: Union[str, Iterable[str]],
+        person: dict[str, Any],
+        output_format: OutputFormat = "markdown",
+        output_dir: Optional[Path] = None,
+    ) -> PathOrFuture:
+        """Save generated résumé text under a name derived from the person.
+
+        If PDF creation fails, the résumé is saved as Markdown instead. With
+        a sink, the résumé is stored in it whatever the output format.
+
+        Args:
+            resume_text: Generated résumé in Markdown, either whole or as
+                chunks of text still being generated.
+            person: Person details the résumé was generated for.
+            output_format: Format to output the resume in ('pdf', 'markdown'
+                or 'json').
+            output_dir: Directory to save the resume in. Defaults to the
+                current directory.
+
+        Returns:
+            Path to the saved file, or a future of it while a PDF renders in
+            the PDF pool.
+        """
+        # Create sanitized filename
+        sanitized_name = person["full_name"].lower().replace(" ", "_")
+
+        if self.sink is not None:
+            if not isinstance(resume_text, str):
+                resume_text = "".join(resume_text)
+            return self.sink.write(
+                f"{sanitized_name}_resume", person, resume_text
+            )
 
         # Create output directory if it doesn't exist
         if output_dir is None:
             output_dir = Path.cwd()
         os.makedirs(output_dir, exist_ok=True)
 
-        # Create sanitized filename
-        sanitized_name = person["full_name"].lower().replace(" ", "_")
-
         # Save the resume in the requested format
         if output_format == "pdf":
-            output_path = output_dir / f"{sanitized_name}_resume.pdf"
-            try:
-                self.save_as_pdf(resume_text, output_path, person)
-            except Exception as exc:
-                print(f"Error creating PDF: {exc}")
-                # Fallback to markdown
-                markdown_path = output_dir / f"{sanitized_name}_resume.md"
-                self.save_as_markdown(resume_text, markdown_path)
-                print(f"Saved as markdown file instead: {markdown_path}")
-                output_path = markdown_path
-        else:  # markdown
-            output_path = output_dir / f"{sanitized_name}_resume.md"
-            self.save_as_markdown(resume_text, output_path)
+            # PDF layout needs the whole text
+            if not isinstance(resume_text, str):
+                resume_text = "".join(resume_text)
+            output_path = self.output_paths.claim(
+                output_dir / f"{sanitized_name}_resume.pdf"
+            )
+            return self.save_as_pdf_or_markdown(
+                resume_text,
+                output_path,
+                person,
+                lambda: self.output_paths.claim(
+                    output_dir / f"{sanitized_name}_resume.md"
+                ),
+            )
+
+        # Markdown
+        output_path = self.output_paths.claim(
+            output_dir / f"{sanitized_name}_resume.md"
+        )
+        self.save_as_markdown(resume_text, output_path)
+        return output_path
+
+    def save_resume_document(
+        self,
+        resume: Resume,
+        person: dict[str, Any],
+        output_format: OutputFormat = "markdown",
+        output_dir: Optional[Path] = None,
+    ) -> PathOrFuture:
+        """Save a structured résumé as JSON, or rendered as Markdown or PDF.
+
+        With a sink, the résumé and its document are stored in it instead.
+
+        Args:
+            resume: Generated résumé.
+            person: Person details the résumé was generated for.
+            output_format: Format to output the resume in ('pdf', 'markdown'
+                or 'json').
+            output_dir: Directory to save the resume in. Defaults to the
+                current directory.
+
+        Returns:
+            Path to the saved file, or a future of it while a PDF renders in
+            the PDF pool.
+        """
+        sanitized_name = person["full_name"].lower().replace(" ", "_")
+
+        if self.sink is not None:
+            return self.sink.write(
+                f"{sanitized_name}_resume",
+                person,
+                resume.to_markdown(),
+                resume.model_dump(),
+            )
+        if output_format != "json":
+            return self.save_resume(
+                resume.to_markdown(), person, output_format, output_dir
+            )
+
+        if output_dir is None:
+            output_dir = Path.cwd()
+        os.makedirs(output_dir, exist_ok=True)
 
+        output_path = self.output_paths.claim(
+            output_dir / f"{sanitized_name}_resume.json"
+        )
+        atomic_write_text(output_path, resume.model_dump_json(indent=2))
         return output_path
 
     def generate_multiple(
         self,
         count: int,
-        output_format: Literal["pdf", "markdown"] = "markdown",
+        output_format: OutputFormat = "markdown",
         output_dir: Optional[Path] = None,
+        concurrency: int = 1,
+        manifest: Optional[RunManifest] = None,
+        resume: bool = False,
+        seed: Optional[int] = None,
+        stream: bool = False,
+        structured: bool = False,
+        items_per_request: int = 1,
+        shard: Optional[Shard] = None,
     ) -> list[Path]:
         """Generate multiple résumés.
 
         Args:
             count: Number of résumés to generate.
-            output_format: Format to output the resumes in ('pdf' or
-                'markdown') format.
+            output_format: Format to output the resumes in ('pdf',
+                'markdown' or 'json').
             output_dir: Directory to save the resumes in. Defaults to the
                 current directory.
+            concurrency: Maximum number of résumés generated at once.
+            manifest: Optional manifest to record the run in.
+            resume: Continue the run recorded in the manifest, skipping
+                résumés that were already generated.
+            seed: Optional seed making the generated people reproducible.
+            stream: Print each résumé to stdout as it is generated. Best
+                used with a concurrency of 1 so outputs don't interleave.
+            structured: Generate typed résumés and render the outputs from
+                them. Always used for JSON output.
+            items_per_request: Résumés generated by each request. Above 1,
+                can't be combined with stream or structured.
+            shard: Optional shard of the run to generate, for spreading
+                the run across machines.
 
         Returns:
-            List of paths to the generated files.
+            List of paths to the generated files, in generation order.
+
+        Raises:
+            ValueError: If several items per request are combined with
+                streaming or structured output.
         """
-        generated_files: list[Path] = []
+        if items_per_request > 1 and (
+            stream or structured or output_format == "json"
+        ):
+            raise ValueError(
+                "Several résumés per request can't be streamed or "
+                "structured"
+            )
+
+        self.output_paths = OutputPaths()
+        return generate_items(
+            count,
+            draw_item=self._draw_person,
+            produce=lambda person: self.generate_for_person(
+                person, output_format, output_dir, stream, structured
+            ),
+            label="résumé",
+            concurrency=concurrency,
+            manifest=manifest,
+            resume=resume,
+            seed=seed,
+            metrics=self.llm_client.metrics,
+            produce_group=lambda people: self.generate_for_people(
+                people, output_format, output_dir
+            ),
+            group_size=items_per_request,
+            shard=shard,
+            output_paths=self.output_paths,
+        )
 
-        for i in range(count):
-            file_path = self.generate(output_format, output_dir)
-            generated_files.append(file_path)
-            print(f"Generated résumé {i + 1}/{count}: {file_path}")
+    def generate_batch(
+        self,
+        batch_runner: BatchRunner,
+        count: int,
+        output_format: OutputFormat = "markdown",
+        output_dir: Optional[Path] = None,
+        batch_id: Optional[str] = None,
+        seed: Optional[int] = None,
+    ) -> list[Path]:
+        """Generate multiple résumés through the OpenAI Batch API.
 
-        return generated_files
+        Args:
+            batch_runner: Runner used to submit and collect the batch.
+            count: Number of résumés to generate. Ignored when resuming.
+            output_format: Format to output the resumes in ('pdf' or
+                'markdown').
+            output_dir: Directory to save the resumes in. Defaults to the
+                current directory.
+            batch_id: Id of a previously submitted batch to resume instead
+                of submitting a new one.
+            seed: Optional seed making the generated people reproducible.
 
-    def save_as_markdown(self, content: str, output_path: Path) -> None:
-        """Save the resume as a Markdown file."""
-        # Ensure the parent directory exists
-        os.makedirs(output_path.parent, exist_ok=True)
+        Returns:
+            List of paths to the generated files.
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(content)
+        Raises:
+            ValueError: If JSON output is requested, which needs structured
+                mode.
+        """
+        if output_format == "json":
+            raise ValueError("Batch mode doesn't support JSON output")
+
+        self.output_paths = OutputPaths()
+        if batch_id is None:
+            requests = []
+            for i in range(count):
+                person = self._draw_person(
+                    derive_seed(seed, i) if seed is not None else None
+                )
+                requests.append(
+                    BatchRequest(
+                        custom_id=f"resume-{i}",
+                        messages=self.llm_client.build_messages(
+                            "resume", person
+                        ),
+                        metadata=person,
+                    )
+                )
+            batch_id = batch_runner.submit(requests)
+            print(f"Submitted batch {batch_id} with {count} résumés")
+
+        return batch_runner.save_results(
+            batch_id,
+            batch_runner.collect(batch_id),
+            lambda result: wait_for_path(
+                self.save_resume(
+                    result.content or "",
+                    result.metadata,
+                    output_format,
+                    output_dir,
+                )
+            ),
+            label="résumé",
+            output_paths=self.output_paths,
+        )
 
-    def save_as_pdf(
-        self, content: str, output_path: Path, person: dict[str, Any]
+    def _draw_person(self, seed: Optional[int]) -> dict[str, Any]:
+        """Generate person details, reseeding first if a seed is given."""
+        if seed is not None:
+            self.person_generator.reseed(seed)
+        return self.person_generator.generate_person()
+
+    def save_as_markdown(
+        self, content: Union[str, Iterable[str]], output_path: Path
     ) -> None:
-        """Save the resume as a PDF file with basic Markdown formatting
-        support.
+        """Save the resume as a Markdown file.
 
-        Supported Markdown:
-        - **bold** for bold text
-        - _italic_ or *italic* for italic text
-        - Headings (# H1, ## H2, ### H3)
-        - List items (-, *)
+        Content given as chunks is written out as each chunk arrives.
         """
         # Ensure the parent directory exists
         os.makedirs(output_path.parent, exist_ok=True)
 
-        # Create PDF
-        pdf = FPDF()
-        pdf.add_page()
-
-        # Use Helvetica font which has good support for various characters
-        pdf.set_font("Helvetica", size=12)
-
-        # Preprocess the content to replace problematic Unicode characters
-        content = self.sanitize_for_pdf(content)
-
-        # Process the content by paragraphs for better formatting
-        paragraphs = content.split("\n\n")
-
-        for paragraph in paragraphs:
-            # Handle headings with larger font size
-            if paragraph.startswith("# "):
-                pdf.set_font("Helvetica", style="B", size=18)
-                pdf.multi_cell(0, 10, paragraph[2:])  # type: ignore
-                pdf.set_font("Helvetica", size=12)
-            elif paragraph.startswith("## "):
-                pdf.set_font("Helvetica", style="B", size=14)
-                pdf.multi_cell(0, 10, paragraph[3:])  # type: ignore
-                pdf.set_font("Helvetica", size=12)
-            elif paragraph.startswith("### "):
-                pdf.set_font("Helvetica", style="B", size=12)
-                pdf.multi_cell(0, 10, paragraph[4:])  # type: ignore
-                pdf.set_font("Helvetica", size=12)
-            # Handle lists
-            elif paragraph.startswith("- ") or paragraph.startswith("* "):
-                lines = paragraph.split("\n")
-                for line in lines:
-                    if line.startswith("- ") or line.startswith("* "):
-                        # Use standard hyphen instead of bullet character
-                        text = line[2:]
-                        # Apply custom markdown parsing
-                        text = self.parse_inline_formatting(text)
-                        pdf.multi_cell(0, 10, f"- {text}")  # type: ignore
-                    else:
-                        text = self.parse_inline_formatting(line)
-                        pdf.multi_cell(0, 10, text)  # type: ignore
-            else:
-                # Parse inline formatting for normal paragraphs
-                text = self.parse_inline_formatting(paragraph)
-                pdf.multi_cell(0, 10, text)  # type: ignore
-
-            # Add some spacing between paragraphs
-            pdf.ln(5)
-
-        # Save the PDF
-        pdf.output(str(output_path))
-
-    def parse_inline_formatting(self, text: str) -> str:
-        """Parse inline Markdown formatting and apply FPDF styling.
-
-        This method handles:
-        - **bold** or __bold__
-        - *italic* or _italic_
-        """
-        # If text is None or empty, return empty string
-        if not text:
-            return ""
-
-        # First, handle bold formatting
-        # Find all occurrences of **text** or __text__
-        bold_pattern = r"(\*\*|__)(.*?)\1"
-
-        chunks = []
-        last_end = 0
-
-        for match in re.finditer(bold_pattern, text):
-            # Add the text before the match
-            chunks.append(text[last_end:match.start()])  # type: ignore
-
-            # Add the bold text without the markers
-            bold_text = match.group(2)
-            chunks.append(bold_text)  # type: ignore
-
-            last_end = match.end()
+        if isinstance(content, str):
+            atomic_write_text(output_path, content)
+        else:
+            atomic_write_chunks(output_path, content)
 
-        # Add the remaining text
-        chunks.append(text[last_end:])  # type: ignore
+    def save_as_pdf_or_markdown(
+        self,
+        content: str,
+        output_path: Path,
+        person: dict[str, Any],
+        markdown_path: Callable[[], Path],
+    ) -> PathOrFuture:
+        """Save the resume as a PDF file, or as Markdown if that fails.
+
+        With a PDF pool, the PDF is queued to render in a worker process
+        and a future of the saved path is returned at once, so the calling
+        thread can go on to its next request. The Markdown is then written
+        when the render fails.
 
-        # Join all parts
-        result = "".join(chunks)  # type: ignore
+        Args:
+            content: Résumé in Markdown.
+            output_path: Path of the PDF.
+            person: Person details the résumé was generated for.
+            markdown_path: Function claiming the path to save Markdown to,
+                called only if creating the PDF fails.
 
-        # Next, handle italic formatting
-        # Find all occurrences of *text* or _text_
-        italic_pattern = r"(\*|_)(.*?)\1"
+        Returns:
+            Path to the saved file, or a future of it while the PDF renders.
+        """
 
-        chunks = []
-        last_end = 0
+        def _fallback(exc: BaseException) -> Path:
+            print(f"Error creating PDF: {exc}")
+            fallback_path = markdown_path()
+            self.save_as_markdown(content, fallback_path)
+            print(f"Saved as markdown file instead: {fallback_path}")
+            return fallback_path
 
-        for match in re.finditer(italic_pattern, result):
-            # Add the text before the match
-            chunks.append(result[last_end:match.start()])  # type: ignore
+        if self.pdf_pool is None:
+            try:
+                self.save_as_pdf(content, output_path, person)
+            except Exception as exc:
+                return _fallback(exc)
+            return output_path
 
-            # Add the italic text without the markers
-            italic_text = match.group(2)
-            chunks.append(italic_text)  # type: ignore
+        saved: Future[Path] = Future()
 
-            last_end = match.end()
+        def _on_rendered(render: Future[None]) -> None:
+            try:
+                error = render.exception()
+                saved.set_result(
+                    output_path if error is None else _fallback(error)
+                )
+            except BaseException as exc:
+                saved.set_exception(exc)
+
+        self.pdf_pool.submit(content, output_path).add_done_callback(
+            _on_rendered
+        )
+        return saved
 
-        # Add the remaining text
-        chunks.append(result[last_end:])  # type: ignore
+    def save_as_pdf(
+        self, content: str, output_path: Path, person: dict[str, Any]
+    ) -> None:
+        """Save the resume as a PDF file with basic Markdown formatting
+        support.
 
-        # Join all parts
-        result = "".join(chunks)  # type: ignore
+        Layout runs in the PDF render pool when one was given, and on the
+        calling thread otherwise; either way, this waits until the PDF is
+        written. See pdf_rendering.write_pdf for the supported Markdown.
+        """
+        if self.pdf_pool is not None:
+            self.pdf_pool.render(content, output_path)
+        else:
+            write_pdf(content, output_path)
 
-        return result
+    def parse_inline_formatting(self, text: str) -> str:
+        """Parse inline Markdown formatting and apply FPDF styling."""
+        return parse_inline_formatting(text)
 
     def sanitize_for_pdf(self, text: str) -> str:
         """Sanitize text for PDF output by replacing unsupported Unicode
         characters.
         """
-        # Common problematic characters and their replacements
-        replacements = {
-            "\u2013": "-",  # en dash
-            "\u2014": "--",  # em dash
-            "\u2018": "'",  # left single quote
-            "\u2019": "'",  # right single quote
-            "\u201c": '"',  # left double quote
-            "\u201d": '"',  # right double quote
-            "\u2022": "-",  # bullet - replace with hyphen
-            "\u2026": "...",  # ellipsis
-            "\u00a0": " ",  # non-breaking space
-            "\u2212": "-",  # minus sign
-            "\u200b": "",  # zero width space
-        }
-
-        for char, replacement in replacements.items():
-            text = text.replace(char, replacement)
-
-        return text
+        return sanitize_for_pdf(text)
@@ -0,0 +1,21 @@
+"""Deterministic seeds for reproducible generation runs."""
+
+import hashlib
+
+
+def derive_seed(base_seed: int, index: int) -> int:
+    """Derive an independent seed for one item of a seeded run.
+
+    The seed depends only on the run's seed and the item's index, so an
+    item comes out the same regardless of how many workers generate the run
+    or in which order.
+
+    Args:
+        base_seed: Seed of the whole run.
+        index: Index of the item in the run.
+
+    Returns:
+        A 64-bit seed for the item.
+    """
+    digest = hashlib.sha256(f"{base_seed}:{index}".encode("ascii")).digest()
+    return int.from_bytes(digest[:8], "big")
@@ -0,0 +1,61 @@
+"""Splitting generation runs into disjoint shards for several machines."""
+
+from dataclasses import dataclass
+from typing import Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class Shard:
+    """One of several disjoint parts of a generation run.
+
+    Shard index (counting from 0) of total owns every item whose index in
+    the whole run leaves index as remainder when divided by total. Items
+    keep their index, and so their seed, so the shards of a seeded run
+    together generate exactly the items of the unsharded run.
+    """
+
+    index: int
+    total: int
+
+    def __post_init__(self) -> None:
+        if self.total < 1:
+            raise ValueError(
+                f"shard total must be at least 1, got {self.total}"
+            )
+        if not 0 <= self.index < self.total:
+            raise ValueError(
+                f"shard index must be from 0 to {self.total - 1}, "
+                f"got {self.index}"
+            )
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.total}"
+
+    def indices(self, count: int) -> range:
+        """Indices of the items this shard owns in a run of count items."""
+        return range(self.index, count, self.total)
+
+    def owns(self, index: int) -> bool:
+        """Whether this shard owns the item with an index."""
+        return index % self.total == self.index
+
+    def select(self, items: Sequence[T]) -> list[T]:
+        """The items of a sequence this shard owns."""
+        return list(items[self.index :: self.total])
+
+
+def parse_shard(value: str) -> Shard:
+    """Parse a shard written as INDEX/TOTAL, such as 0/4.
+
+    Raises:
+        ValueError: If the value isn't a valid shard.
+    """
+    index, separator, total = value.partition("/")
+    if not separator:
+        raise ValueError(f"expected INDEX/TOTAL, got {value!r}")
+    try:
+        return Shard(int(index), int(total))
+    except ValueError as exc:
+        raise ValueError(f"invalid shard {value!r}: {exc}") from None
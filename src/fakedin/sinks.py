@@ -0,0 +1,296 @@
+"""Output sinks collecting generated items into a few dataset files."""
+
+import json
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Optional
+
+# "files" writes one file per item, as the generators do without a sink
+SINKS = ("files", "jsonl", "parquet")
+
+
+class OutputSink:
+    """Destination for generated items, instead of one file per item.
+
+    Each item is stored as a record of its name, the details it was
+    generated from, its text and, in structured mode, its document.
+    Sinks are safe to share between threads.
+    """
+
+    def write(
+        self,
+        name: str,
+        metadata: dict[str, Any],
+        text: str,
+        document: Optional[dict[str, Any]] = None,
+    ) -> Path:
+        """Store one generated item.
+
+        Args:
+            name: Name of the item, as its file would have been named
+                without an extension.
+            metadata: Details the item was generated from.
+            text: Generated text, in Markdown.
+            document: Structured document the text was rendered from, if
+                any.
+
+        Returns:
+            Path of the file the item is stored in.
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Write out everything stored and release the sink's files."""
+        raise NotImplementedError
+
+    def __enter__(self) -> "OutputSink":
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        self.close()
+
+
+class ShardedSink(OutputSink):
+    """Sink appending records to rolling shard files with buffered writes.
+
+    Records are buffered in memory and written out in blocks, and a new
+    shard is started every records_per_shard records. A shard is written
+    under a hidden temporary name and only gets its final name once it is
+    complete, so the path returned for a record exists only once the
+    record is safely on disk. Shards are named after the run writing them,
+    so a shard of an earlier run, such as one cut short by a crash whose
+    items a resumed run regenerates, never shares a name with a shard of
+    a later run. Partial shards left behind by earlier runs are discarded.
+    """
+
+    EXTENSION = ""
+
+    def __init__(
+        self,
+        output_dir: Path,
+        prefix: str,
+        records_per_shard: int = 10_000,
+        buffer_size: int = 256,
+        run_id: Optional[str] = None,
+    ):
+        """Initialize the sink.
+
+        Args:
+            output_dir: Directory to write the shards to.
+            prefix: Start of every shard's file name.
+            records_per_shard: Records stored in each shard.
+            buffer_size: Records buffered before they are written out.
+            run_id: Name of the run in its shards' file names. Defaults to
+                a new random one.
+        """
+        self.output_dir = output_dir
+        self.prefix = prefix
+        self.records_per_shard = records_per_shard
+        self.buffer_size = buffer_size
+        self.run_id = run_id if run_id is not None else uuid.uuid4().hex[:8]
+        self._lock = threading.Lock()
+        self._buffer: list[dict[str, Any]] = []
+        self._shard_records = 0
+        self._shard_index = 0
+        self._part_path: Optional[Path] = None
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        for part_path in output_dir.glob(f".{prefix}-*{self.EXTENSION}.part"):
+            part_path.unlink()
+
+    def shard_path(self, index: int) -> Path:
+        """Final path of a shard."""
+        return self.output_dir / (
+            f"{self.prefix}-{self.run_id}-{index:05d}{self.EXTENSION}"
+        )
+
+    def write(
+        self,
+        name: str,
+        metadata: dict[str, Any],
+        text: str,
+        document: Optional[dict[str, Any]] = None,
+    ) -> Path:
+        """Buffer one generated item, writing out full buffers and shards.
+
+        See OutputSink.write.
+        """
+        record: dict[str, Any] = {
+            "name": name,
+            "metadata": metadata,
+            "text": text,
+        }
+        if document is not None:
+            record["document"] = document
+
+        with self._lock:
+            if self._part_path is None:
+                final_path = self.shard_path(self._shard_index)
+                self._part_path = final_path.with_name(
+                    f".{final_path.name}.part"
+                )
+                self._open_shard(self._part_path)
+            shard_path = self.shard_path(self._shard_index)
+
+            self._buffer.append(record)
+            self._shard_records += 1
+            if len(self._buffer) >= self.buffer_size:
+                self._flush()
+            if self._shard_records >= self.records_per_shard:
+                self._finish_shard()
+
+        return shard_path
+
+    def close(self) -> None:
+        """Write out buffered records and finish the current shard."""
+        with self._lock:
+            if self._part_path is not None:
+                self._finish_shard()
+
+    def _flush(self) -> None:
+        if self._buffer:
+            self._write_records(self._buffer)
+            self._buffer = []
+
+    def _finish_shard(self) -> None:
+        assert self._part_path is not None
+        self._flush()
+        self._close_shard()
+        os.replace(self._part_path, self.shard_path(self._shard_index))
+        self._part_path = None
+        self._shard_index += 1
+        self._shard_records = 0
+
+    def _open_shard(self, path: Path) -> None:
+        raise NotImplementedError
+
+    def _write_records(self, records: list[dict[str, Any]]) -> None:
+        raise NotImplementedError
+
+    def _close_shard(self) -> None:
+        raise NotImplementedError
+
+
+class JsonlSink(ShardedSink):
+    """Sink storing records as lines of JSON."""
+
+    EXTENSION = ".jsonl"
+
+    def _open_shard(self, path: Path) -> None:
+        self._file = open(path, "w", encoding="utf-8")
+
+    def _write_records(self, records: list[dict[str, Any]]) -> None:
+        self._file.write(
+            "".join(
+                json.dumps(record, ensure_ascii=False) + "\n"
+                for record in records
+            )
+        )
+        self._file.flush()
+
+    def _close_shard(self) -> None:
+        self._file.close()
+
+
+class ParquetSink(ShardedSink):
+    """Sink storing records as rows of Parquet files.
+
+    Needs pyarrow. Metadata and documents vary in shape between items, so
+    they are stored as JSON strings. Every buffered block becomes one row
+    group.
+    """
+
+    EXTENSION = ".parquet"
+
+    def __init__(
+        self,
+        output_dir: Path,
+        prefix: str,
+        records_per_shard: int = 10_000,
+        buffer_size: int = 1_000,
+        run_id: Optional[str] = None,
+    ):
+        """Initialize the sink. See ShardedSink.
+
+        Raises:
+            RuntimeError: If pyarrow isn't installed.
+        """
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as exc:
+            raise RuntimeError(
+                "The parquet sink needs pyarrow: "
+                "pip install 'fakedin[parquet]'"
+            ) from exc
+
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self._schema = pyarrow.schema(
+            [
+                ("name", pyarrow.string()),
+                ("metadata", pyarrow.string()),
+                ("text", pyarrow.string()),
+                ("document", pyarrow.string()),
+            ]
+        )
+        super().__init__(
+            output_dir, prefix, records_per_shard, buffer_size, run_id
+        )
+
+    def _open_shard(self, path: Path) -> None:
+        self._writer = self._pq.ParquetWriter(path, self._schema)
+
+    def _write_records(self, records: list[dict[str, Any]]) -> None:
+        rows = [
+            {
+                "name": record["name"],
+                "metadata": json.dumps(record["metadata"], ensure_ascii=False),
+                "text": record["text"],
+                "document": (
+                    json.dumps(record["document"], ensure_ascii=False)
+                    if "document" in record
+                    else None
+                ),
+            }
+            for record in records
+        ]
+        self._writer.write_table(
+            self._pa.Table.from_pylist(rows, schema=self._schema)
+        )
+
+    def _close_shard(self) -> None:
+        self._writer.close()
+
+
+def build_sink(
+    kind: str,
+    output_dir: Path,
+    prefix: str,
+    records_per_shard: int = 10_000,
+) -> Optional[OutputSink]:
+    """Create the sink of a kind.
+
+    Args:
+        kind: One of SINKS.
+        output_dir: Directory to write the dataset files to.
+        prefix: Start of every dataset file's name.
+        records_per_shard: Records stored in each dataset file.
+
+    Returns:
+        The sink, or None for "files", which needs no sink.
+
+    Raises:
+        ValueError: If the kind is unknown.
+    """
+    if kind == "files":
+        return None
+    if kind == "jsonl":
+        return JsonlSink(output_dir, prefix, records_per_shard)
+    if kind == "parquet":
+        return ParquetSink(output_dir, prefix, records_per_shard)
+    raise ValueError(
+        f"Unknown output sink {kind!r}; expected one of {', '.join(SINKS)}"
+    )
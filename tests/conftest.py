@@ -1,9 +1,17 @@
 import pytest
 
 from fakedin import config
+from fakedin.llm_client import reset_shared_clients
 
 
 @pytest.fixture(autouse=True)
 def _set_dummy_openai_key(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(config.settings, "openai_api_key", "test-key")
     yield
+
+
+@pytest.fixture(autouse=True)
+def _reset_shared_clients() -> None:
+    reset_shared_clients()
+    yield
+    reset_shared_clients()
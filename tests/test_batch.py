@@ -0,0 +1,208 @@
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from fakedin.batch import BatchRequest, BatchRunner
+from fakedin.job_generator import JobOpeningGenerator
+
+
+class _FakeFiles:
+    def __init__(self) -> None:
+        self.contents: dict[str, str] = {}
+
+    def create(self, file, purpose: str):
+        assert purpose == "batch"
+        file_id = f"file-{len(self.contents)}"
+        self.contents[file_id] = file.read().decode("utf-8")
+        return SimpleNamespace(id=file_id)
+
+    def content(self, file_id: str):
+        return SimpleNamespace(text=self.contents[file_id])
+
+
+class _FakeBatches:
+    """Answers each request by echoing its last message, after one poll."""
+
+    def __init__(self, files: _FakeFiles, fail_ids: set[str]) -> None:
+        self._files = files
+        self._fail_ids = fail_ids
+        self._polls: dict[str, int] = {}
+        self._inputs: dict[str, str] = {}
+
+    def create(self, input_file_id: str, endpoint: str, completion_window):
+        batch_id = f"batch-{len(self._inputs)}"
+        self._inputs[batch_id] = input_file_id
+        self._polls[batch_id] = 0
+        return SimpleNamespace(id=batch_id, status="validating")
+
+    def retrieve(self, batch_id: str):
+        self._polls[batch_id] += 1
+        if self._polls[batch_id] < 2:
+            return SimpleNamespace(
+                id=batch_id,
+                status="in_progress",
+                request_counts=SimpleNamespace(completed=0, total=1),
+            )
+
+        outputs = []
+        errors = []
+        for line in self._files.contents[self._inputs[batch_id]].splitlines():
+            request = json.loads(line)
+            if request["custom_id"] in self._fail_ids:
+                errors.append(
+                    {
+                        "custom_id": request["custom_id"],
+                        "response": None,
+                        "error": {"code": "server_error"},
+                    }
+                )
+                continue
+            content = request["body"]["messages"][-1]["content"]
+            if isinstance(content, list):
+                content = content[0]["text"]
+            outputs.append(
+                {
+                    "custom_id": request["custom_id"],
+                    "response": {
+                        "status_code": 200,
+                        "body": {
+                            "choices": [
+                                {"message": {"content": f"echo: {content}"}}
+                            ]
+                        },
+                    },
+                    "error": None,
+                }
+            )
+
+        output_file = self._files.create(
+            SimpleNamespace(
+                read=lambda: "\n".join(map(json.dumps, outputs)).encode()
+            ),
+            purpose="batch",
+        )
+        error_file = self._files.create(
+            SimpleNamespace(
+                read=lambda: "\n".join(map(json.dumps, errors)).encode()
+            ),
+            purpose="batch",
+        )
+        return SimpleNamespace(
+            id=batch_id,
+            status="completed",
+            output_file_id=output_file.id,
+            error_file_id=error_file.id,
+        )
+
+
+class _FakeBatchClient:
+    def __init__(self, fail_ids: set[str] | None = None) -> None:
+        self.files = _FakeFiles()
+        self.batches = _FakeBatches(self.files, fail_ids or set())
+
+
+def _runner(tmp_path: Path, fake: _FakeBatchClient) -> BatchRunner:
+    llm_client = SimpleNamespace(client=fake, model="test-model")
+    return BatchRunner(llm_client, tmp_path, poll_interval=0)  # type: ignore
+
+
+def test_submit_and_collect_pairs_results_with_metadata(
+    tmp_path: Path,
+) -> None:
+    fake = _FakeBatchClient(fail_ids={"b"})
+    runner = _runner(tmp_path, fake)
+
+    batch_id = runner.submit(
+        [
+            BatchRequest("a", [{"role": "user", "content": "one"}], {"n": 1}),
+            BatchRequest("b", [{"role": "user", "content": "two"}], {"n": 2}),
+        ]
+    )
+    results = runner.collect(batch_id)
+
+    assert [r.custom_id for r in results] == ["a", "b"]
+    assert results[0].content == "echo: one"
+    assert results[0].metadata == {"n": 1}
+    assert results[1].content is None
+    assert "server_error" in results[1].error
+    assert (tmp_path / f"{batch_id}.input.jsonl").exists()
+
+
+def test_collect_resumes_from_batch_id_with_new_runner(
+    tmp_path: Path,
+) -> None:
+    fake = _FakeBatchClient()
+    batch_id = _runner(tmp_path, fake).submit(
+        [BatchRequest("a", [{"role": "user", "content": "one"}], {"n": 1})]
+    )
+
+    results = _runner(tmp_path, fake).collect(batch_id)
+
+    assert results[0].content == "echo: one"
+
+
+def test_collect_unknown_batch_raises(tmp_path: Path) -> None:
+    runner = _runner(tmp_path, _FakeBatchClient())
+
+    with pytest.raises(FileNotFoundError):
+        runner.collect("batch-unknown")
+
+
+def test_job_generate_batch_saves_outputs(tmp_path: Path) -> None:
+    fake = _FakeBatchClient()
+    generator = JobOpeningGenerator()
+    jobs = iter(["Acme", "Globex"])
+    generator.job_generator.generate_job = lambda: {
+        "company_name": next(jobs),
+        "career_field": "Engineer",
+        "experience_level": "Senior",
+        "work_model": "Remote",
+        "salary_range": "$1 - $2",
+        "min_salary": 1,
+        "max_salary": 2,
+    }
+
+    paths = generator.generate_batch(
+        _runner(tmp_path, fake), count=2, output_dir=tmp_path
+    )
+
+    assert [path.name for path in paths] == [
+        "acme_engineer_job.md",
+        "globex_engineer_job.md",
+    ]
+    assert "Acme" in paths[0].read_text(encoding="utf-8")
+
+
+def test_collecting_a_batch_again_keeps_saved_results(tmp_path: Path) -> None:
+    fake = _FakeBatchClient()
+    generator = JobOpeningGenerator()
+    generator.job_generator.generate_job = lambda: {
+        "company_name": "Acme",
+        "career_field": "Engineer",
+        "experience_level": "Senior",
+        "work_model": "Remote",
+        "salary_range": "$1 - $2",
+        "min_salary": 1,
+        "max_salary": 2,
+    }
+    output_dir = tmp_path / "out"
+    paths = generator.generate_batch(
+        _runner(tmp_path, fake), count=2, output_dir=output_dir
+    )
+    paths[0].write_text("edited", encoding="utf-8")
+    paths[1].unlink()
+
+    collected = generator.generate_batch(
+        _runner(tmp_path, fake),
+        count=2,
+        output_dir=output_dir,
+        batch_id="batch-0",
+    )
+
+    assert collected == paths
+    assert sorted(output_dir.iterdir()) == sorted(paths)
+    assert paths[0].read_text(encoding="utf-8") == "edited"
+    # Saved again, as its file had gone
+    assert "Acme" in paths[1].read_text(encoding="utf-8")
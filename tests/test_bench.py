@@ -0,0 +1,40 @@
+import json
+from pathlib import Path
+
+from fakedin import bench
+from fakedin.fake_openai import FakeOpenAIServer, FakeServerConfig
+
+
+def test_build_scenarios_skips_job_pdf() -> None:
+    scenarios = bench.build_scenarios(bench.FLOWS, bench.FORMATS, 5, 2)
+
+    assert [(s.flow, s.output_format) for s in scenarios] == [
+        ("resume", "markdown"),
+        ("resume", "pdf"),
+        ("job", "markdown"),
+        ("resumes-for-job", "markdown"),
+        ("resumes-for-job", "pdf"),
+    ]
+    assert all(s.count == 5 and s.concurrency == 2 for s in scenarios)
+
+
+def test_run_scenario_measures_generated_items(tmp_path: Path) -> None:
+    config = FakeServerConfig(latency=0.0, response_size=500, seed=3)
+    with FakeOpenAIServer(config) as server:
+        result = bench.run_scenario(
+            bench.BenchScenario("job", "markdown", count=3, concurrency=2),
+            server.base_url,
+        )
+
+    assert result.items == 3
+    assert result.items_per_second > 0
+    assert result.failed_requests == 0
+
+    table = bench.format_results([result])
+    assert "job" in table.splitlines()[2]
+
+    output_path = tmp_path / "bench.json"
+    bench.write_results_json([result], config, output_path)
+    report = json.loads(output_path.read_text(encoding="utf-8"))
+    assert report["server"]["seed"] == 3
+    assert report["results"][0]["items"] == 3
@@ -1,7 +1,10 @@
+import io
 import unittest
+from contextlib import redirect_stderr
 from pathlib import Path
 
-from fakedin.cli import build_parser
+from fakedin.cli import build_parser, main
+from fakedin.sharding import Shard
 
 
 class TestCliParser(unittest.TestCase):
@@ -15,6 +18,9 @@ class TestCliParser(unittest.TestCase):
         self.assertEqual(args.count, 2)
         self.assertEqual(args.format, "markdown")
         self.assertEqual(args.output, Path("output"))
+        self.assertEqual(args.concurrency, 1)
+        self.assertIsNone(args.cache_dir)
+        self.assertFalse(args.cache)
 
     def test_job_defaults(self) -> None:
         args = self.parser.parse_args(["job", "3"])
@@ -37,11 +43,219 @@ class TestCliParser(unittest.TestCase):
         )
 
         self.assertEqual(args.command, "resumes-for-job")
-        self.assertEqual(args.job_description_file, Path("jobs/sample_job.md"))
+        self.assertEqual(args.job_descriptions, "jobs/sample_job.md")
         self.assertEqual(args.count, 4)
         self.assertEqual(args.format, "pdf")
         self.assertEqual(args.output, Path("custom_output"))
 
+    def test_concurrency_flag(self) -> None:
+        args = self.parser.parse_args(["job", "3", "--concurrency", "8"])
+
+        self.assertEqual(args.concurrency, 8)
+
+    def test_cache_flags(self) -> None:
+        args = self.parser.parse_args(
+            ["resume", "1", "--cache-dir", "./cache", "--cache"]
+        )
+
+        self.assertEqual(args.cache_dir, Path("cache"))
+        self.assertTrue(args.cache)
+
+    def test_rate_limit_flags(self) -> None:
+        args = self.parser.parse_args(
+            [
+                "job",
+                "1",
+                "--rpm",
+                "500",
+                "--tokens-per-minute",
+                "200000",
+                "--max-retries",
+                "8",
+            ]
+        )
+
+        self.assertEqual(args.requests_per_minute, 500)
+        self.assertEqual(args.tokens_per_minute, 200000)
+        self.assertEqual(args.max_retries, 8)
+
+    def test_seed_flag(self) -> None:
+        args = self.parser.parse_args(["resume", "10", "--seed", "1234"])
+
+        self.assertEqual(args.seed, 1234)
+
+    def test_resume_flag(self) -> None:
+        args = self.parser.parse_args(["resume", "10", "--resume", "./run"])
+
+        self.assertEqual(args.resume, Path("run"))
+
+    def test_stream_flag(self) -> None:
+        args = self.parser.parse_args(["job", "1", "--stream"])
+
+        self.assertTrue(args.stream)
+
+    def test_structured_output_args(self) -> None:
+        args = self.parser.parse_args(["job", "1", "--format", "json"])
+
+        self.assertEqual(args.format, "json")
+        self.assertFalse(args.structured)
+
+        args = self.parser.parse_args(
+            ["resume", "1", "--format", "pdf", "--structured"]
+        )
+
+        self.assertTrue(args.structured)
+
+    def test_sink_args(self) -> None:
+        args = self.parser.parse_args(["resume", "1"])
+
+        self.assertEqual(args.sink, "files")
+
+        args = self.parser.parse_args(
+            ["job", "1", "--sink", "jsonl", "--records-per-shard", "500"]
+        )
+
+        self.assertEqual(args.sink, "jsonl")
+        self.assertEqual(args.records_per_shard, 500)
+
+    def test_metrics_json_arg(self) -> None:
+        args = self.parser.parse_args(
+            ["resume", "1", "--metrics-json", "metrics.json"]
+        )
+
+        self.assertEqual(args.metrics_json, Path("metrics.json"))
+
+    def test_render_pdf_args(self) -> None:
+        args = self.parser.parse_args(
+            ["render-pdf", "./output", "--render-workers", "4"]
+        )
+
+        self.assertEqual(args.command, "render-pdf")
+        self.assertEqual(args.directory, Path("output"))
+        self.assertIsNone(args.output)
+        self.assertEqual(args.render_workers, 4)
+
+    def test_corpus_args(self) -> None:
+        args = self.parser.parse_args(
+            [
+                "corpus",
+                "10",
+                "5",
+                "--job-concurrency",
+                "2",
+                "-c",
+                "8",
+                "--format",
+                "pdf",
+                "--cache",
+            ]
+        )
+
+        self.assertEqual(args.command, "corpus")
+        self.assertEqual(args.job_count, 10)
+        self.assertEqual(args.resumes_per_job, 5)
+        self.assertEqual(args.job_concurrency, 2)
+        self.assertEqual(args.concurrency, 8)
+        self.assertIsNone(args.queue_size)
+        self.assertEqual(args.format, "pdf")
+        self.assertTrue(args.cache)
+
+    def test_bench_args(self) -> None:
+        args = self.parser.parse_args(
+            [
+                "bench",
+                "--count",
+                "20",
+                "--flows",
+                "resume",
+                "job",
+                "--formats",
+                "markdown",
+                "--latency",
+                "0.2",
+                "--error-rate",
+                "0.05",
+            ]
+        )
+
+        self.assertEqual(args.command, "bench")
+        self.assertEqual(args.count, 20)
+        self.assertEqual(args.concurrency, 8)
+        self.assertEqual(args.flows, ["resume", "job"])
+        self.assertEqual(args.formats, ["markdown"])
+        self.assertEqual(args.latency, 0.2)
+        self.assertEqual(args.error_rate, 0.05)
+        self.assertIsNone(args.json)
+
+    def test_shard_flag(self) -> None:
+        args = self.parser.parse_args(["resume", "10", "--shard", "1/4"])
+
+        self.assertEqual(args.shard, Shard(1, 4))
+        self.assertIsNone(self.parser.parse_args(["job", "3"]).shard)
+
+    def test_shard_must_be_in_range(self) -> None:
+        for value in ("4/4", "1", "a/b"):
+            with self.assertRaises(SystemExit):
+                self.parser.parse_args(["job", "3", "--shard", value])
+
+    def test_dedup_flags(self) -> None:
+        args = self.parser.parse_args(
+            [
+                "resume",
+                "10",
+                "--dedup-threshold",
+                "0.85",
+                "--regenerate-duplicates",
+                "2",
+            ]
+        )
+
+        self.assertEqual(args.dedup_threshold, 0.85)
+        self.assertEqual(args.regenerate_duplicates, 2)
+        with self.assertRaises(SystemExit):
+            self.parser.parse_args(["resume", "1", "--dedup-threshold", "2"])
+
+    def test_corpus_cannot_be_sharded(self) -> None:
+        with self.assertRaises(SystemExit):
+            self.parser.parse_args(["corpus", "4", "2", "--shard", "0/2"])
+
+    def test_max_retries_must_not_be_negative(self) -> None:
+        stderr = io.StringIO()
+        with self.assertRaises(SystemExit), redirect_stderr(stderr):
+            main(["job", "1", "--max-retries", "-1"])
+
+        self.assertIn("--max-retries can't be negative", stderr.getvalue())
+
+    def test_regenerate_duplicates_must_not_be_negative(self) -> None:
+        stderr = io.StringIO()
+        with self.assertRaises(SystemExit), redirect_stderr(stderr):
+            main(
+                [
+                    "resume",
+                    "1",
+                    "--dedup-threshold",
+                    "0.8",
+                    "--regenerate-duplicates",
+                    "-1",
+                ]
+            )
+
+        self.assertIn("can't be negative", stderr.getvalue())
+
+    def test_merge_args(self) -> None:
+        args = self.parser.parse_args(
+            ["merge", "out0", "out1", "--output", "merged"]
+        )
+
+        self.assertEqual(args.command, "merge")
+        self.assertEqual(args.run_dirs, [Path("out0"), Path("out1")])
+        self.assertEqual(args.output, Path("merged"))
+        self.assertFalse(args.allow_incomplete)
+
+    def test_concurrency_must_be_positive(self) -> None:
+        with self.assertRaises(SystemExit):
+            self.parser.parse_args(["resume", "3", "--concurrency", "0"])
+
 
 if __name__ == "__main__":
     unittest.main()
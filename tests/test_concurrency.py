@@ -0,0 +1,66 @@
+import threading
+import time
+
+import pytest
+
+from fakedin.concurrency import run_concurrently
+
+
+def test_run_concurrently_preserves_input_order() -> None:
+    def _slow_square(value: int) -> int:
+        # Later items finish first.
+        time.sleep(0.01 * (5 - value))
+        return value * value
+
+    results = run_concurrently(_slow_square, [1, 2, 3, 4], concurrency=4)
+
+    assert results == [1, 4, 9, 16]
+
+
+def test_run_concurrently_reports_progress_on_calling_thread() -> None:
+    caller = threading.get_ident()
+    reports = []
+
+    def _record(completed: int, result: int) -> None:
+        reports.append((completed, result, threading.get_ident()))
+
+    run_concurrently(
+        lambda v: v, [1, 2, 3], concurrency=2, on_complete=_record
+    )
+
+    assert sorted(completed for completed, _, _ in reports) == [1, 2, 3]
+    assert {thread for _, _, thread in reports} == {caller}
+
+
+def test_run_concurrently_bounds_in_flight_tasks() -> None:
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+
+    def _task(_value: int) -> None:
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.01)
+        with lock:
+            in_flight -= 1
+
+    run_concurrently(_task, list(range(10)), concurrency=3)
+
+    assert 1 < peak <= 3
+
+
+def test_run_concurrently_propagates_errors() -> None:
+    def _fail(value: int) -> int:
+        if value == 2:
+            raise RuntimeError("boom")
+        return value
+
+    with pytest.raises(RuntimeError, match="boom"):
+        run_concurrently(_fail, [1, 2, 3], concurrency=2)
+
+
+def test_run_concurrently_rejects_invalid_concurrency() -> None:
+    with pytest.raises(ValueError):
+        run_concurrently(lambda v: v, [1], concurrency=0)
@@ -0,0 +1,129 @@
+import threading
+from pathlib import Path
+
+from fakedin.corpus import CorpusGenerator
+
+
+def _fake_generate(job_openings: list[str]):
+    def _generate(prompt_name: str, variables: dict) -> str:
+        if prompt_name == "job_opening":
+            job_openings.append(variables["company_name"])
+            return f"Job at {variables['company_name']}"
+        return f"Resume of {variables['full_name']}"
+
+    return _generate
+
+
+def test_generate_writes_jobs_and_tailored_resumes(tmp_path: Path) -> None:
+    generator = CorpusGenerator()
+    job_openings: list[str] = []
+    prompts: list[dict] = []
+    generate = _fake_generate(job_openings)
+
+    def _recording_generate(prompt_name: str, variables: dict) -> str:
+        if prompt_name == "resume_for_job":
+            prompts.append(variables)
+        return generate(prompt_name, variables)
+
+    generator.llm_client.generate_from_promptdown = _recording_generate
+
+    result = generator.generate(
+        job_count=3,
+        resumes_per_job=2,
+        output_dir=tmp_path,
+        job_concurrency=2,
+        resume_concurrency=3,
+        seed=7,
+    )
+
+    assert len(result.job_paths) == 3
+    assert len(result.resume_paths) == 6
+    assert result.failed_jobs == result.failed_resumes == 0
+    assert {path.parent for path in result.job_paths} == {tmp_path / "jobs"}
+    assert {path.parent for path in result.resume_paths} == {
+        tmp_path / "resumes"
+    }
+    # Each résumé is prompted with its job's text, without rereading it
+    for company in job_openings:
+        matching = [
+            variables
+            for variables in prompts
+            if f"Job at {company}" in variables["job_description"]
+        ]
+        assert len(matching) == 2
+
+
+def test_resumes_start_before_all_jobs_are_generated(tmp_path: Path) -> None:
+    generator = CorpusGenerator()
+    resume_started = threading.Event()
+    overlapped: list[bool] = []
+    job_openings: list[str] = []
+    generate = _fake_generate(job_openings)
+
+    def _generate(prompt_name: str, variables: dict) -> str:
+        if prompt_name == "job_opening" and job_openings:
+            # The second job waits for the first job's résumés to start
+            overlapped.append(resume_started.wait(timeout=5))
+        elif prompt_name == "resume_for_job":
+            resume_started.set()
+        return generate(prompt_name, variables)
+
+    generator.llm_client.generate_from_promptdown = _generate
+
+    result = generator.generate(
+        job_count=2, resumes_per_job=1, output_dir=tmp_path
+    )
+
+    assert overlapped == [True]
+    assert len(result.resume_paths) == 2
+
+
+def test_failed_jobs_get_no_resumes(tmp_path: Path) -> None:
+    generator = CorpusGenerator()
+    job_openings: list[str] = []
+    generate = _fake_generate(job_openings)
+
+    def _generate(prompt_name: str, variables: dict) -> str:
+        if prompt_name == "job_opening" and not job_openings:
+            job_openings.append("failed")
+            raise RuntimeError("model unavailable")
+        return generate(prompt_name, variables)
+
+    generator.llm_client.generate_from_promptdown = _generate
+
+    result = generator.generate(
+        job_count=2, resumes_per_job=3, output_dir=tmp_path
+    )
+
+    assert result.failed_jobs == 1
+    assert len(result.job_paths) == 1
+    assert len(result.resume_paths) == 3
+
+
+def test_jobs_and_people_get_independent_seeds(tmp_path: Path) -> None:
+    generator = CorpusGenerator()
+    generator.llm_client.generate_from_promptdown = _fake_generate([])
+    job_seeds: list[int] = []
+    person_seeds: list[int] = []
+    job_data = generator.job_generator.job_generator
+    person_data = generator.resume_generator.person_generator
+    reseed_job, reseed_person = job_data.reseed, person_data.reseed
+
+    def _reseed_job(seed: int) -> None:
+        job_seeds.append(seed)
+        reseed_job(seed)
+
+    def _reseed_person(seed: int) -> None:
+        person_seeds.append(seed)
+        reseed_person(seed)
+
+    job_data.reseed = _reseed_job
+    person_data.reseed = _reseed_person
+
+    generator.generate(
+        job_count=2, resumes_per_job=2, output_dir=tmp_path, seed=7
+    )
+
+    assert len(set(job_seeds)) == 2
+    assert len(set(person_seeds)) == 4
+    assert not set(job_seeds) & set(person_seeds)
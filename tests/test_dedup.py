@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+from fakedin.dedup import NearDuplicateIndex, minhash_signature
+
+WORDS = [f"word{n}" for n in range(2000)]
+
+
+def _document(rng: random.Random, length: int = 400) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(length))
+
+
+def _edit(rng: random.Random, text: str, edits: int) -> str:
+    words = text.split()
+    for position in rng.sample(range(len(words)), edits):
+        words[position] = "changed"
+    return " ".join(words)
+
+
+def test_signature_ignores_case_punctuation_and_layout() -> None:
+    first = minhash_signature(
+        "## Senior Engineer\n\n- Built **data** pipelines."
+    )
+    second = minhash_signature("senior engineer built data pipelines")
+
+    assert first == second
+    assert len(first) == 128
+
+
+def test_index_flags_near_duplicates_only() -> None:
+    rng = random.Random(3)
+    index = NearDuplicateIndex(threshold=0.7)
+    originals = [_document(rng) for _ in range(50)]
+    for number, text in enumerate(originals):
+        assert index.add(f"doc {number}", text) is None
+
+    match = index.add("copy", _edit(rng, originals[7], 10))
+    unrelated = index.add("other", _document(rng))
+    rewritten = index.add("rewrite", _edit(rng, originals[8], 200))
+
+    assert match is not None
+    assert match.similar_to == "doc 7"
+    assert match.similarity >= 0.7
+    assert unrelated is None
+    assert rewritten is None
+    assert index.flagged == [match]
+    assert len(index) == 53
+
+
+def test_rejected_duplicates_are_left_out() -> None:
+    rng = random.Random(5)
+    index = NearDuplicateIndex()
+    text = _document(rng)
+    index.add("original", text)
+
+    match = index.add("copy", text, keep_duplicate=False)
+
+    assert match is not None
+    assert match.similarity == 1.0
+    assert len(index) == 1
+    assert index.flagged == []
+
+
+def test_index_rejects_invalid_settings() -> None:
+    with pytest.raises(ValueError):
+        NearDuplicateIndex(threshold=0)
+    with pytest.raises(ValueError):
+        NearDuplicateIndex(num_perm=100)
@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from fakedin.fake_openai import (
+    FakeOpenAIServer,
+    FakeServerConfig,
+    fake_markdown,
+)
+from fakedin.llm_client import LLMClient
+from fakedin.rate_limit import RetryPolicy
+
+
+def test_fake_markdown_is_roughly_the_requested_size() -> None:
+    text = fake_markdown(random.Random(0), 2000)
+
+    assert text.startswith("# ")
+    assert "## Section 1" in text
+    assert 2000 <= len(text) < 3000
+
+
+def test_llm_client_round_trip_against_fake_server() -> None:
+    config = FakeServerConfig(latency=0.0, response_size=500, seed=1)
+    with FakeOpenAIServer(config) as server:
+        client = LLMClient(api_key="bench", base_url=server.base_url)
+        text = client.generate_with_messages(
+            [{"role": "user", "content": "Write a resume."}]
+        )
+
+    assert text.startswith("# ")
+    [call] = client.metrics.calls
+    assert not call.failed
+    assert call.prompt_tokens > 0
+    assert call.completion_tokens == len(text) // 4
+
+
+def test_fake_server_errors_are_retried_and_reported() -> None:
+    config = FakeServerConfig(latency=0.0, error_rate=1.0)
+    with FakeOpenAIServer(config) as server:
+        client = LLMClient(
+            api_key="bench",
+            base_url=server.base_url,
+            retry_policy=RetryPolicy(max_retries=1, base_delay=0.0),
+        )
+        with pytest.raises(RuntimeError, match="Simulated server error"):
+            client.generate_with_messages(
+                [{"role": "user", "content": "Write a resume."}]
+            )
+
+    [call] = client.metrics.calls
+    assert call.failed
+    assert call.retries == 1
+
+
+def test_base_url_needs_a_running_server() -> None:
+    with pytest.raises(RuntimeError, match="isn't running"):
+        FakeOpenAIServer().base_url
@@ -0,0 +1,71 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+# Slow to import, and only needed once something is generated or rendered
+HEAVY_MODULES = ("openai", "httpx", "fpdf", "faker", "promptdown", "pydantic")
+
+
+def _run_python(code: str, *options: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=str(SRC_DIR))
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+
+def _loaded_heavy_modules(code: str) -> list[str]:
+    result = _run_python(
+        code
+        + "\nimport json, sys\n"
+        + f"heavy = {HEAVY_MODULES!r}\n"
+        + "print(json.dumps(sorted(name for name in heavy "
+        + "if name in sys.modules)))"
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def test_cli_help_and_parse_errors_import_no_heavy_modules() -> None:
+    code = """
+from fakedin.cli import main
+for argv in (["--help"], ["resume", "--help"], ["resume"]):
+    try:
+        main(argv)
+    except SystemExit:
+        pass
+"""
+    assert _loaded_heavy_modules(code) == []
+
+
+def test_generators_import_openai_and_fpdf_only_when_used() -> None:
+    code = """
+from fakedin.llm_client import LLMClient
+from fakedin.resume_for_job_generator import ResumeForJobGenerator
+from fakedin.resume_generator import ResumeGenerator
+from fakedin.job_generator import JobOpeningGenerator
+LLMClient(api_key="test-key")
+"""
+    loaded = _loaded_heavy_modules(code)
+
+    assert "openai" not in loaded
+    assert "httpx" not in loaded
+    assert "fpdf" not in loaded
+
+
+def test_cli_import_is_fast() -> None:
+    result = _run_python("import fakedin.cli", "-X", "importtime")
+
+    [line] = [
+        line
+        for line in result.stderr.splitlines()
+        if line.rstrip().endswith("| fakedin.cli")
+    ]
+    cumulative_microseconds = int(line.split("|")[1])
+    assert cumulative_microseconds < 100_000
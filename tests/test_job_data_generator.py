@@ -20,3 +20,44 @@ def test_generate_company_name_non_empty() -> None:
     name = generator._generate_company_name()
     assert isinstance(name, str)
     assert name.strip()
+
+
+def test_seeded_generators_are_reproducible() -> None:
+    first = JobGenerator(seed=7).generate_job()
+    second = JobGenerator(seed=7).generate_job()
+
+    assert first == second
+
+
+def test_generate_jobs_is_columnar_and_consistent() -> None:
+    generator = JobGenerator(seed=3)
+    jobs = generator.generate_jobs(500)
+
+    assert set(jobs) == set(generator.generate_job())
+    assert all(len(column) == 500 for column in jobs.values())
+
+    for i in range(500):
+        level = jobs["experience_level"][i]
+        (min_low, min_high), (spread_low, spread_high) = (
+            JobGenerator.SALARY_BANDS[level]
+        )
+        assert min_low <= jobs["min_salary"][i] <= min_high
+        spread = jobs["max_salary"][i] - jobs["min_salary"][i]
+        assert spread_low <= spread <= spread_high
+        assert jobs["salary_range"][i] == (
+            f"${jobs['min_salary'][i]:,} - ${jobs['max_salary'][i]:,}"
+        )
+        assert jobs["work_model"][i] in generator.work_models
+        assert jobs["company_name"][i].strip()
+
+
+def test_local_backend_generates_jobs() -> None:
+    generator = JobGenerator(seed=5, backend="local")
+    jobs = generator.generate_jobs(50)
+
+    assert generator.faker is None
+    assert all(jobs["company_name"])
+    assert set(jobs["career_field"]) <= set(generator.pools.job_titles)
+    assert JobGenerator(seed=5, backend="local").generate_job() == (
+        JobGenerator(seed=5, backend="local").generate_job()
+    )
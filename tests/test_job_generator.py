@@ -1,6 +1,9 @@
+import json
 from pathlib import Path
 
 from fakedin.job_generator import JobOpeningGenerator
+from fakedin.models import JobOpening
+from fakedin.sinks import JsonlSink
 
 
 def test_generate_writes_job_description(tmp_path: Path) -> None:
@@ -26,3 +29,77 @@ def test_generate_writes_job_description(tmp_path: Path) -> None:
     assert output_path.name == "acme_co_software_engineer_job.md"
     assert output_path.exists()
     assert output_path.read_text(encoding="utf-8") == "job"
+
+
+def test_generate_keeps_slashes_out_of_file_names(tmp_path: Path) -> None:
+    generator = JobOpeningGenerator()
+    generator.llm_client.generate_from_promptdown = lambda *_args: "job"
+
+    output_path = generator.generate_for_job(
+        {
+            "company_name": "Acme Co.",
+            "career_field": "Industrial/Product Designer",
+        },
+        output_dir=tmp_path,
+    )
+
+    assert output_path.parent == tmp_path
+    assert output_path.name == "acme_co_industrial_product_designer_job.md"
+
+
+def test_generate_json_saves_structured_job_opening(tmp_path: Path) -> None:
+    generator = JobOpeningGenerator()
+    job_opening = JobOpening(
+        title="Software Engineer",
+        company_name="Acme Co.",
+        location="Austin, TX",
+        work_model="Remote",
+        salary_range="$80,000 - $100,000",
+        company_overview="We make things.",
+        summary="Build things.",
+        responsibilities=["Write code"],
+        required_qualifications=["Python"],
+        preferred_qualifications=[],
+        benefits=["Health insurance"],
+        application_process="Apply online.",
+    )
+    generator.llm_client.generate_structured_from_promptdown = (
+        lambda *_args: job_opening
+    )
+
+    output_path = generator.generate_for_job(
+        {"company_name": "Acme Co.", "career_field": "Software Engineer"},
+        output_dir=tmp_path,
+        output_format="json",
+    )
+
+    assert output_path.name == "acme_co_software_engineer_job.json"
+    saved = JobOpening.model_validate_json(output_path.read_text())
+    assert saved == job_opening
+
+
+def test_generate_multiple_into_jsonl_sink(tmp_path: Path) -> None:
+    sink = JsonlSink(tmp_path, "jobs", run_id="a1")
+    generator = JobOpeningGenerator(sink=sink)
+    companies = iter(["Acme", "Globex"])
+    generator.job_generator.generate_job = lambda: {
+        "company_name": next(companies),
+        "career_field": "Engineer",
+    }
+    generator.llm_client.generate_from_promptdown = (
+        lambda _prompt_file, job: f"job at {job['company_name']}"
+    )
+
+    paths = generator.generate_multiple(2, output_dir=tmp_path)
+    sink.close()
+
+    assert paths == [tmp_path / "jobs-a1-00000.jsonl"] * 2
+    records = [
+        json.loads(line) for line in paths[0].read_text().splitlines()
+    ]
+    assert [record["name"] for record in records] == [
+        "acme_engineer_job",
+        "globex_engineer_job",
+    ]
+    assert records[1]["text"] == "job at Globex"
+    assert list(tmp_path.glob("*.md")) == []
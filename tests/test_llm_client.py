@@ -1,16 +1,25 @@
+import asyncio
+import json
+import os
 from types import SimpleNamespace
 
+import httpx
+import openai
 import pytest
+from pydantic import BaseModel
 
 from fakedin import llm_client as llm_module
 from fakedin.llm_client import LLMClient
+from fakedin.rate_limit import RetryPolicy
+from fakedin.response_cache import ResponseCache
 
 
 class _DummyResponse:
-    def __init__(self, content: str) -> None:
+    def __init__(self, content: str, usage=None) -> None:
         self.choices = [
             SimpleNamespace(message=SimpleNamespace(content=content))
         ]
+        self.usage = usage
 
 
 class _DummyCompletions:
@@ -23,11 +32,26 @@ class _DummyCompletions:
         return _DummyResponse(self._content)
 
 
+class _DummyAsyncCompletions(_DummyCompletions):
+    async def create(self, model: str, messages: list[dict[str, str]]):
+        return super().create(model, messages)
+
+
 class _DummyChat:
     def __init__(self, content: str) -> None:
         self.completions = _DummyCompletions(content)
 
 
+class _DummyAsyncChat:
+    def __init__(self, content: str) -> None:
+        self.completions = _DummyAsyncCompletions(content)
+
+
+class _DummyAsyncClient:
+    def __init__(self, content: str) -> None:
+        self.chat = _DummyAsyncChat(content)
+
+
 class _DummyClient:
     def __init__(self, content: str) -> None:
         self.chat = _DummyChat(content)
@@ -41,7 +65,7 @@ def test_generate_with_messages_returns_content(
     def _fake_openai(*_args, **_kwargs) -> _DummyClient:
         return dummy
 
-    monkeypatch.setattr(llm_module.openai, "OpenAI", _fake_openai)
+    monkeypatch.setattr(openai, "OpenAI", _fake_openai)
     monkeypatch.setattr(llm_module.settings, "openai_api_key", "test-key")
 
     client = LLMClient(model="test-model")
@@ -62,10 +86,386 @@ def test_generate_from_promptdown_missing_file(
     def _fake_openai(*_args, **_kwargs) -> _DummyClient:
         return _DummyClient("")
 
-    monkeypatch.setattr(llm_module.openai, "OpenAI", _fake_openai)
+    monkeypatch.setattr(openai, "OpenAI", _fake_openai)
     monkeypatch.setattr(llm_module.settings, "openai_api_key", "test-key")
 
     client = LLMClient(model="test-model")
 
     with pytest.raises(FileNotFoundError):
         client.generate_from_promptdown("does_not_exist", {})
+
+
+def test_clients_share_one_openai_client(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    created = []
+
+    def _fake_openai(*_args, **_kwargs) -> _DummyClient:
+        created.append(_DummyClient(""))
+        return created[-1]
+
+    monkeypatch.setattr(openai, "OpenAI", _fake_openai)
+
+    first = LLMClient(model="test-model")
+    second = LLMClient(model="other-model")
+
+    # Created on first use, not with each LLMClient
+    assert not created
+    assert first.client is second.client
+    assert len(created) == 1
+
+
+def test_agenerate_with_messages_returns_content(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    created = []
+
+    def _fake_async_openai(*_args, **_kwargs) -> _DummyAsyncClient:
+        created.append(_DummyAsyncClient("hello async"))
+        return created[-1]
+
+    monkeypatch.setattr(openai, "AsyncOpenAI", _fake_async_openai)
+
+    client = LLMClient(model="test-model")
+
+    async def _fan_out() -> list[str]:
+        return await asyncio.gather(
+            *(
+                client.agenerate_with_messages(
+                    [{"role": "user", "content": f"hi {i}"}]
+                )
+                for i in range(5)
+            )
+        )
+
+    results = asyncio.run(_fan_out())
+
+    assert results == ["hello async"] * 5
+    assert len(created) == 1
+    assert len(created[0].chat.completions.calls) == 5
+
+
+def test_async_clients_are_not_shared_across_event_loops(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    created = []
+
+    def _fake_async_openai(*_args, **_kwargs) -> _DummyAsyncClient:
+        created.append(_DummyAsyncClient("hello"))
+        return created[-1]
+
+    monkeypatch.setattr(openai, "AsyncOpenAI", _fake_async_openai)
+
+    client = LLMClient(model="test-model")
+    messages = [{"role": "user", "content": "hi"}]
+
+    asyncio.run(client.agenerate_with_messages(messages))
+    asyncio.run(client.agenerate_with_messages(messages))
+
+    assert len(created) == 2
+
+
+def test_generate_with_messages_uses_response_cache(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path,
+) -> None:
+    dummy = _DummyClient("hello")
+
+    def _fake_openai(*_args, **_kwargs) -> _DummyClient:
+        return dummy
+
+    monkeypatch.setattr(openai, "OpenAI", _fake_openai)
+
+    cache = ResponseCache(tmp_path, max_size_bytes=1024)
+    client = LLMClient(model="test-model", cache=cache)
+    messages = [{"role": "user", "content": "hi"}]
+
+    assert client.generate_with_messages(messages) == "hello"
+    assert client.generate_with_messages(messages) == "hello"
+    assert len(dummy.chat.completions.calls) == 1
+
+    other_model = LLMClient(model="other-model", cache=cache)
+    other_model.generate_with_messages(messages)
+    assert len(dummy.chat.completions.calls) == 2
+
+
+class _FlakyCompletions(_DummyCompletions):
+    def __init__(self, content: str, failures: int) -> None:
+        super().__init__(content)
+        self._failures = failures
+
+    def create(self, model: str, messages: list[dict[str, str]]):
+        if self._failures:
+            self._failures -= 1
+            request = httpx.Request("POST", "https://api.openai.com/v1/chat")
+            response = httpx.Response(
+                429, headers={"retry-after": "0"}, request=request
+            )
+            raise openai.RateLimitError(
+                "slow down", response=response, body=None
+            )
+        return super().create(model, messages)
+
+
+def test_generate_with_messages_retries_rate_limits(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    dummy = _DummyClient("hello")
+    dummy.chat.completions = _FlakyCompletions("hello", failures=2)
+
+    monkeypatch.setattr(openai, "OpenAI", lambda **_: dummy)
+
+    client = LLMClient(
+        model="test-model",
+        retry_policy=RetryPolicy(max_retries=2),
+    )
+
+    assert client.generate_with_messages([{"role": "user", "content": "hi"}])
+    assert len(dummy.chat.completions.calls) == 1
+    [call] = client.metrics.calls
+    assert call.retries == 2
+    assert not call.failed
+
+
+def test_generate_with_messages_gives_up_after_max_retries(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    dummy = _DummyClient("hello")
+    dummy.chat.completions = _FlakyCompletions("hello", failures=3)
+
+    monkeypatch.setattr(openai, "OpenAI", lambda **_: dummy)
+
+    client = LLMClient(
+        model="test-model",
+        retry_policy=RetryPolicy(max_retries=2),
+    )
+
+    with pytest.raises(RuntimeError, match="slow down"):
+        client.generate_with_messages([{"role": "user", "content": "hi"}])
+    [call] = client.metrics.calls
+    assert call.failed
+    assert call.retries == 2
+
+
+class _AsyncFlakyCompletions(_FlakyCompletions):
+    async def create(
+        self, model: str, messages: list[dict[str, str]], **kwargs
+    ):
+        response = super().create(model, messages)
+        self.calls[-1].update(kwargs)
+        return response
+
+
+def test_agenerate_with_messages_behaves_like_generate_with_messages(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path,
+) -> None:
+    completions = _AsyncFlakyCompletions('{"text": "hello"}', failures=1)
+    dummy = _DummyAsyncClient("")
+    dummy.chat.completions = completions
+    monkeypatch.setattr(openai, "AsyncOpenAI", lambda **_kwargs: dummy)
+
+    cache = ResponseCache(tmp_path, max_size_bytes=1024)
+    client = LLMClient(
+        model="test-model",
+        cache=cache,
+        retry_policy=RetryPolicy(max_retries=1),
+    )
+    messages = [{"role": "user", "content": "hi"}]
+    response_format = {"type": "json_object"}
+    validated: list[str] = []
+
+    content = asyncio.run(
+        client.agenerate_with_messages(
+            messages, response_format, validated.append
+        )
+    )
+
+    assert content == '{"text": "hello"}'
+    assert validated == [content]
+    assert completions.calls[0]["response_format"] == response_format
+    [call] = client.metrics.calls
+    assert call.retries == 1
+    # Cached under the same key the synchronous API uses
+    assert client.generate_with_messages(messages, response_format) == content
+    assert len(completions.calls) == 1
+
+
+class _DummyStream:
+    def __init__(self, chunks: list[str]) -> None:
+        self._chunks = [
+            SimpleNamespace(
+                choices=[SimpleNamespace(delta=SimpleNamespace(content=text))],
+                usage=None,
+            )
+            for text in chunks
+        ]
+        # Final chunk: usage only, no choices
+        self._chunks.append(
+            SimpleNamespace(
+                choices=[],
+                usage=SimpleNamespace(
+                    prompt_tokens=5, completion_tokens=2, total_tokens=7
+                ),
+            )
+        )
+        self.closed = False
+
+    def __iter__(self):
+        return iter(self._chunks)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class _StreamingCompletions(_DummyCompletions):
+    def __init__(self, chunks: list[str]) -> None:
+        super().__init__("".join(chunks))
+        self._chunks = chunks
+        self.streams: list[_DummyStream] = []
+
+    def create(self, model: str, messages: list[dict[str, str]], **kwargs):
+        self.calls.append({"model": model, "messages": messages, **kwargs})
+        stream = _DummyStream(self._chunks)
+        self.streams.append(stream)
+        return stream
+
+
+def test_stream_with_messages_yields_chunks_and_caches(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path,
+) -> None:
+    dummy = _DummyClient("")
+    dummy.chat.completions = _StreamingCompletions(["# Jane", "\n", "Doe"])
+
+    monkeypatch.setattr(openai, "OpenAI", lambda **_: dummy)
+
+    cache = ResponseCache(tmp_path, max_size_bytes=1024)
+    client = LLMClient(model="test-model", cache=cache)
+    messages = [{"role": "user", "content": "hi"}]
+
+    assert list(client.stream_with_messages(messages)) == [
+        "# Jane",
+        "\n",
+        "Doe",
+    ]
+    assert dummy.chat.completions.calls[0]["stream"] is True
+    assert dummy.chat.completions.streams[0].closed
+
+    # The joined text was cached and is replayed as a single chunk
+    assert list(client.stream_with_messages(messages)) == ["# Jane\nDoe"]
+    assert client.generate_with_messages(messages) == "# Jane\nDoe"
+    assert len(dummy.chat.completions.calls) == 1
+
+
+class _Greeting(BaseModel):
+    text: str
+
+
+class _StructuredCompletions(_DummyCompletions):
+    def create(self, model: str, messages: list[dict[str, str]], **kwargs):
+        self.calls.append({"model": model, "messages": messages, **kwargs})
+        return _DummyResponse(self._content)
+
+
+def test_generate_structured_validates_response(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    dummy = _DummyClient("")
+    dummy.chat.completions = _StructuredCompletions('{"text": "hello"}')
+    monkeypatch.setattr(openai, "OpenAI", lambda **_kwargs: dummy)
+
+    client = LLMClient(model="test-model")
+    messages = [{"role": "user", "content": "hi"}]
+
+    assert client.generate_structured(messages, _Greeting) == _Greeting(
+        text="hello"
+    )
+    response_format = dummy.chat.completions.calls[0]["response_format"]
+    assert response_format["json_schema"]["name"] == "_Greeting"
+
+    dummy.chat.completions._content = '{"greeting": "hello"}'
+    with pytest.raises(RuntimeError, match="_Greeting"):
+        client.generate_structured(messages, _Greeting)
+
+
+def test_invalid_structured_responses_are_not_cached(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path,
+) -> None:
+    dummy = _DummyClient("")
+    dummy.chat.completions = _StructuredCompletions('{"text": "hel')
+    monkeypatch.setattr(openai, "OpenAI", lambda **_kwargs: dummy)
+
+    cache = ResponseCache(tmp_path, max_size_bytes=1024)
+    client = LLMClient(model="test-model", cache=cache)
+    messages = [{"role": "user", "content": "hi"}]
+
+    with pytest.raises(RuntimeError, match="_Greeting"):
+        client.generate_structured(messages, _Greeting)
+    assert len(cache) == 0
+
+    dummy.chat.completions._content = '{"text": "hello"}'
+    assert client.generate_structured(messages, _Greeting) == _Greeting(
+        text="hello"
+    )
+    # Now cached, so answered without another request
+    assert client.generate_structured(messages, _Greeting) == _Greeting(
+        text="hello"
+    )
+    assert len(dummy.chat.completions.calls) == 2
+
+
+def test_usage_counts_cached_prompt_tokens(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    dummy = _DummyClient("")
+    usage = SimpleNamespace(
+        prompt_tokens=2000,
+        completion_tokens=500,
+        total_tokens=2500,
+        prompt_tokens_details=SimpleNamespace(cached_tokens=1536),
+    )
+    dummy.chat.completions.create = lambda **_kwargs: _DummyResponse(
+        "hello", usage
+    )
+    monkeypatch.setattr(openai, "OpenAI", lambda **_kwargs: dummy)
+
+    client = LLMClient(model="test-model")
+    client.generate_with_messages([{"role": "user", "content": "a"}])
+    client.generate_with_messages([{"role": "user", "content": "b"}])
+
+    summary = client.metrics.summarize()
+    assert summary.requests == 2
+    assert summary.prompt_tokens == 4000
+    assert summary.cached_prompt_tokens == 3072
+    assert summary.completion_tokens == 1000
+    assert summary.cached_fraction == 0.768
+
+
+def test_person_details_follow_static_prompt_prefix() -> None:
+    client = LLMClient(model="test-model")
+    people = [
+        {
+            "full_name": name,
+            "age": age,
+            "email": f"{name.lower()}@example.com",
+            "phone_number": "555-0100",
+            "city": "Austin",
+            "state": "TX",
+            "location": "Austin, TX",
+            "career_field": field,
+            "experience_level": "Senior",
+            "experience_years": 12,
+        }
+        for name, age, field in [("Ann", 30, "Nurse"), ("Bob", 51, "Chef")]
+    ]
+
+    first, second = (
+        json.dumps(client.build_messages("resume", person))
+        for person in people
+    )
+    prefix_length = len(os.path.commonprefix([first, second]))
+
+    # Everything up to the person's details is byte-identical
+    assert first[:prefix_length].endswith("Full Name: ")
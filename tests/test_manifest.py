@@ -0,0 +1,47 @@
+from pathlib import Path
+
+from fakedin.manifest import COMPLETED, PENDING, ManifestRecord, RunManifest
+
+
+def test_load_returns_latest_record_per_index(tmp_path: Path) -> None:
+    manifest = RunManifest(tmp_path)
+    manifest.reset()
+
+    manifest.append(ManifestRecord(index=0, status=PENDING, item={"n": 0}))
+    manifest.append(ManifestRecord(index=1, status=PENDING, item={"n": 1}))
+    manifest.append(
+        ManifestRecord(
+            index=0,
+            status=COMPLETED,
+            item={"n": 0},
+            output_path="out.md",
+        )
+    )
+
+    records = manifest.load()
+
+    assert records[0].status == COMPLETED
+    assert records[0].output_path == "out.md"
+    assert records[1].status == PENDING
+    assert records[1].item == {"n": 1}
+
+
+def test_load_ignores_truncated_lines(tmp_path: Path) -> None:
+    manifest = RunManifest(tmp_path)
+    manifest.reset()
+    manifest.append(ManifestRecord(index=0, status=PENDING, item={}))
+
+    with open(manifest.path, "a", encoding="utf-8") as f:
+        f.write('{"index": 1, "status": "comp')
+
+    assert list(manifest.load()) == [0]
+
+
+def test_reset_discards_previous_run(tmp_path: Path) -> None:
+    manifest = RunManifest(tmp_path)
+    manifest.reset()
+    manifest.append(ManifestRecord(index=0, status=PENDING, item={}))
+
+    manifest.reset()
+
+    assert manifest.load() == {}
@@ -0,0 +1,94 @@
+from pathlib import Path
+
+import pytest
+
+from fakedin.file_utils import atomic_write_text
+from fakedin.manifest import COMPLETED, RunManifest
+from fakedin.merge import merge_runs
+from fakedin.pipeline import generate_items
+from fakedin.seeding import derive_seed
+from fakedin.sharding import Shard
+
+
+def _run_shard(
+    run_dir: Path, shard: Shard, count: int = 5, fail: frozenset = frozenset()
+) -> None:
+    produced: list[int] = []
+
+    def _produce(item: dict) -> Path:
+        if item["n"] in fail:
+            raise RuntimeError(f"failed {item['n']}")
+        # Every shard names its outputs item_0.md, item_1.md and so on
+        output_path = run_dir / f"item_{len(produced)}.md"
+        produced.append(item["n"])
+        atomic_write_text(output_path, str(item["n"]))
+        return output_path
+
+    generate_items(
+        count,
+        draw_item=lambda seed: {"n": seed},
+        produce=_produce,
+        label="item",
+        manifest=RunManifest(run_dir),
+        seed=7,
+        shard=shard,
+    )
+
+
+def _seeded_n(index: int) -> int:
+    return derive_seed(7, index)
+
+
+def test_merge_copies_every_shard_into_one_run(tmp_path: Path) -> None:
+    for index in range(2):
+        _run_shard(tmp_path / f"shard{index}", Shard(index, 2))
+
+    result = merge_runs(
+        [tmp_path / "shard0", tmp_path / "shard1"], tmp_path / "merged"
+    )
+
+    assert result.completed == 5
+    assert result.missing == []
+    records = RunManifest(tmp_path / "merged").load()
+    assert sorted(records) == list(range(5))
+    outputs = {
+        index: Path(record.output_path).read_text(encoding="utf-8")
+        for index, record in records.items()
+    }
+    # Same-named outputs of different shards are both kept
+    assert outputs == {index: str(_seeded_n(index)) for index in range(5)}
+    assert len({record.output_path for record in records.values()}) == 5
+    assert RunManifest(tmp_path / "merged").load_info()["shard"] is None
+
+
+def test_merge_rejects_missing_and_repeated_shards(tmp_path: Path) -> None:
+    _run_shard(tmp_path / "a", Shard(0, 2))
+    _run_shard(tmp_path / "b", Shard(0, 2))
+
+    with pytest.raises(ValueError, match="both shard 0/2"):
+        merge_runs([tmp_path / "a", tmp_path / "b"], tmp_path / "merged")
+    with pytest.raises(ValueError, match="shard 1/2"):
+        merge_runs([tmp_path / "a"], tmp_path / "merged")
+
+
+def test_merge_rejects_shards_of_different_runs(tmp_path: Path) -> None:
+    _run_shard(tmp_path / "a", Shard(0, 2), count=5)
+    _run_shard(tmp_path / "b", Shard(1, 2), count=6)
+
+    with pytest.raises(ValueError, match="count"):
+        merge_runs([tmp_path / "a", tmp_path / "b"], tmp_path / "merged")
+
+
+def test_merge_incomplete_shards_when_allowed(tmp_path: Path) -> None:
+    _run_shard(tmp_path / "a", Shard(0, 2))
+    _run_shard(tmp_path / "b", Shard(1, 2), fail=frozenset({_seeded_n(3)}))
+    run_dirs = [tmp_path / "a", tmp_path / "b"]
+
+    with pytest.raises(ValueError, match="1 of 5 items"):
+        merge_runs(run_dirs, tmp_path / "merged")
+    result = merge_runs(run_dirs, tmp_path / "merged", allow_incomplete=True)
+
+    assert result.missing == [3]
+    records = RunManifest(tmp_path / "merged").load()
+    assert records[3].status != COMPLETED
+    assert len(records) == 5
@@ -0,0 +1,82 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from fakedin.metrics import (
+    CallMetrics,
+    MetricsCollector,
+    TokenPrices,
+    percentile,
+)
+
+
+def _call(started: float, latency: float, **kwargs) -> CallMetrics:
+    return CallMetrics(
+        model="test-model", started=started, latency=latency, **kwargs
+    )
+
+
+def test_percentile_interpolates() -> None:
+    values = [1.0, 2.0, 3.0, 4.0, 5.0]
+
+    assert percentile(values, 50) == 3.0
+    assert percentile(values, 95) == pytest.approx(4.8)
+    assert percentile(values, 100) == 5.0
+    assert percentile([], 50) == 0.0
+
+
+def test_summarize_aggregates_calls() -> None:
+    metrics = MetricsCollector(
+        TokenPrices(input=2.0, output=8.0, cached_input=0.5)
+    )
+    metrics.record(
+        _call(
+            100.0,
+            2.0,
+            prompt_tokens=1000,
+            cached_prompt_tokens=800,
+            completion_tokens=300,
+            retries=1,
+        )
+    )
+    metrics.record(
+        _call(101.0, 4.0, prompt_tokens=1000, completion_tokens=500)
+    )
+    metrics.record(_call(101.5, 0.5, retries=3, failed=True))
+
+    summary = metrics.summarize()
+
+    assert summary.requests == 3
+    assert summary.failed_requests == 1
+    assert summary.retries == 4
+    assert summary.latency_p50 == 3.0
+    assert summary.wall_time == 5.0
+    assert summary.completion_tokens_per_second == 160.0
+    # 1,200 uncached and 800 cached prompt tokens, 800 completion tokens
+    assert summary.cost_estimate == pytest.approx(0.0092)
+    assert "p50 3.00s" in summary.format()
+    assert "Estimated cost: $0.0092" in summary.format()
+
+
+def test_summarize_without_prices_has_no_cost() -> None:
+    metrics = MetricsCollector()
+    metrics.record(_call(0.0, 1.0, completion_tokens=10))
+
+    summary = metrics.summarize()
+
+    assert summary.cost_estimate is None
+    assert "cost" not in summary.format()
+
+
+def test_write_json(tmp_path: Path) -> None:
+    metrics = MetricsCollector()
+    metrics.record(_call(0.0, 1.5, prompt_tokens=10, completion_tokens=5))
+    output_path = tmp_path / "metrics.json"
+
+    metrics.write_json(output_path)
+
+    report = json.loads(output_path.read_text())
+    assert report["summary"]["requests"] == 1
+    assert report["summary"]["latency_p99"] == 1.5
+    assert report["calls"][0]["completion_tokens"] == 5
@@ -0,0 +1,54 @@
+from fakedin.models import JobOpening, Resume, json_schema_format
+
+
+def _resume() -> Resume:
+    return Resume.model_validate(
+        {
+            "full_name": "Ann Able",
+            "email": "ann@example.com",
+            "phone_number": "555-0100",
+            "location": "Austin, TX",
+            "summary": "Engineer.",
+            "experience": [
+                {
+                    "title": "Developer",
+                    "company": "Acme",
+                    "location": "Austin, TX",
+                    "start_date": "2020",
+                    "end_date": "Present",
+                    "highlights": ["Shipped things"],
+                }
+            ],
+            "education": [],
+            "skills": ["Python"],
+            "certifications": [],
+        }
+    )
+
+
+def test_resume_to_markdown() -> None:
+    markdown = _resume().to_markdown()
+
+    assert markdown.startswith("# Ann Able\n\nann@example.com | 555-0100")
+    assert "### Developer - Acme" in markdown
+    assert "- Shipped things" in markdown
+    assert "- Python" in markdown
+    assert "Certifications" not in markdown
+
+
+def test_json_schema_format_is_strict() -> None:
+    response_format = json_schema_format(JobOpening)
+    schema = response_format["json_schema"]["schema"]
+
+    assert response_format["type"] == "json_schema"
+    assert response_format["json_schema"]["name"] == "JobOpening"
+    assert response_format["json_schema"]["strict"] is True
+    assert schema["additionalProperties"] is False
+    assert set(schema["required"]) == set(JobOpening.model_fields)
+
+
+def test_nested_models_forbid_extra_keys() -> None:
+    schema = Resume.model_json_schema()
+
+    for definition in schema["$defs"].values():
+        assert definition["additionalProperties"] is False
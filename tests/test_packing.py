@@ -0,0 +1,21 @@
+from fakedin.packing import pack_items, split_items
+
+
+def test_pack_items_numbers_blocks() -> None:
+    assert pack_items(["a", "b"], "Person") == (
+        "### Person 1\n\na\n\n### Person 2\n\nb"
+    )
+
+
+def test_split_items() -> None:
+    text = "=== ITEM 1 ===\n# A\n\nbody\n\n=== ITEM 2 ===\n# B\n"
+
+    assert split_items(text, 2) == ["# A\n\nbody", "# B"]
+
+
+def test_split_items_rejects_malformed_responses() -> None:
+    # Missing, out of order and empty items
+    assert split_items("=== ITEM 1 ===\n# A\n", 2) is None
+    assert split_items("=== ITEM 2 ===\nB\n=== ITEM 1 ===\nA", 2) is None
+    assert split_items("=== ITEM 1 ===\n\n=== ITEM 2 ===\nB", 2) is None
+    assert split_items("# A\n# B", 2) is None
@@ -0,0 +1,142 @@
+from pathlib import Path
+
+from fpdf import FPDF  # type: ignore
+
+from fakedin.cli import main
+from fakedin.pdf_rendering import (
+    PdfRenderer,
+    PdfRenderPool,
+    parse_inline_runs,
+    render_markdown_file,
+)
+
+RESUME = "# Ann Able\n\n## Experience\n\n- Built **things**\n- Led _teams_"
+
+
+def test_render_markdown_file_writes_pdf_next_to_source(
+    tmp_path: Path,
+) -> None:
+    markdown_path = tmp_path / "ann_able_resume.md"
+    markdown_path.write_text(RESUME, encoding="utf-8")
+
+    pdf_path = render_markdown_file(markdown_path)
+
+    assert pdf_path == tmp_path / "ann_able_resume.pdf"
+    assert pdf_path.read_bytes().startswith(b"%PDF")
+
+
+def test_render_pool_renders_content_and_files(tmp_path: Path) -> None:
+    sources = []
+    for name in ("a", "b", "c"):
+        path = tmp_path / f"{name}.md"
+        path.write_text(RESUME, encoding="utf-8")
+        sources.append(path)
+    output_dir = tmp_path / "pdf"
+
+    with PdfRenderPool(max_workers=2) as pool:
+        pool.render(RESUME, tmp_path / "direct.pdf")
+        rendered = {
+            source: future.result()
+            for source, future in pool.render_files(sources, output_dir)
+        }
+
+    assert (tmp_path / "direct.pdf").exists()
+    assert set(rendered) == set(sources)
+    assert rendered[sources[1]] == output_dir / "b.pdf"
+    assert all(path.exists() for path in rendered.values())
+
+
+def test_render_pdf_command_converts_directory(
+    tmp_path: Path, capsys
+) -> None:
+    (tmp_path / "one.md").write_text(RESUME, encoding="utf-8")
+    (tmp_path / "two.md").write_text(RESUME, encoding="utf-8")
+    (tmp_path / "manifest.jsonl").write_text("", encoding="utf-8")
+
+    main(["render-pdf", str(tmp_path), "--render-workers", "2"])
+
+    assert (tmp_path / "one.pdf").exists()
+    assert (tmp_path / "two.pdf").exists()
+    assert "Rendered 2 of 2 files." in capsys.readouterr().out
+
+
+def test_parse_inline_runs_styles_text() -> None:
+    assert parse_inline_runs("Built **fast _and_ safe** tools, *quickly*") == [
+        ("Built ", ""),
+        ("fast ", "B"),
+        ("and", "BI"),
+        (" safe", "B"),
+        (" tools, ", ""),
+        ("quickly", "I"),
+    ]
+    assert parse_inline_runs("plain text") == [("plain text", "")]
+    assert parse_inline_runs("") == []
+
+
+class _RecordingPDF(FPDF):
+    def __init__(self) -> None:
+        super().__init__()
+        self.lines: list[list[tuple[str, float]]] = [[]]
+
+    def cell(self, w=None, h=None, text="", **kwargs):
+        self.lines[-1].append((text, w))
+        return super().cell(w=w, h=h, text=text, **kwargs)
+
+    def ln(self, h=None):
+        if self.lines[-1]:
+            self.lines.append([])
+        return super().ln(h)
+
+
+def test_renderer_wraps_lines_to_page_width() -> None:
+    words = [f"word{i}" for i in range(200)]
+    pdf = _RecordingPDF()
+    pdf.add_page()
+
+    PdfRenderer()._layout(pdf, " ".join(words) + " " + "x" * 400)
+
+    lines = [line for line in pdf.lines if line]
+    assert len(lines) > 5
+    assert all(sum(width for _, width in line) <= pdf.epw for line in lines)
+    text = " ".join("".join(t for t, _ in line).strip() for line in lines)
+    assert text.split()[:200] == words
+
+
+def test_renderer_breaks_lines_after_headings() -> None:
+    pdf = _RecordingPDF()
+    pdf.add_page()
+
+    PdfRenderer()._layout(
+        pdf,
+        "# Jane Doe\njane@x.com | 555-1234\n\n## Experience\n### Eng\n"
+        "Acme Corp",
+    )
+
+    lines = ["".join(text for text, _ in line) for line in pdf.lines if line]
+    assert lines == [
+        "Jane Doe",
+        "jane@x.com | 555-1234",
+        "Experience",
+        "Eng",
+        "Acme Corp",
+    ]
+    assert all("\n" not in line for line in lines)
+
+
+def test_render_many_puts_each_document_on_new_pages(tmp_path: Path) -> None:
+    output_path = tmp_path / "all.pdf"
+
+    PdfRenderer().render_many([RESUME, RESUME, RESUME], output_path)
+
+    assert b"/Count 3" in output_path.read_bytes()
+
+
+def test_render_pdf_command_combines_into_one_file(tmp_path: Path) -> None:
+    (tmp_path / "one.md").write_text(RESUME, encoding="utf-8")
+    (tmp_path / "two.md").write_text(RESUME, encoding="utf-8")
+    combined = tmp_path / "out" / "all.pdf"
+
+    main(["render-pdf", str(tmp_path), "--combine", str(combined)])
+
+    assert b"/Count 2" in combined.read_bytes()
+    assert not (tmp_path / "one.pdf").exists()
@@ -1,3 +1,5 @@
+import pytest
+
 from fakedin.person_generator import PersonGenerator
 
 
@@ -34,3 +36,67 @@ def test_generate_person_fields_and_consistency() -> None:
         expected_level = "Executive"
 
     assert person["experience_level"] == expected_level
+
+
+def test_seeded_generators_are_reproducible() -> None:
+    first = PersonGenerator(seed=7).generate_person()
+    second = PersonGenerator(seed=7).generate_person()
+
+    assert first == second
+
+
+def test_reseed_restarts_sequence() -> None:
+    generator = PersonGenerator(seed=1)
+    first = generator.generate_person()
+    generator.generate_person()
+
+    generator.reseed(1)
+
+    assert generator.generate_person() == first
+
+
+def test_generate_people_is_columnar_and_consistent() -> None:
+    generator = PersonGenerator(seed=3)
+    people = generator.generate_people(500)
+
+    assert set(people) == set(generator.generate_person())
+    assert all(len(column) == 500 for column in people.values())
+
+    for i in range(500):
+        assert people["full_name"][i] == (
+            f"{people['first_name'][i]} {people['last_name'][i]}"
+        )
+        assert people["email"][i].startswith(
+            f"{people['first_name'][i].lower()}."
+            f"{people['last_name'][i].lower()}@"
+        )
+        assert people["location"][i] == (
+            f"{people['city'][i]}, {people['state'][i]}"
+        )
+        age = people["age"][i]
+        assert 22 <= age <= 65
+        assert 0 <= people["experience_years"][i] <= min(age - 21, 40)
+
+
+def test_generate_people_is_reproducible() -> None:
+    assert PersonGenerator(seed=5).generate_people(20) == (
+        PersonGenerator(seed=5).generate_people(20)
+    )
+
+
+def test_local_backend_does_not_need_faker() -> None:
+    generator = PersonGenerator(seed=5, backend="local")
+    person = generator.generate_person()
+
+    assert generator.faker is None
+    assert person["location"] == f"{person['city']}, {person['state']}"
+    assert person["email"].startswith(
+        f"{person['first_name'].lower()}.{person['last_name'].lower()}@"
+    )
+    assert person["career_field"] in generator.pools.job_titles
+    assert PersonGenerator(seed=5, backend="local").generate_person() == person
+
+
+def test_unknown_backend_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        PersonGenerator(backend="nope")
@@ -0,0 +1,228 @@
+import itertools
+from pathlib import Path
+
+import pytest
+
+from fakedin.file_utils import atomic_output, atomic_write_text
+from fakedin.manifest import COMPLETED, FAILED, RunManifest
+from fakedin.pipeline import generate_items
+from fakedin.sharding import Shard
+
+
+def _numbered_items(start: int = 0):
+    counter = itertools.count(start)
+    return lambda _seed: {"n": next(counter)}
+
+
+def _producer(tmp_path: Path, fail: set[int], produced: list[int]):
+    def _produce(item: dict) -> Path:
+        if item["n"] in fail:
+            raise RuntimeError(f"failed {item['n']}")
+        produced.append(item["n"])
+        output_path = tmp_path / f"item_{item['n']}.md"
+        atomic_write_text(output_path, str(item["n"]))
+        return output_path
+
+    return _produce
+
+
+def test_generate_items_without_manifest_raises(tmp_path: Path) -> None:
+    with pytest.raises(RuntimeError):
+        generate_items(
+            3,
+            draw_item=_numbered_items(),
+            produce=_producer(tmp_path, fail={1}, produced=[]),
+            label="item",
+        )
+
+
+def test_generate_items_records_failures(tmp_path: Path) -> None:
+    manifest = RunManifest(tmp_path)
+
+    paths = generate_items(
+        3,
+        draw_item=_numbered_items(),
+        produce=_producer(tmp_path, fail={1}, produced=[]),
+        label="item",
+        manifest=manifest,
+    )
+
+    assert [path.name for path in paths] == ["item_0.md", "item_2.md"]
+    records = manifest.load()
+    assert records[0].status == COMPLETED
+    assert records[1].status == FAILED
+    assert records[1].error == "failed 1"
+
+
+def test_resume_only_regenerates_unfinished_items(tmp_path: Path) -> None:
+    manifest = RunManifest(tmp_path)
+    generate_items(
+        4,
+        draw_item=_numbered_items(),
+        produce=_producer(tmp_path, fail={1}, produced=[]),
+        label="item",
+        manifest=manifest,
+    )
+    # A completed item whose output went missing is regenerated too.
+    (tmp_path / "item_3.md").unlink()
+
+    produced: list[int] = []
+    drawn: list[int | None] = []
+
+    def _draw(seed: int | None) -> dict:
+        drawn.append(seed)
+        return {"n": 4}
+
+    paths = generate_items(
+        4,
+        draw_item=_draw,
+        produce=_producer(tmp_path, fail=set(), produced=produced),
+        label="item",
+        manifest=manifest,
+        resume=True,
+    )
+
+    assert sorted(produced) == [1, 3]
+    # Recorded items are reused rather than drawn again.
+    assert drawn == []
+    assert [path.name for path in paths] == ["item_1.md", "item_3.md"]
+    assert all(r.status == COMPLETED for r in manifest.load().values())
+
+
+def test_atomic_write_leaves_no_partial_file(tmp_path: Path) -> None:
+    output_path = tmp_path / "out.md"
+
+    class _Boom(Exception):
+        pass
+
+    with pytest.raises(_Boom):
+        with atomic_output(output_path) as temp_path:
+            temp_path.write_text("partial", encoding="utf-8")
+            raise _Boom()
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_seeded_runs_draw_the_same_items(tmp_path: Path) -> None:
+    def _run(concurrency: int) -> list:
+        manifest = RunManifest(tmp_path / str(concurrency))
+        generate_items(
+            6,
+            draw_item=lambda seed: {"n": seed % 1000},
+            produce=lambda item: tmp_path / f"{item['n']}.md",
+            label="item",
+            concurrency=concurrency,
+            manifest=manifest,
+            seed=42,
+        )
+        records = manifest.load()
+        return [(records[i].seed, records[i].item) for i in range(6)]
+
+    assert _run(concurrency=1) == _run(concurrency=3)
+
+
+def test_generate_items_in_groups(tmp_path: Path) -> None:
+    manifest = RunManifest(tmp_path)
+    groups: list[list[int]] = []
+
+    def _produce_group(items: list[dict]) -> list[Path]:
+        numbers = [item["n"] for item in items]
+        groups.append(numbers)
+        if 3 in numbers:
+            raise RuntimeError("bad group")
+        return [tmp_path / f"item_{n}.md" for n in numbers]
+
+    paths = generate_items(
+        5,
+        draw_item=_numbered_items(),
+        produce=_producer(tmp_path, fail=set(), produced=[]),
+        label="item",
+        manifest=manifest,
+        produce_group=_produce_group,
+        group_size=2,
+    )
+
+    assert groups == [[0, 1], [2, 3], [4]]
+    assert [path.name for path in paths] == [
+        "item_0.md",
+        "item_1.md",
+        "item_4.md",
+    ]
+    records = manifest.load()
+    assert [records[n].status for n in range(5)] == [
+        COMPLETED,
+        COMPLETED,
+        FAILED,
+        FAILED,
+        COMPLETED,
+    ]
+
+
+def test_item_context_is_added_to_drawn_items(tmp_path: Path) -> None:
+    manifest = RunManifest(tmp_path)
+    produced: list[dict] = []
+
+    def _produce(item: dict) -> Path:
+        produced.append(item)
+        return tmp_path / f"item_{item['n']}.md"
+
+    generate_items(
+        4,
+        draw_item=_numbered_items(),
+        produce=_produce,
+        label="item",
+        manifest=manifest,
+        item_context=lambda index: {"group": index // 2},
+    )
+
+    assert produced == [
+        {"n": 0, "group": 0},
+        {"n": 1, "group": 0},
+        {"n": 2, "group": 1},
+        {"n": 3, "group": 1},
+    ]
+    assert manifest.load()[3].item == {"n": 3, "group": 1}
+
+
+def test_shards_together_draw_the_unsharded_items(tmp_path: Path) -> None:
+    def _run(name: str, shard=None) -> dict:
+        manifest = RunManifest(tmp_path / name)
+        generate_items(
+            7,
+            draw_item=lambda seed: {"n": seed % 1000},
+            produce=lambda item: tmp_path / f"{item['n']}.md",
+            label="item",
+            manifest=manifest,
+            seed=42,
+            shard=shard,
+        )
+        return {
+            index: (record.seed, record.item)
+            for index, record in manifest.load().items()
+        }
+
+    whole = _run("whole")
+    shards = [_run(f"shard{i}", Shard(i, 3)) for i in range(3)]
+
+    assert sorted(shards[1]) == [1, 4]
+    merged = {index: item for run in shards for index, item in run.items()}
+    assert merged == whole
+
+
+def test_resume_with_different_run_details_raises(tmp_path: Path) -> None:
+    manifest = RunManifest(tmp_path)
+    run = dict(
+        draw_item=_numbered_items(),
+        produce=_producer(tmp_path, fail=set(), produced=[]),
+        label="item",
+        manifest=manifest,
+    )
+    generate_items(4, seed=7, shard=Shard(0, 2), **run)
+
+    with pytest.raises(ValueError, match="shard '0/2'"):
+        generate_items(4, seed=7, shard=Shard(1, 2), resume=True, **run)
+    with pytest.raises(ValueError, match="seed 7"):
+        generate_items(4, shard=Shard(0, 2), resume=True, **run)
+    with pytest.raises(ValueError, match="count 4"):
+        generate_items(6, seed=7, shard=Shard(0, 2), resume=True, **run)
+    assert manifest.load_info()["count"] == 4
@@ -0,0 +1,73 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from fakedin.prompt_cache import PromptCache
+
+PROMPT = """# Test Prompt
+
+## Developer Message
+
+You write greetings.
+
+## Conversation
+
+**User:**
+Say hello to {name}.
+"""
+
+
+def _user_text(messages: list[dict]) -> str:
+    return messages[-1]["content"][0]["text"]
+
+
+def _write_prompt(path: Path, text: str = PROMPT) -> Path:
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_get_reuses_parsed_prompt(tmp_path: Path) -> None:
+    prompt_path = _write_prompt(tmp_path / "greeting.prompt.md")
+    cache = PromptCache()
+
+    first = cache.get(prompt_path)
+    second = cache.get(prompt_path)
+
+    assert first is second
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+
+def test_templating_does_not_modify_cached_prompt(tmp_path: Path) -> None:
+    prompt_path = _write_prompt(tmp_path / "greeting.prompt.md")
+    cache = PromptCache()
+
+    cache.get(prompt_path).apply_template_values({"name": "Ada"})
+    messages = cache.get(prompt_path).to_chat_completion_messages()
+
+    assert _user_text(messages) == "Say hello to {name}."
+
+
+def test_get_reparses_after_file_changes(tmp_path: Path) -> None:
+    prompt_path = _write_prompt(tmp_path / "greeting.prompt.md")
+    cache = PromptCache()
+    cache.get(prompt_path)
+
+    _write_prompt(prompt_path, PROMPT.replace("hello", "goodbye"))
+    stat = os.stat(prompt_path)
+    os.utime(
+        prompt_path,
+        ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000),
+    )
+    messages = cache.get(prompt_path).to_chat_completion_messages()
+
+    assert _user_text(messages) == "Say goodbye to {name}."
+    assert cache.stats.misses == 2
+
+
+def test_get_missing_file_raises(tmp_path: Path) -> None:
+    cache = PromptCache()
+
+    with pytest.raises(FileNotFoundError):
+        cache.get(tmp_path / "missing.prompt.md")
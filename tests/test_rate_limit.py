@@ -0,0 +1,90 @@
+import httpx
+import openai
+import pytest
+
+from fakedin.rate_limit import RateLimiter, RetryPolicy, TokenBucket
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _rate_limit_error(headers: dict[str, str]) -> openai.RateLimitError:
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat")
+    response = httpx.Response(429, headers=headers, request=request)
+    return openai.RateLimitError("slow down", response=response, body=None)
+
+
+def test_token_bucket_reports_wait_once_empty() -> None:
+    clock = _FakeClock()
+    bucket = TokenBucket(60, clock=clock)
+
+    assert bucket.reserve(60) == 0.0
+    assert bucket.reserve(2) == pytest.approx(2.0)
+
+    clock.now = 10.0
+    # Ten seconds refill ten tokens, eight of which are left after the debt.
+    assert bucket.reserve(8) == 0.0
+    assert bucket.reserve(1) == pytest.approx(1.0)
+
+
+def test_token_bucket_adjust_returns_unused_tokens() -> None:
+    clock = _FakeClock()
+    bucket = TokenBucket(60, clock=clock)
+    bucket.reserve(60)
+
+    bucket.adjust(30)
+
+    assert bucket.reserve(30) == 0.0
+
+
+def test_rate_limiter_applies_both_limits() -> None:
+    clock = _FakeClock()
+    limiter = RateLimiter(
+        requests_per_minute=600,
+        tokens_per_minute=1200,
+        clock=clock,
+    )
+
+    assert limiter.reserve(1000) == 0.0
+    assert limiter.reserve(400) == pytest.approx(10.0)
+
+
+def test_rate_limiter_pause_holds_back_all_requests() -> None:
+    clock = _FakeClock()
+    limiter = RateLimiter(clock=clock)
+
+    limiter.pause(5)
+
+    assert limiter.reserve(1) == pytest.approx(5.0)
+    clock.now = 5.0
+    assert limiter.reserve(1) == 0.0
+
+
+def test_retry_policy_honors_retry_after() -> None:
+    policy = RetryPolicy(max_retries=3, max_delay=60)
+
+    assert policy.get_delay(0, _rate_limit_error({"retry-after": "7"})) == 7
+    assert policy.get_delay(
+        0, _rate_limit_error({"retry-after-ms": "250"})
+    ) == pytest.approx(0.25)
+
+
+def test_retry_policy_backs_off_exponentially() -> None:
+    policy = RetryPolicy(max_retries=5, base_delay=1, max_delay=4)
+    error = _rate_limit_error({})
+
+    for attempt in range(5):
+        delay = policy.get_delay(attempt, error)
+        assert 0 <= delay <= min(4, 2**attempt)
+
+
+def test_retry_policy_gives_up() -> None:
+    policy = RetryPolicy(max_retries=2)
+
+    assert policy.get_delay(2, _rate_limit_error({})) is None
+    assert policy.get_delay(0, ValueError("bad request")) is None
@@ -0,0 +1,80 @@
+from pathlib import Path
+
+from fakedin.response_cache import ResponseCache
+
+
+def test_make_key_depends_on_model_and_messages() -> None:
+    messages = [{"role": "user", "content": "hi"}]
+
+    key = ResponseCache.make_key("model-a", messages)
+
+    assert key == ResponseCache.make_key("model-a", list(messages))
+    assert key != ResponseCache.make_key("model-b", messages)
+    assert key != ResponseCache.make_key(
+        "model-a", [{"role": "user", "content": "hello"}]
+    )
+
+
+def test_get_returns_stored_response(tmp_path: Path) -> None:
+    cache = ResponseCache(tmp_path, max_size_bytes=1024)
+
+    cache.set("key", "response")
+
+    assert cache.get("key") == "response"
+    assert cache.get("missing") is None
+
+
+def test_cache_persists_across_instances(tmp_path: Path) -> None:
+    ResponseCache(tmp_path, max_size_bytes=1024).set("key", "response")
+
+    assert ResponseCache(tmp_path, max_size_bytes=1024).get("key") == (
+        "response"
+    )
+
+
+def test_evicts_least_recently_used_entries(tmp_path: Path) -> None:
+    cache = ResponseCache(tmp_path, max_size_bytes=25)
+
+    cache.set("a", "a" * 10)
+    cache.set("b", "b" * 10)
+    # Touch "a" so "b" becomes the least recently used entry.
+    assert cache.get("a") is not None
+    cache.set("c", "c" * 10)
+
+    assert cache.get("a") == "a" * 10
+    assert cache.get("b") is None
+    assert cache.get("c") == "c" * 10
+    assert cache.total_size() <= 25
+
+
+def test_skips_responses_larger_than_cache(tmp_path: Path) -> None:
+    cache = ResponseCache(tmp_path, max_size_bytes=5)
+
+    cache.set("key", "too large")
+
+    assert len(cache) == 0
+
+
+def test_keeps_total_size_as_responses_change(tmp_path: Path) -> None:
+    cache = ResponseCache(tmp_path, max_size_bytes=25)
+
+    cache.set("a", "a" * 10)
+    cache.set("a", "a" * 4)
+    cache.set("b", "b" * 10)
+    cache.set("c", "c" * 10)
+    assert cache.total_size() == 24
+    cache.set("d", "d" * 10)
+
+    assert cache.total_size() == 20
+    assert cache.get("b") is None
+    reopened = ResponseCache(tmp_path, max_size_bytes=25)
+    assert reopened.total_size() == 20
+
+
+def test_adds_up_total_size_of_an_older_cache(tmp_path: Path) -> None:
+    cache = ResponseCache(tmp_path, max_size_bytes=1024)
+    cache.set("a", "a" * 10)
+    cache.set("b", "b" * 5)
+    cache._connection.execute("DROP TABLE cache_info")
+
+    assert ResponseCache(tmp_path, max_size_bytes=1024).total_size() == 15
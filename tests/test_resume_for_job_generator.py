@@ -1,6 +1,12 @@
 from pathlib import Path
 
-from fakedin.resume_for_job_generator import ResumeForJobGenerator
+import pytest
+
+from fakedin.manifest import RunManifest
+from fakedin.resume_for_job_generator import (
+    ResumeForJobGenerator,
+    find_job_descriptions,
+)
 
 
 def test_generate_wraps_job_description_and_writes_file(
@@ -44,3 +50,121 @@ def test_generate_wraps_job_description_and_writes_file(
     assert output_path.name == "test_person_for_job.md"
     assert output_path.exists()
     assert output_path.read_text(encoding="utf-8") == "resume"
+
+
+def test_generate_for_jobs_reads_each_job_once(tmp_path: Path) -> None:
+    job_paths = []
+    for name in ("analyst", "engineer"):
+        job_path = tmp_path / f"{name}.md"
+        job_path.write_text(f"{name} details", encoding="utf-8")
+        job_paths.append(job_path)
+
+    generator = ResumeForJobGenerator()
+    people = iter(range(100))
+    generator.person_generator.generate_person = lambda: {
+        "full_name": f"Person {next(people)}"
+    }
+
+    reads: list[Path] = []
+    read_job_description = generator._read_job_description
+
+    def _counting_read(path: Path) -> str:
+        reads.append(path)
+        return read_job_description(path)
+
+    generator._read_job_description = _counting_read
+    generator.llm_client.generate_from_promptdown = (
+        lambda _prompt, variables: f"resume for {variables['job_description']}"
+    )
+
+    output_dir = tmp_path / "out"
+    manifest = RunManifest(output_dir)
+    paths = generator.generate_for_jobs(
+        job_paths,
+        count_per_job=2,
+        output_dir=output_dir,
+        concurrency=3,
+        manifest=manifest,
+    )
+
+    assert sorted(reads) == job_paths
+    assert [path.name for path in paths] == [
+        "person_0_for_analyst.md",
+        "person_1_for_analyst.md",
+        "person_2_for_engineer.md",
+        "person_3_for_engineer.md",
+    ]
+    assert "engineer details" in paths[3].read_text(encoding="utf-8")
+    records = manifest.load()
+    assert records[1].item["job_description_path"] == str(job_paths[0])
+    assert records[2].item["job_description_path"] == str(job_paths[1])
+    assert records[2].item["person"] == {"full_name": "Person 2"}
+
+
+def test_generate_for_jobs_wraps_each_job_once(tmp_path: Path) -> None:
+    job_paths = []
+    for name in ("analyst", "engineer"):
+        job_path = tmp_path / f"{name}.md"
+        job_path.write_text(f"{name} details", encoding="utf-8")
+        job_paths.append(job_path)
+
+    generator = ResumeForJobGenerator()
+    people = iter(range(100))
+    generator.person_generator.generate_person = lambda: {
+        "full_name": f"Person {next(people)}"
+    }
+    wrapped: list[str] = []
+    wrap_job_description = generator.wrap_job_description
+
+    def _counting_wrap(job_description: str) -> str:
+        wrapped.append(job_description)
+        return wrap_job_description(job_description)
+
+    generator.wrap_job_description = _counting_wrap
+    prompts: list[str] = []
+
+    def _fake_generate(_prompt: str, variables: dict) -> str:
+        prompts.append(variables["job_description"])
+        return "resume"
+
+    generator.llm_client.generate_from_promptdown = _fake_generate
+
+    generator.generate_for_jobs(
+        job_paths, count_per_job=3, output_dir=tmp_path / "out"
+    )
+
+    assert sorted(wrapped) == ["analyst details", "engineer details"]
+    assert prompts.count("```markdown\nengineer details\n```") == 3
+
+
+def test_find_job_descriptions(tmp_path: Path) -> None:
+    jobs_dir = tmp_path / "jobs"
+    (jobs_dir / "nested").mkdir(parents=True)
+    for name in ("b.md", "a.md", "notes.txt", "nested/c.md"):
+        (jobs_dir / name).write_text("job", encoding="utf-8")
+
+    assert find_job_descriptions(jobs_dir / "a.md") == [jobs_dir / "a.md"]
+    assert find_job_descriptions(jobs_dir) == [
+        jobs_dir / "a.md",
+        jobs_dir / "b.md",
+    ]
+    assert find_job_descriptions(f"{jobs_dir}/**/*.md") == [
+        jobs_dir / "a.md",
+        jobs_dir / "b.md",
+        jobs_dir / "nested" / "c.md",
+    ]
+    assert find_job_descriptions(f"{jobs_dir}/*.txt") == [
+        jobs_dir / "notes.txt"
+    ]
+    assert find_job_descriptions(tmp_path / "missing") == []
+
+
+def test_find_job_descriptions_rejects_names_used_twice(
+    tmp_path: Path,
+) -> None:
+    for name in ("backend/engineer.md", "frontend/engineer.md"):
+        (tmp_path / name).parent.mkdir(parents=True)
+        (tmp_path / name).write_text("job", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="have the same name"):
+        find_job_descriptions(f"{tmp_path}/*/engineer.md")
@@ -1,5 +1,11 @@
+import threading
+from concurrent.futures import Future
 from pathlib import Path
+from typing import Optional
 
+from fakedin.dedup import NearDuplicateIndex
+from fakedin.manifest import RunManifest
+from fakedin.models import Resume
 from fakedin.resume_generator import ResumeGenerator
 
 
@@ -77,3 +83,329 @@ def test_generate_pdf_falls_back_to_markdown(tmp_path: Path) -> None:
     assert output_path.suffix == ".md"
     assert output_path.exists()
     assert output_path.read_text(encoding="utf-8") == "resume"
+
+
+def test_generate_multiple_concurrently_keeps_order(tmp_path: Path) -> None:
+    generator = ResumeGenerator()
+
+    names = iter(["Ann Able", "Bob Baker", "Cy Cole"])
+
+    def _fake_person() -> dict:
+        return {"full_name": next(names)}
+
+    generator.person_generator.generate_person = _fake_person
+
+    def _fake_generate(_prompt_file: str, variables: dict) -> str:
+        return f"resume for {variables['full_name']}"
+
+    generator.llm_client.generate_from_promptdown = _fake_generate
+
+    paths = generator.generate_multiple(
+        3,
+        output_dir=tmp_path,
+        concurrency=3,
+    )
+
+    assert [path.name for path in paths] == [
+        "ann_able_resume.md",
+        "bob_baker_resume.md",
+        "cy_cole_resume.md",
+    ]
+    assert paths[1].read_text(encoding="utf-8") == "resume for Bob Baker"
+
+
+def test_generate_streams_to_stdout_and_file(
+    tmp_path: Path, capsys
+) -> None:
+    generator = ResumeGenerator()
+
+    def _fake_stream(_prompt_file: str, variables: dict):
+        yield f"# {variables['full_name']}\n"
+        yield "Engineer"
+
+    generator.llm_client.stream_from_promptdown = _fake_stream
+
+    output_path = generator.generate_for_person(
+        {"full_name": "Ann Able"},
+        output_dir=tmp_path,
+        stream=True,
+    )
+
+    assert output_path.read_text(encoding="utf-8") == "# Ann Able\nEngineer"
+    assert capsys.readouterr().out == "# Ann Able\nEngineer\n"
+
+
+def test_generate_json_saves_structured_resume(tmp_path: Path) -> None:
+    generator = ResumeGenerator()
+    resume = Resume(
+        full_name="Ann Able",
+        email="ann@example.com",
+        phone_number="555-0100",
+        location="Austin, TX",
+        summary="Engineer.",
+        experience=[],
+        education=[],
+        skills=["Python"],
+        certifications=[],
+    )
+    prompts = []
+
+    def _fake_structured(prompt_file: str, _variables: dict, _model):
+        prompts.append(prompt_file)
+        return resume
+
+    generator.llm_client.generate_structured_from_promptdown = _fake_structured
+
+    json_path = generator.generate_for_person(
+        {"full_name": "Ann Able"}, "json", tmp_path
+    )
+    markdown_path = generator.generate_for_person(
+        {"full_name": "Ann Able"}, "markdown", tmp_path, structured=True
+    )
+
+    assert prompts == ["resume_structured", "resume_structured"]
+    assert json_path.name == "ann_able_resume.json"
+    assert Resume.model_validate_json(json_path.read_text()) == resume
+    assert markdown_path.read_text(encoding="utf-8") == resume.to_markdown()
+
+
+def _person(name: str) -> dict:
+    return {
+        "full_name": name,
+        "age": 30,
+        "email": "a@example.com",
+        "phone_number": "555-0100",
+        "city": "Austin",
+        "state": "TX",
+        "location": "Austin, TX",
+        "career_field": "Engineer",
+        "experience_level": "Mid-Level",
+        "experience_years": 5,
+    }
+
+
+def test_generate_for_people_splits_one_response(tmp_path: Path) -> None:
+    generator = ResumeGenerator()
+    calls = []
+
+    def _fake_generate(prompt_file: str, variables: dict) -> str:
+        calls.append(prompt_file)
+        assert "### Person 2\n\nFull Name: Bob Baker" in variables["people"]
+        return "=== ITEM 1 ===\n# Ann Able\n\n=== ITEM 2 ===\n# Bob Baker\n"
+
+    generator.llm_client.generate_from_promptdown = _fake_generate
+
+    paths = generator.generate_for_people(
+        [_person("Ann Able"), _person("Bob Baker")], output_dir=tmp_path
+    )
+
+    assert calls == ["resume_multi"]
+    assert [path.read_text(encoding="utf-8") for path in paths] == [
+        "# Ann Able",
+        "# Bob Baker",
+    ]
+
+
+def test_generate_for_people_falls_back_on_malformed_split(
+    tmp_path: Path,
+) -> None:
+    generator = ResumeGenerator()
+    calls = []
+
+    def _fake_generate(prompt_file: str, variables: dict) -> str:
+        calls.append(prompt_file)
+        if prompt_file == "resume_multi":
+            return "=== ITEM 1 ===\n# Only one\n"
+        return f"# {variables['full_name']}"
+
+    generator.llm_client.generate_from_promptdown = _fake_generate
+
+    paths = generator.generate_for_people(
+        [_person("Ann Able"), _person("Bob Baker")], output_dir=tmp_path
+    )
+
+    assert calls == ["resume_multi", "resume", "resume"]
+    assert paths[1].read_text(encoding="utf-8") == "# Bob Baker"
+
+
+def test_near_duplicate_resumes_are_regenerated(tmp_path: Path) -> None:
+    generator = ResumeGenerator(
+        duplicate_index=NearDuplicateIndex(0.8), regenerate_duplicates=1
+    )
+    boilerplate = " ".join(f"skill{n} project{n} result{n}" for n in range(60))
+    regenerated: list[list[dict]] = []
+
+    def _fake_generate(_prompt_file: str, variables: dict) -> str:
+        return f"# {variables['full_name']}\n\n{boilerplate}"
+
+    def _fake_generate_with_messages(messages: list[dict]) -> str:
+        regenerated.append(messages)
+        return "# Bob Baker\n\nA distinct career in marine biology."
+
+    generator.llm_client.generate_from_promptdown = _fake_generate
+    generator.llm_client.generate_with_messages = _fake_generate_with_messages
+
+    paths = [
+        generator.generate_for_person(_person(name), output_dir=tmp_path)
+        for name in ("Ann Able", "Bob Baker", "Cy Cole")
+    ]
+
+    assert len(regenerated) == 2
+    assert "(Attempt 1)" in regenerated[0][-1]["content"]
+    assert "marine biology" in paths[1].read_text(encoding="utf-8")
+    # The second regeneration is a near-duplicate of Bob's and is kept
+    [flagged] = generator.duplicate_index.flagged
+    assert (flagged.label, flagged.similar_to) == ("Cy Cole", "Bob Baker")
+    assert "marine biology" in paths[2].read_text(encoding="utf-8")
+
+
+def test_people_with_the_same_name_get_separate_files(tmp_path: Path) -> None:
+    generator = ResumeGenerator()
+    people = iter([_person("Ann Able"), _person("Ann Able")])
+    generator.person_generator.generate_person = lambda: next(people)
+    texts = iter(["first resume", "second resume"])
+    generator.llm_client.generate_from_promptdown = lambda *_args: next(texts)
+    manifest = RunManifest(tmp_path)
+
+    paths = generator.generate_multiple(
+        2, output_dir=tmp_path, manifest=manifest
+    )
+
+    assert [path.name for path in paths] == [
+        "ann_able_resume.md",
+        "ann_able_resume_2.md",
+    ]
+    assert paths[1].read_text(encoding="utf-8") == "second resume"
+    records = manifest.load()
+    assert records[0].output_path != records[1].output_path
+
+
+def test_rerun_overwrites_outputs_of_an_earlier_run(tmp_path: Path) -> None:
+    generator = ResumeGenerator()
+    generator.person_generator.generate_person = lambda: _person("Ann Able")
+    texts = iter(["first run", "second run"])
+    generator.llm_client.generate_from_promptdown = lambda *_args: next(texts)
+
+    generator.generate_multiple(1, output_dir=tmp_path)
+    [path] = generator.generate_multiple(1, output_dir=tmp_path)
+
+    assert path.name == "ann_able_resume.md"
+    assert path.read_text(encoding="utf-8") == "second run"
+    assert sorted(tmp_path.iterdir()) == [path]
+
+
+def test_resume_keeps_completed_outputs_with_the_same_name(
+    tmp_path: Path,
+) -> None:
+    generator = ResumeGenerator()
+    generator.person_generator.generate_person = lambda: _person("Ann Able")
+    responses = iter(["first resume", RuntimeError("timeout"), "retried"])
+
+    def _generate(*_args: object) -> str:
+        response = next(responses)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    generator.llm_client.generate_from_promptdown = _generate
+    manifest = RunManifest(tmp_path)
+    [first] = generator.generate_multiple(
+        2, output_dir=tmp_path, manifest=manifest
+    )
+
+    [retried] = generator.generate_multiple(
+        2, output_dir=tmp_path, manifest=manifest, resume=True
+    )
+
+    assert retried.name == "ann_able_resume_2.md"
+    assert first.read_text(encoding="utf-8") == "first resume"
+
+
+class _HeldPdfPool:
+    """PDF pool whose renders only finish when the test finishes them."""
+
+    def __init__(self) -> None:
+        self.renders: list[tuple[Future, Path]] = []
+
+    def submit(self, _content: str, output_path: Path) -> Future:
+        future: Future = Future()
+        self.renders.append((future, output_path))
+        return future
+
+    def finish(self, error: Optional[Exception] = None) -> None:
+        for future, output_path in self.renders:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                output_path.write_bytes(b"%PDF")
+                future.set_result(None)
+
+
+def _start_generating(
+    generator: ResumeGenerator, count: int, **kwargs: object
+) -> tuple[threading.Thread, list[Path]]:
+    paths: list[Path] = []
+    run = threading.Thread(
+        target=lambda: paths.extend(
+            generator.generate_multiple(count, output_format="pdf", **kwargs)
+        ),
+        daemon=True,
+    )
+    run.start()
+    return run, paths
+
+
+def test_next_resume_is_generated_while_a_pdf_renders(
+    tmp_path: Path,
+) -> None:
+    pool = _HeldPdfPool()
+    generator = ResumeGenerator(pdf_pool=pool)
+    names = iter(["Ann Able", "Bob Baker"])
+    generator.person_generator.generate_person = lambda: _person(next(names))
+    renders_pending = []
+
+    def _generate(*_args: object) -> str:
+        renders_pending.append(
+            [not future.done() for future, _path in pool.renders]
+        )
+        return "resume"
+
+    generator.llm_client.generate_from_promptdown = _generate
+    manifest = RunManifest(tmp_path)
+    run, paths = _start_generating(
+        generator, 2, output_dir=tmp_path, manifest=manifest
+    )
+    while len(pool.renders) < 2 and run.is_alive():
+        run.join(0.01)
+
+    # The second résumé was requested with the first PDF still rendering,
+    # and neither is complete until its PDF is written
+    assert renders_pending == [[], [True]]
+    records = manifest.load().values()
+    assert [record.status for record in records] == ["pending", "pending"]
+    pool.finish()
+    run.join()
+
+    assert [path.name for path in paths] == [
+        "ann_able_resume.pdf",
+        "bob_baker_resume.pdf",
+    ]
+    records = manifest.load().values()
+    assert [record.status for record in records] == ["completed", "completed"]
+
+
+def test_failed_pdf_render_falls_back_to_markdown(tmp_path: Path) -> None:
+    pool = _HeldPdfPool()
+    generator = ResumeGenerator(pdf_pool=pool)
+    generator.person_generator.generate_person = lambda: _person("Ann Able")
+    generator.llm_client.generate_from_promptdown = lambda *_args: "resume"
+
+    run, paths = _start_generating(generator, 1, output_dir=tmp_path)
+    while not pool.renders and run.is_alive():
+        run.join(0.01)
+    pool.finish(RuntimeError("pdf failed"))
+    run.join()
+
+    [path] = paths
+    assert path.name == "ann_able_resume.md"
+    assert path.read_text(encoding="utf-8") == "resume"
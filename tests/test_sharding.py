@@ -0,0 +1,22 @@
+import pytest
+
+from fakedin.sharding import Shard, parse_shard
+
+
+def test_shards_split_a_run_without_overlap() -> None:
+    shards = [Shard(index, 3) for index in range(3)]
+
+    indices = [list(shard.indices(10)) for shard in shards]
+
+    assert indices == [[0, 3, 6, 9], [1, 4, 7], [2, 5, 8]]
+    assert sorted(sum(indices, [])) == list(range(10))
+    assert all(shards[1].owns(index) for index in indices[1])
+    assert shards[2].select("abcdefg") == ["c", "f"]
+
+
+def test_parse_shard() -> None:
+    assert parse_shard("2/5") == Shard(2, 5)
+    assert str(parse_shard("0/1")) == "0/1"
+    for value in ("3", "5/5", "-1/2", "0/0", "x/2"):
+        with pytest.raises(ValueError):
+            parse_shard(value)
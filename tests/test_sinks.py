@@ -0,0 +1,157 @@
+import json
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+from fakedin.job_generator import JobOpeningGenerator
+from fakedin.manifest import RunManifest
+from fakedin.sinks import JsonlSink, build_sink
+
+
+def _read_jsonl(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_jsonl_sink_rolls_shards(tmp_path: Path) -> None:
+    sink = JsonlSink(
+        tmp_path, "resumes", records_per_shard=2, buffer_size=1, run_id="a1"
+    )
+
+    paths = [
+        sink.write(f"item_{i}", {"index": i}, f"text {i}") for i in range(5)
+    ]
+    # The last shard only gets its final name once the sink is closed
+    assert not paths[4].exists()
+    sink.close()
+
+    assert [path.name for path in paths] == [
+        "resumes-a1-00000.jsonl",
+        "resumes-a1-00000.jsonl",
+        "resumes-a1-00001.jsonl",
+        "resumes-a1-00001.jsonl",
+        "resumes-a1-00002.jsonl",
+    ]
+    assert _read_jsonl(paths[2]) == [
+        {"name": "item_2", "metadata": {"index": 2}, "text": "text 2"},
+        {"name": "item_3", "metadata": {"index": 3}, "text": "text 3"},
+    ]
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "resumes-a1-00000.jsonl",
+        "resumes-a1-00001.jsonl",
+        "resumes-a1-00002.jsonl",
+    ]
+
+
+def test_jsonl_sink_buffers_writes(tmp_path: Path) -> None:
+    sink = JsonlSink(tmp_path, "jobs", buffer_size=3, run_id="a1")
+
+    sink.write("a", {}, "a", {"title": "A"})
+    sink.write("b", {}, "b")
+    part_path = tmp_path / ".jobs-a1-00000.jsonl.part"
+    assert part_path.read_text() == ""
+
+    sink.write("c", {}, "c")
+    assert len(part_path.read_text().splitlines()) == 3
+
+    sink.close()
+    records = _read_jsonl(tmp_path / "jobs-a1-00000.jsonl")
+    assert records[0]["document"] == {"title": "A"}
+    assert "document" not in records[1]
+
+
+def test_jsonl_sink_names_shards_after_its_run(tmp_path: Path) -> None:
+    (tmp_path / "jobs-a1-00000.jsonl").write_text('{"name": "old"}\n')
+    (tmp_path / ".jobs-a1-00001.jsonl.part").write_text('{"name": "lost"}\n')
+
+    with JsonlSink(tmp_path, "jobs", run_id="b2") as sink:
+        path = sink.write("a", {}, "a")
+
+    assert path.name == "jobs-b2-00000.jsonl"
+    assert [record["name"] for record in _read_jsonl(path)] == ["a"]
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "jobs-a1-00000.jsonl",
+        "jobs-b2-00000.jsonl",
+    ]
+
+
+def test_jsonl_sink_runs_get_their_own_shards(tmp_path: Path) -> None:
+    first = JsonlSink(tmp_path, "jobs")
+    second = JsonlSink(tmp_path, "jobs")
+
+    assert first.run_id != second.run_id
+    assert first.shard_path(0) != second.shard_path(0)
+
+
+def test_resuming_twice_after_a_crash_keeps_every_item(
+    tmp_path: Path,
+) -> None:
+    class _Crash(BaseException):
+        pass
+
+    def _run(crash_at: Optional[int], close_sink: bool) -> None:
+        sink = JsonlSink(tmp_path, "jobs", buffer_size=1)
+        generator = JobOpeningGenerator(sink=sink)
+        generator.job_generator.generate_job = lambda: {
+            "company_name": "Acme",
+            "career_field": "Engineer",
+        }
+        calls = iter(range(3))
+
+        def _generate(_prompt_file: str, _job: dict) -> str:
+            if next(calls) == crash_at:
+                raise _Crash()
+            return "job"
+
+        generator.llm_client.generate_from_promptdown = _generate
+        try:
+            generator.generate_multiple(
+                3, output_dir=tmp_path, manifest=manifest, resume=True
+            )
+        except _Crash:
+            pass
+        finally:
+            if close_sink:
+                sink.close()
+
+    manifest = RunManifest(tmp_path)
+    # Killed after two items, leaving them in a partial shard
+    _run(crash_at=2, close_sink=False)
+    # Interrupted after regenerating one of them, finishing its shard
+    _run(crash_at=1, close_sink=True)
+    _run(crash_at=None, close_sink=True)
+
+    records = manifest.load()
+    assert sorted(records) == [0, 1, 2]
+    stored = {
+        path: len(_read_jsonl(path)) for path in tmp_path.glob("jobs-*.jsonl")
+    }
+    assert sum(stored.values()) == 3
+    for record in records.values():
+        assert record.status == "completed"
+        assert Path(record.output_path) in stored
+
+
+def test_build_sink(tmp_path: Path) -> None:
+    assert build_sink("files", tmp_path, "resumes") is None
+    assert isinstance(build_sink("jsonl", tmp_path, "resumes"), JsonlSink)
+
+    with pytest.raises(ValueError, match="Unknown output sink"):
+        build_sink("csv", tmp_path, "resumes")
+
+
+def test_parquet_sink_writes_rows(tmp_path: Path) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    with build_sink("parquet", tmp_path, "jobs") as sink:
+        path = sink.write("a", {"company": "Acme"}, "text", {"title": "A"})
+
+    rows = pq.read_table(path).to_pylist()
+    assert rows == [
+        {
+            "name": "a",
+            "metadata": '{"company": "Acme"}',
+            "text": "text",
+            "document": '{"title": "A"}',
+        }
+    ]